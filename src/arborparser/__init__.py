@@ -1,14 +1,28 @@
 __version__ = "0.1.6"
 
+import importlib
+from typing import TYPE_CHECKING, Any, List
+
 from arborparser.node import BaseNode, ChainNode, TreeNode
-from arborparser.pattern import LevelPattern, PatternBuilder
+from arborparser.pattern import (
+    LevelPattern,
+    PatternBuilder,
+    PatternSet,
+    clear_pattern_registry,
+    registered_patterns,
+)
 from arborparser.build_strategy import (
     TreeBuildingStrategy,
     StrictStrategy,
     AutoPruneStrategy,
+    ViterbiStrategy,
 )
 from arborparser.chain import ChainParser
-from arborparser.tree import TreeBuilder, TreeExporter
+from arborparser.tree import TreeBuilder, TreeExporter, TreeLoader
+from arborparser.flat_tree import FlatNode, FlatTree
+from arborparser.binary import BinaryExporter, BinaryReader
+from arborparser.incremental import IncrementalDocument, LineEdit
+from arborparser.resumable import ResumableParser
 from arborparser.pattern import (
     CHINESE_CHAPTER_PATTERN_BUILDER,
     ENGLISH_CHAPTER_PATTERN_BUILDER,
@@ -20,12 +34,40 @@ from arborparser.pattern import (
     ALL_CHINESE_CHARS,
 )
 
+if TYPE_CHECKING:
+    from arborparser.async_parser import AsyncParser
+    from arborparser.cache import ParseCache
+
+# Exported names whose modules are only imported when first accessed, so that
+# ``import arborparser`` does not pay for asyncio, hashlib and tempfile.
+_LAZY_EXPORTS = {
+    "AsyncParser": "arborparser.async_parser",
+    "ParseCache": "arborparser.cache",
+}
+
+
+def __getattr__(name: str) -> Any:
+    module = _LAZY_EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> List[str]:
+    return sorted(set(globals()) | set(_LAZY_EXPORTS))
+
+
 __all__ = [
     "BaseNode",
     "ChainNode",
     "TreeNode",
     "LevelPattern",
     "PatternBuilder",
+    "PatternSet",
+    "registered_patterns",
+    "clear_pattern_registry",
     "ChainParser",
     "CHINESE_CHAPTER_PATTERN_BUILDER",
     "ENGLISH_CHAPTER_PATTERN_BUILDER",
@@ -36,8 +78,19 @@ __all__ = [
     "TreeBuildingStrategy",
     "StrictStrategy",
     "AutoPruneStrategy",
+    "ViterbiStrategy",
     "TreeBuilder",
     "TreeExporter",
+    "TreeLoader",
+    "FlatTree",
+    "FlatNode",
+    "BinaryExporter",
+    "BinaryReader",
+    "ParseCache",
+    "AsyncParser",
+    "IncrementalDocument",
+    "LineEdit",
+    "ResumableParser",
     "ALL_ROMAN_NUMERALS",
     "ALL_CHINESE_CHARS",
     "__version__",
@@ -0,0 +1,244 @@
+import asyncio
+import codecs
+import functools
+import os
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from pathlib import Path
+from typing import (
+    Any,
+    AsyncIterator,
+    Awaitable,
+    Callable,
+    List,
+    Literal,
+    Optional,
+    Protocol,
+    TypeVar,
+    Union,
+    overload,
+)
+from arborparser.batch import _load_result, _process_chunk, detect_headings
+from arborparser.chain import ChainParser
+from arborparser.node import ChainNode, TreeNode
+from arborparser.tree import TreeBuilder
+
+T = TypeVar("T")
+
+
+class AsyncReader(Protocol):
+    """Anything with an async ``read``, such as an ``asyncio.StreamReader``."""
+
+    def read(self, n: int = -1) -> Awaitable[Union[bytes, str]]: ...
+
+
+class AsyncParser:
+    """
+    asyncio front end for ChainParser and TreeBuilder.
+
+    Heading detection and tree building run in an executor, so large documents do not
+    block the event loop. A semaphore bounds the number of jobs in the executor across
+    all concurrent requests. Streams are only read as fast as their nodes are consumed.
+
+    Attributes:
+        parser (ChainParser): Parser applied to each document.
+        builder (TreeBuilder): Builder used by the ``build_tree*`` methods.
+        executor (Executor): Executor running the CPU-bound work. A process pool receives
+                             the parser per job and returns results in the binary format.
+        chunk_size (int): Number of bytes (or characters) read from a stream at a time.
+    """
+
+    def __init__(
+        self,
+        parser: ChainParser,
+        builder: Optional[TreeBuilder] = None,
+        executor: Optional[Executor] = None,
+        max_concurrency: Optional[int] = None,
+        chunk_size: int = 1 << 16,
+    ):
+        """
+        Args:
+            parser (ChainParser): Parser applied to each document.
+            builder (Optional[TreeBuilder]): Builder for trees; None uses the default strategy.
+            executor (Optional[Executor]): Executor to offload work to. None creates a thread
+                                           pool, which is shut down by ``close``.
+            max_concurrency (Optional[int]): Maximum number of jobs in the executor at once;
+                                             None uses the number of CPUs.
+            chunk_size (int): Number of bytes (or characters) read from a stream at a time.
+        """
+        self.parser = parser
+        self.builder = builder if builder is not None else TreeBuilder()
+        self._owns_executor = executor is None
+        self.executor = executor if executor is not None else ThreadPoolExecutor()
+        self._max_concurrency = max_concurrency or os.cpu_count() or 1
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self.chunk_size = chunk_size
+
+    async def __aenter__(self) -> "AsyncParser":
+        return self
+
+    async def __aexit__(self, *exc_info: object) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """Shut down the executor if it was created by this parser."""
+        if self._owns_executor:
+            self.executor.shutdown(wait=False)
+
+    async def _run(self, function: Callable[..., T], *args: Any) -> T:
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self._max_concurrency)
+        async with self._semaphore:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(
+                self.executor, functools.partial(function, *args)
+            )
+
+    @overload
+    async def _process(
+        self, item: Union[str, Path], build: Literal[False]
+    ) -> List[ChainNode]: ...
+
+    @overload
+    async def _process(self, item: Union[str, Path], build: Literal[True]) -> TreeNode: ...
+
+    async def _process(
+        self, item: Union[str, Path], build: bool
+    ) -> Union[List[ChainNode], TreeNode]:
+        transport = isinstance(self.executor, ProcessPoolExecutor)
+        strategy = self.builder.strategy if build else None
+        results = await self._run(
+            _process_chunk, self.parser, strategy, build, transport, [item]
+        )
+        result: Union[List[ChainNode], TreeNode] = _load_result(
+            results[0], build, transport
+        )
+        return result
+
+    async def parse_text(self, text: str) -> List[ChainNode]:
+        """
+        Asynchronous ``ChainParser.parse_to_chain``.
+
+        Args:
+            text (str): Input text to be parsed.
+
+        Returns:
+            List[ChainNode]: List of parsed ChainNodes.
+        """
+        return await self._process(text, build=False)
+
+    async def parse_file(self, file_path: Union[str, Path]) -> List[ChainNode]:
+        """
+        Asynchronous ``ChainParser.parse_file`` for UTF-8 files.
+
+        Args:
+            file_path (Union[str, Path]): Path of the file to parse.
+
+        Returns:
+            List[ChainNode]: List of parsed ChainNodes.
+        """
+        return await self._process(Path(file_path), build=False)
+
+    async def build_tree(self, text: str) -> TreeNode:
+        """
+        Parse a text and build its tree without blocking the event loop.
+
+        Args:
+            text (str): Input text to be parsed.
+
+        Returns:
+            TreeNode: The root of the built tree.
+        """
+        return await self._process(text, build=True)
+
+    async def build_tree_from_file(self, file_path: Union[str, Path]) -> TreeNode:
+        """
+        Parse a UTF-8 file and build its tree without blocking the event loop.
+
+        Args:
+            file_path (Union[str, Path]): Path of the file to parse.
+
+        Returns:
+            TreeNode: The root of the built tree.
+        """
+        return await self._process(Path(file_path), build=True)
+
+    async def parse_stream(
+        self, reader: AsyncReader, encoding: str = "utf-8"
+    ) -> AsyncIterator[ChainNode]:
+        """
+        Asynchronous ``ChainParser.parse_stream`` over a reader such as an
+        ``asyncio.StreamReader``.
+
+        Args:
+            reader (AsyncReader): Source of bytes (decoded with ``encoding``) or of text.
+            encoding (str): Encoding of a bytes stream.
+
+        Yields:
+            ChainNode: The same nodes, in the same order, as ``parse_to_chain``.
+        """
+        async for nodes in self._iter_stream_rows(reader, encoding, is_multi_chain=False):
+            yield nodes[0]
+
+    async def parse_multi_stream(
+        self, reader: AsyncReader, encoding: str = "utf-8"
+    ) -> AsyncIterator[List[ChainNode]]:
+        """
+        Asynchronous ``ChainParser.parse_multi_stream``.
+
+        Args:
+            reader (AsyncReader): Source of bytes (decoded with ``encoding``) or of text.
+            encoding (str): Encoding of a bytes stream.
+
+        Yields:
+            List[ChainNode]: The candidates of each heading line, once its content is complete.
+        """
+        async for nodes in self._iter_stream_rows(reader, encoding, is_multi_chain=True):
+            yield nodes
+
+    async def _iter_stream_rows(
+        self, reader: AsyncReader, encoding: str, is_multi_chain: bool
+    ) -> AsyncIterator[List[ChainNode]]:
+        """
+        Read the stream in chunks and detect the headings of each run of complete lines
+        in the executor. Only the cheap content slicing happens on the event loop.
+        """
+        decoder = codecs.getincrementaldecoder(encoding)()
+        current_nodes = [
+            ChainNode(level_seq=(), level_text="", title="ROOT", pattern_priority=0)
+        ]
+        current_content: List[str] = []
+        partial_line = ""
+
+        while True:
+            data = await reader.read(self.chunk_size)
+            at_eof = not data
+            text = data if isinstance(data, str) else decoder.decode(data, final=at_eof)
+            text = partial_line + text
+            if not at_eof:
+                # Lines are only scanned once complete.
+                cut = text.rfind("\n") + 1
+                text, partial_line = text[:cut], text[cut:]
+
+            if text:
+                detected = await self._run(
+                    detect_headings, self.parser, text, 0, is_multi_chain
+                )
+                section_start = 0
+                for offset, nodes in zip(detected.offsets, detected.rows()):
+                    current_content.append(text[section_start:offset])
+                    content = "".join(current_content)
+                    for node in current_nodes:
+                        node.content = content
+                    yield current_nodes
+                    current_nodes = nodes
+                    current_content = []
+                    section_start = offset
+                current_content.append(text[section_start:])
+
+            if at_eof:
+                break
+
+        content = "".join(current_content)
+        for node in current_nodes:
+            node.content = content
+        yield current_nodes
@@ -0,0 +1,333 @@
+import itertools
+import os
+from collections import deque
+from concurrent.futures import (
+    FIRST_COMPLETED,
+    Executor,
+    Future,
+    ProcessPoolExecutor,
+    ThreadPoolExecutor,
+    wait,
+)
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Deque,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Set,
+    Tuple,
+    Union,
+)
+from arborparser.binary import BinaryExporter, BinaryReader
+from arborparser.node import ChainNode
+
+if TYPE_CHECKING:
+    from arborparser.build_strategy import TreeBuildingStrategy
+    from arborparser.chain import ChainParser
+
+# A batch input: text to parse, or the path of a file to parse (see ChainParser.parse_file).
+BatchInput = Union[str, "os.PathLike[str]"]
+# "process", "thread", or an existing executor.
+ExecutorSpec = Union[str, Executor]
+
+# Parser and strategy of the current pool worker, set once by _init_worker.
+_worker_parser: Optional["ChainParser"] = None
+_worker_strategy: Optional["TreeBuildingStrategy"] = None
+
+
+def _init_worker(
+    parser: "ChainParser", strategy: Optional["TreeBuildingStrategy"]
+) -> None:
+    global _worker_parser, _worker_strategy
+    _worker_parser = parser
+    _worker_strategy = strategy
+
+
+def _process_chunk(
+    parser: Optional["ChainParser"],
+    strategy: Optional["TreeBuildingStrategy"],
+    build: bool,
+    transport: bool,
+    items: List[BatchInput],
+) -> List[Any]:
+    """
+    Parse (and optionally build) a chunk of inputs in a worker.
+
+    With ``transport``, results are returned in the binary format, which is much
+    smaller and faster to unpickle than node graphs.
+    """
+    if parser is None:
+        parser, strategy = _worker_parser, _worker_strategy
+        assert parser is not None
+    results: List[Any] = []
+    for item in items:
+        if isinstance(item, str):
+            chain = parser.parse_to_chain(item)
+        else:
+            chain = parser.parse_file(item)
+        if build:
+            assert strategy is not None
+            tree = strategy.build_tree(chain)
+            results.append(BinaryExporter.export_tree(tree) if transport else tree)
+        else:
+            results.append(BinaryExporter.export_chain(chain) if transport else chain)
+    return results
+
+
+def _load_result(data: Any, build: bool, transport: bool) -> Any:
+    if not transport:
+        return data
+    reader = BinaryReader(data)
+    return reader.load_tree() if build else reader.load_chain()
+
+
+def run_batch(
+    parser: "ChainParser",
+    strategy: Optional["TreeBuildingStrategy"],
+    inputs: Iterable[BatchInput],
+    executor: ExecutorSpec = "process",
+    max_workers: Optional[int] = None,
+    chunksize: int = 16,
+    ordered: bool = True,
+) -> Iterator[Tuple[int, Any]]:
+    """
+    Fan inputs out over a pool in chunks and yield ``(input index, result)`` pairs.
+
+    Only a bounded number of chunks is in flight at a time, so ``inputs`` can be a
+    lazy iterable of any length.
+
+    Args:
+        parser (ChainParser): Parser applied to each input.
+        strategy (Optional[TreeBuildingStrategy]): If given, each chain is built into a
+                                                   tree and the trees are returned.
+        inputs (Iterable[BatchInput]): Texts, or paths of files to parse.
+        executor (ExecutorSpec): "process", "thread", or an executor to reuse.
+        max_workers (Optional[int]): Pool size for "process" and "thread"; None uses the
+                                     number of CPUs.
+        chunksize (int): Number of inputs sent to a worker per task.
+        ordered (bool): Yield results in input order rather than as they complete.
+
+    Returns:
+        Iterator[Tuple[int, Any]]: Index of each input and its chain or tree.
+    """
+    if chunksize < 1:
+        raise ValueError(f"chunksize {chunksize} must be positive")
+    workers = max_workers or os.cpu_count() or 1
+    build = strategy is not None
+
+    pool: Executor
+    if executor == "process":
+        pool = ProcessPoolExecutor(
+            workers, initializer=_init_worker, initargs=(parser, strategy)
+        )
+        task_parser: Optional["ChainParser"] = None
+    elif executor == "thread":
+        pool = ThreadPoolExecutor(workers)
+        task_parser = parser
+    elif isinstance(executor, Executor):
+        pool = executor
+        task_parser = parser
+    else:
+        raise ValueError(f"Unknown executor {executor!r}")
+    transport = isinstance(pool, ProcessPoolExecutor)
+    max_in_flight = 2 * workers
+
+    indexed_inputs = enumerate(inputs)
+
+    def submit_next() -> Optional[Tuple[int, "Future[List[Any]]"]]:
+        chunk = list(itertools.islice(indexed_inputs, chunksize))
+        if not chunk:
+            return None
+        items = [item for _, item in chunk]
+        future = pool.submit(
+            _process_chunk, task_parser, strategy, build, transport, items
+        )
+        return chunk[0][0], future
+
+    def load(start: int, future: "Future[List[Any]]") -> Iterator[Tuple[int, Any]]:
+        for offset, data in enumerate(future.result()):
+            yield start + offset, _load_result(data, build, transport)
+
+    try:
+        if ordered:
+            queue: Deque[Tuple[int, "Future[List[Any]]"]] = deque()
+            while True:
+                while len(queue) < max_in_flight:
+                    submitted = submit_next()
+                    if submitted is None:
+                        break
+                    queue.append(submitted)
+                if not queue:
+                    return
+                yield from load(*queue.popleft())
+        else:
+            starts: Dict["Future[List[Any]]", int] = {}
+            pending: Set["Future[List[Any]]"] = set()
+            exhausted = False
+            while True:
+                while not exhausted and len(pending) < max_in_flight:
+                    submitted = submit_next()
+                    if submitted is None:
+                        exhausted = True
+                        break
+                    starts[submitted[1]] = submitted[0]
+                    pending.add(submitted[1])
+                if not pending:
+                    return
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    yield from load(starts.pop(future), future)
+    finally:
+        if pool is not executor:
+            pool.shutdown(wait=True, cancel_futures=True)
+
+
+# Texts are only split for parallel parsing into pieces of at least this many characters.
+PARALLEL_MIN_CHUNK_CHARS = 1 << 20
+
+
+def split_at_newlines(text: str, parts: int) -> List[Tuple[int, int]]:
+    """
+    Split a text into at most ``parts`` contiguous ranges that each end after a newline
+    (or at the end of the text), so that no line straddles two ranges.
+
+    Args:
+        text (str): The text to split.
+        parts (int): Maximum number of ranges.
+
+    Returns:
+        List[Tuple[int, int]]: ``(start, end)`` offsets of each non-empty range, in order.
+    """
+    ranges = []
+    start = 0
+    for part in range(1, parts):
+        target = max(start, len(text) * part // parts)
+        newline = text.find("\n", target)
+        if newline == -1:
+            break
+        if newline + 1 > start:
+            ranges.append((start, newline + 1))
+            start = newline + 1
+    if start < len(text) or not ranges:
+        ranges.append((start, len(text)))
+    return ranges
+
+
+class DetectedHeadings:
+    """
+    Headings detected in one range of a text, stored column-wise so that they pickle
+    quickly on their way back from a worker.
+
+    Row ``i`` starts at ``offsets[i]`` and has ``row_sizes[i]`` candidates. Candidate
+    ``j`` has ``level_sizes[j]`` numbers in ``levels`` and the given text, title and
+    priority.
+    """
+
+    def __init__(self) -> None:
+        self.offsets: List[int] = []
+        self.row_sizes: List[int] = []
+        self.level_sizes: List[int] = []
+        self.levels: List[int] = []
+        self.level_texts: List[str] = []
+        self.titles: List[str] = []
+        self.priorities: List[int] = []
+
+    def extend(self, other: "DetectedHeadings") -> None:
+        for name in vars(self):
+            getattr(self, name).extend(getattr(other, name))
+
+    def rows(self) -> List[List[ChainNode]]:
+        """Create the nodes of each row, without content."""
+        candidates = iter(
+            zip(self.level_sizes, self.level_texts, self.titles, self.priorities)
+        )
+        levels = iter(self.levels)
+        rows = []
+        for row_size in self.row_sizes:
+            row = []
+            for level_size, level_text, title, priority in itertools.islice(
+                candidates, row_size
+            ):
+                row.append(
+                    ChainNode(
+                        level_seq=tuple(itertools.islice(levels, level_size)),
+                        level_text=level_text,
+                        title=title,
+                        pattern_priority=priority,
+                    )
+                )
+            rows.append(row)
+        return rows
+
+
+def detect_headings(
+    parser: "ChainParser", text: str, offset: int, is_multi_chain: bool
+) -> DetectedHeadings:
+    """Detect the heading lines of one range of a text, with their offsets in the text."""
+    detected = DetectedHeadings()
+    rows = parser._iter_rows(text.split("\n"), is_multi_chain, source=text)
+    next(rows)  # the root holds the text before the first heading of the range
+    for nodes in rows:
+        detected.offsets.append(offset + nodes[0]._start)
+        detected.row_sizes.append(len(nodes))
+        for node in nodes:
+            detected.level_sizes.append(len(node.level_seq))
+            detected.levels.extend(node.level_seq)
+            detected.level_texts.append(node.level_text)
+            detected.titles.append(node.title)
+            detected.priorities.append(node.pattern_priority)
+    return detected
+
+
+def parse_text_parallel(
+    parser: "ChainParser", text: str, workers: int, is_multi_chain: bool
+) -> List[List[ChainNode]]:
+    """
+    Detect the headings of a text in parallel and stitch the rows back together.
+
+    Heading detection is line-local, so the text is split at newlines into one range
+    per worker, and each process scans its range. Every section's content is then the
+    slice of the text between consecutive headings, which also covers the sections
+    that straddle a range boundary. The rows are identical to a sequential parse.
+
+    Args:
+        parser (ChainParser): Parser whose patterns detect the headings.
+        text (str): The text to parse.
+        workers (int): Number of worker processes.
+        is_multi_chain (bool): Keep every candidate of each heading line.
+
+    Returns:
+        List[List[ChainNode]]: The candidates of each row, starting with the ROOT row.
+    """
+    ranges = split_at_newlines(
+        text, min(workers, max(1, len(text) // PARALLEL_MIN_CHUNK_CHARS))
+    )
+    if len(ranges) == 1:
+        detected = detect_headings(parser, text, 0, is_multi_chain)
+    else:
+        with ProcessPoolExecutor(len(ranges)) as pool:
+            futures = [
+                pool.submit(
+                    detect_headings, parser, text[start:end], start, is_multi_chain
+                )
+                for start, end in ranges
+            ]
+            detected = DetectedHeadings()
+            for future in futures:
+                detected.extend(future.result())
+
+    rows = [[ChainNode(level_seq=(), level_text="", title="ROOT", pattern_priority=0)]]
+    rows.extend(detected.rows())
+    starts = [0] + detected.offsets + [len(text)]
+
+    for row, start, end in zip(rows, starts, starts[1:]):
+        for node in row:
+            if parser.lazy_content:
+                node.set_span(text, start, end)
+            else:
+                node.content = text[start:end]
+    return rows
@@ -0,0 +1,411 @@
+import mmap
+import struct
+from pathlib import Path
+from typing import Any, BinaryIO, Dict, Iterator, List, Sequence, Tuple, Union
+from arborparser.node import BaseNode, ChainNode, LevelSeq, TreeNode
+
+# File layout, all integers little-endian:
+#
+#   header       magic, version, kind, node count and the offsets of the sections below
+#   node table   one fixed-size record per node, in preorder for trees
+#   levels       each level number as a 1-byte length followed by its two's-complement bytes
+#   strings      count, end offset of each string, then the UTF-8 blob (level texts and titles)
+#   contents     one length-prefixed UTF-8 block per node, in node order
+#
+# A subtree is a contiguous range of the node table, so it can be read on its own.
+
+MAGIC = b"ARBP"
+FORMAT_VERSION = 1
+
+KIND_TREE = 0
+KIND_CHAIN = 1
+
+NO_NODE = -1
+
+_HEADER = struct.Struct("<4sHBxQQQQ")
+# parent, subtree end, levels offset, level count, level text id, title id,
+# pattern priority, content block offset
+_RECORD = struct.Struct("<qqQIIIiQ")
+_U32 = struct.Struct("<I")
+_U64 = struct.Struct("<Q")
+
+BinarySource = Union[bytes, bytearray, mmap.mmap]
+
+
+class BinaryExporter:
+    """Serialize trees and chains into the compact binary format read by BinaryReader."""
+
+    @staticmethod
+    def export_tree(tree: TreeNode) -> bytes:
+        """
+        Serialize a tree.
+
+        Args:
+            tree (TreeNode): Root of the tree to serialize.
+
+        Returns:
+            bytes: The serialized tree.
+        """
+        return BinaryExporter._export(BinaryExporter._flatten_tree(tree), KIND_TREE)
+
+    @staticmethod
+    def export_tree_to_file(tree: TreeNode, file_path: Union[str, Path]) -> None:
+        """
+        Serialize a tree to a file.
+
+        Args:
+            tree (TreeNode): Root of the tree to serialize.
+            file_path (Union[str, Path]): Path of the output file.
+        """
+        with open(file_path, "wb") as file:
+            BinaryExporter.export_tree_to(tree, file)
+
+    @staticmethod
+    def export_tree_to(tree: TreeNode, stream: BinaryIO) -> None:
+        """
+        Serialize a tree to a binary stream.
+
+        Args:
+            tree (TreeNode): Root of the tree to serialize.
+            stream (BinaryIO): Stream the serialized tree is written to.
+        """
+        stream.write(BinaryExporter.export_tree(tree))
+
+    @staticmethod
+    def export_chain(chain: Sequence[ChainNode]) -> bytes:
+        """
+        Serialize a chain, keeping the pattern priority of each node.
+
+        Args:
+            chain (Sequence[ChainNode]): The chain to serialize.
+
+        Returns:
+            bytes: The serialized chain.
+        """
+        nodes = [(node, NO_NODE, index + 1) for index, node in enumerate(chain)]
+        return BinaryExporter._export(nodes, KIND_CHAIN)
+
+    @staticmethod
+    def export_chain_to_file(
+        chain: Sequence[ChainNode], file_path: Union[str, Path]
+    ) -> None:
+        """
+        Serialize a chain to a file.
+
+        Args:
+            chain (Sequence[ChainNode]): The chain to serialize.
+            file_path (Union[str, Path]): Path of the output file.
+        """
+        with open(file_path, "wb") as file:
+            file.write(BinaryExporter.export_chain(chain))
+
+    @staticmethod
+    def _flatten_tree(tree: TreeNode) -> List[Tuple[Any, ...]]:
+        """List ``(node, parent index, subtree end)`` for every node, in preorder."""
+        nodes: List[List[Any]] = []
+        stack = [(tree, NO_NODE)]
+        open_nodes: List[int] = []
+        depths: List[int] = []
+        while stack:
+            node, parent = stack.pop()
+            index = len(nodes)
+            depth = depths[parent] + 1 if parent != NO_NODE else 0
+            while open_nodes and depths[open_nodes[-1]] >= depth:
+                nodes[open_nodes.pop()][2] = index
+            open_nodes.append(index)
+            depths.append(depth)
+            nodes.append([node, parent, NO_NODE])
+            stack.extend((child, index) for child in reversed(node.children))
+        for index in open_nodes:
+            nodes[index][2] = len(nodes)
+        return [tuple(entry) for entry in nodes]
+
+    @staticmethod
+    def _export(nodes: Sequence[Tuple[Any, ...]], kind: int) -> bytes:
+        strings: Dict[str, int] = {}
+
+        def string_id(text: str) -> int:
+            if text not in strings:
+                strings[text] = len(strings)
+            return strings[text]
+
+        levels = bytearray()
+        level_entries = []
+        for node, _, _ in nodes:
+            level_entries.append((len(levels), len(node.level_seq)))
+            for level in node.level_seq:
+                size = (level.bit_length() + 8) // 8  # room for the sign bit
+                if size > 0xFF:
+                    raise ValueError(f"Level number {level} is too large to serialize")
+                levels.append(size)
+                levels += level.to_bytes(size, "little", signed=True)
+
+        string_blob = bytearray()
+        string_ends = []
+        text_ids = [
+            (string_id(node.level_text), string_id(node.title)) for node, _, _ in nodes
+        ]
+        for text in strings:
+            string_blob += text.encode("utf-8")
+            string_ends.append(len(string_blob))
+
+        table_offset = _HEADER.size
+        levels_offset = table_offset + _RECORD.size * len(nodes)
+        strings_offset = levels_offset + len(levels)
+        contents_offset = (
+            strings_offset + _U32.size * (1 + len(string_ends)) + len(string_blob)
+        )
+
+        output = bytearray(
+            _HEADER.pack(
+                MAGIC,
+                FORMAT_VERSION,
+                kind,
+                len(nodes),
+                levels_offset,
+                strings_offset,
+                contents_offset,
+            )
+        )
+        contents = bytearray()
+        for (node, parent, subtree_end), (level_offset, level_count), (
+            text_id,
+            title_id,
+        ) in zip(nodes, level_entries, text_ids):
+            encoded = node.content.encode("utf-8")
+            output += _RECORD.pack(
+                parent,
+                subtree_end,
+                level_offset,
+                level_count,
+                text_id,
+                title_id,
+                getattr(node, "pattern_priority", 0),
+                contents_offset + len(contents),
+            )
+            contents += _U64.pack(len(encoded))
+            contents += encoded
+
+        output += levels
+        output += _U32.pack(len(string_ends))
+        output += struct.pack(f"<{len(string_ends)}I", *string_ends)
+        output += string_blob
+        output += contents
+        return bytes(output)
+
+
+class BinaryReader:
+    """
+    Random-access reader for data written by BinaryExporter.
+
+    Only the header is decoded up front. Level sequences, strings and contents are
+    decoded on demand, so single nodes or subtrees can be read from a large file
+    without decoding the rest. Use ``open`` to memory-map a file.
+
+    Attributes:
+        kind (int): KIND_TREE or KIND_CHAIN.
+    """
+
+    def __init__(self, buffer: BinarySource):
+        self._buffer = buffer
+        if len(buffer) < _HEADER.size:
+            raise ValueError("Not an arborparser binary file")
+        (
+            magic,
+            version,
+            self.kind,
+            self._node_count,
+            self._levels_offset,
+            self._strings_offset,
+            self._contents_offset,
+        ) = _HEADER.unpack_from(buffer, 0)
+        if magic != MAGIC:
+            raise ValueError("Not an arborparser binary file")
+        if version != FORMAT_VERSION:
+            raise ValueError(f"Unsupported binary format version {version}")
+        (self._string_count,) = _U32.unpack_from(buffer, self._strings_offset)
+        self._string_blob_offset = self._strings_offset + _U32.size * (
+            1 + self._string_count
+        )
+        self._strings: Dict[int, str] = {}
+
+    @staticmethod
+    def open(file_path: Union[str, Path]) -> "BinaryReader":
+        """
+        Memory-map a file written by BinaryExporter.
+
+        Args:
+            file_path (Union[str, Path]): Path of the file.
+
+        Returns:
+            BinaryReader: Reader over the mapping; close it when done.
+        """
+        with open(file_path, "rb") as file:
+            try:
+                buffer = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+            except ValueError:  # empty files cannot be mapped
+                raise ValueError("Not an arborparser binary file") from None
+        return BinaryReader(buffer)
+
+    def close(self) -> None:
+        """Release the memory mapping, if any."""
+        if isinstance(self._buffer, mmap.mmap):
+            self._buffer.close()
+
+    def __enter__(self) -> "BinaryReader":
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
+    def __len__(self) -> int:
+        return self._node_count
+
+    def _record(self, index: int) -> Tuple[int, ...]:
+        if not 0 <= index < self._node_count:
+            raise IndexError(f"Node index {index} out of range")
+        return _RECORD.unpack_from(self._buffer, _HEADER.size + _RECORD.size * index)
+
+    def _string(self, string_id: int) -> str:
+        if string_id not in self._strings:
+            start = (
+                _U32.unpack_from(self._buffer, self._strings_offset + _U32.size * string_id)[0]
+                if string_id
+                else 0
+            )
+            (end,) = _U32.unpack_from(
+                self._buffer, self._strings_offset + _U32.size * (string_id + 1)
+            )
+            blob = self._string_blob_offset
+            self._strings[string_id] = bytes(
+                self._buffer[blob + start : blob + end]
+            ).decode("utf-8")
+        return self._strings[string_id]
+
+    def _levels(self, offset: int, count: int) -> LevelSeq:
+        buffer = self._buffer
+        position = self._levels_offset + offset
+        levels = []
+        for _ in range(count):
+            size = buffer[position]
+            levels.append(
+                int.from_bytes(buffer[position + 1 : position + 1 + size], "little", signed=True)
+            )
+            position += 1 + size
+        return tuple(levels)
+
+    def _content_span(self, block_offset: int) -> Tuple[int, int]:
+        (length,) = _U64.unpack_from(self._buffer, block_offset)
+        start = block_offset + _U64.size
+        return start, start + length
+
+    def level_seq(self, index: int) -> LevelSeq:
+        record = self._record(index)
+        return self._levels(record[2], record[3])
+
+    def level_text(self, index: int) -> str:
+        return self._string(self._record(index)[4])
+
+    def title(self, index: int) -> str:
+        return self._string(self._record(index)[5])
+
+    def content(self, index: int) -> str:
+        start, end = self._content_span(self._record(index)[7])
+        return bytes(self._buffer[start:end]).decode("utf-8")
+
+    def parent_index(self, index: int) -> int:
+        """Index of the node's parent, or NO_NODE."""
+        return int(self._record(index)[0])
+
+    def subtree_end(self, index: int) -> int:
+        """Index just past the node's last descendant."""
+        return int(self._record(index)[1])
+
+    def child_indices(self, index: int) -> Iterator[int]:
+        """Iterate over the indices of a node's children, in order."""
+        end = self.subtree_end(index)
+        child = index + 1
+        while child < end:
+            yield child
+            child = self.subtree_end(child)
+
+    def full_content(self, index: int) -> str:
+        """Content of a node and all its descendants."""
+        return "".join(
+            self.content(node) for node in range(index, self.subtree_end(index))
+        )
+
+    def _fill_node(self, node: BaseNode, record: Tuple[int, ...], lazy_content: bool) -> None:
+        start, end = self._content_span(record[7])
+        if lazy_content:
+            node.set_span(self._buffer, start, end, "utf-8")
+        else:
+            node.content = bytes(self._buffer[start:end]).decode("utf-8")
+
+    def load_tree(self, lazy_content: bool = False) -> TreeNode:
+        """
+        Materialize the whole tree.
+
+        Args:
+            lazy_content (bool): Keep contents as spans into the buffer, decoded on first
+                                 access. The reader must then stay open while they are read.
+
+        Returns:
+            TreeNode: Root of the tree.
+        """
+        return self.load_subtree(0, lazy_content)
+
+    def load_subtree(self, index: int, lazy_content: bool = False) -> TreeNode:
+        """
+        Materialize the subtree rooted at a node, reading only its range of the file.
+
+        Args:
+            index (int): Preorder index of the subtree root.
+            lazy_content (bool): Keep contents as spans into the buffer, decoded on first
+                                 access. The reader must then stay open while they are read.
+
+        Returns:
+            TreeNode: Root of the subtree, with no parent.
+        """
+        if self.kind != KIND_TREE:
+            raise ValueError("The data holds a chain, not a tree")
+        end = self.subtree_end(index)
+        nodes: Dict[int, TreeNode] = {}
+        for position in range(index, end):
+            record = self._record(position)
+            node = TreeNode(
+                level_seq=self._levels(record[2], record[3]),
+                level_text=self._string(record[4]),
+                title=self._string(record[5]),
+            )
+            self._fill_node(node, record, lazy_content)
+            if position != index:
+                nodes[record[0]].add_child(node)
+            nodes[position] = node
+        return nodes[index]
+
+    def load_chain(self, lazy_content: bool = False) -> List[ChainNode]:
+        """
+        Materialize a serialized chain.
+
+        Args:
+            lazy_content (bool): Keep contents as spans into the buffer, decoded on first
+                                 access. The reader must then stay open while they are read.
+
+        Returns:
+            List[ChainNode]: The chain.
+        """
+        if self.kind != KIND_CHAIN:
+            raise ValueError("The data holds a tree, not a chain")
+        chain = []
+        for index in range(self._node_count):
+            record = self._record(index)
+            node = ChainNode(
+                level_seq=self._levels(record[2], record[3]),
+                level_text=self._string(record[4]),
+                title=self._string(record[5]),
+                pattern_priority=record[6],
+            )
+            self._fill_node(node, record, lazy_content)
+            chain.append(node)
+        return chain
@@ -1,6 +1,18 @@
 from abc import ABC, abstractmethod
-from typing import List, Deque, Union, Sequence, Optional, cast
-from arborparser.node import ChainNode, TreeNode, BaseNode
+from typing import (
+    Any,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Deque,
+    Union,
+    Sequence,
+    Optional,
+    Tuple,
+    cast,
+)
+from arborparser.node import _NO_CHILDREN, ChainNode, TreeNode, BaseNode, LevelSeq
 from collections import deque
 
 
@@ -22,27 +34,63 @@ class TreeBuildingStrategy(ABC):
         """
         pass
 
+    def iter_subtrees(
+        self, chain: Iterable[Union[ChainNode, List[ChainNode]]], depth: int = 1
+    ) -> Iterator[TreeNode]:
+        """
+        Build a tree and yield its subtrees rooted at ``depth``, in document order.
+
+        Each yielded node is detached from its parent's children, so the consumer holds
+        the only reference to its subtree; its ``parent`` still leads to the enclosing
+        nodes and to the root, which holds the text before the first heading. Strategies
+        that can build online (AutoPruneStrategy) yield each subtree as soon as it can no
+        longer change; this default builds the whole tree first.
+
+        Args:
+            chain: ChainNodes or multi-candidate rows, starting with the ROOT row.
+            depth (int): Depth of the yielded subtrees; 1 yields the top-level ones.
+
+        Returns:
+            Iterator[TreeNode]: The subtrees, detached from their parents.
+        """
+        if depth < 1:
+            raise ValueError(f"depth {depth} must be at least 1")
+        root = self.build_tree(list(chain))  # type: ignore[arg-type]
+        nodes_at_depth = [root]
+        for _ in range(depth - 1):
+            nodes_at_depth = [child for node in nodes_at_depth for child in node.children]
+        for parent in nodes_at_depth:
+            while parent.children:
+                yield _detach_first_child(parent)
+
+    def fingerprint(self) -> str:
+        """
+        Stable identifier of the strategy and its configuration.
+
+        Returns:
+            str: The strategy's qualified class name and its instance attributes.
+        """
+        cls = type(self)
+        return f"{cls.__module__}.{cls.__qualname__}{sorted(vars(self).items())!r}"
+
 
 def is_root(node: BaseNode) -> bool:
     """Check if a node is the root of a tree."""
     return len(node.level_seq) == 0
 
 
-def get_prefix(level_seq: List[int]) -> List[int]:
-    if len(level_seq) == 0:
-        return []
-    else:
-        return level_seq[:-1]
+def get_prefix(level_seq: LevelSeq) -> LevelSeq:
+    return level_seq[:-1]
 
 
-def get_last_level(level_seq: List[int]):
+def get_last_level(level_seq: LevelSeq) -> int:
     if len(level_seq) == 0:
         return 0
     else:
         return level_seq[-1]
 
 
-def is_imm_next(front_seq: List[int], back_seq: List[int]) -> bool:
+def is_imm_next(front_seq: LevelSeq, back_seq: LevelSeq) -> bool:
     """
     Determine if two nodes are immediate siblings based on their sequences.
     There are three scenarios to consider:
@@ -59,17 +107,17 @@ def is_imm_next(front_seq: List[int], back_seq: List[int]) -> bool:
        Example: `front_seq = [1, 1, 2, 3]` and `back_seq = [1, 2]`.
     """
 
-    if len(front_seq) == len(back_seq):  # eg: 1.1.1 -> 1.1.3
-        return (get_prefix(front_seq) == get_prefix(back_seq)) and (
+    front_len = len(front_seq)
+    back_len = len(back_seq)
+    if front_len == back_len:  # eg: 1.1.1 -> 1.1.3
+        return (front_seq[:-1] == back_seq[:-1]) and (
             get_last_level(front_seq) < get_last_level(back_seq)
         )
-    elif len(front_seq) + 1 == len(back_seq):  # eg: 1.2 -> 1.2.1
-        return front_seq == get_prefix(back_seq)
-    elif len(front_seq) > len(back_seq):  # eg: 1.1.2.3 -> 1.2
-        front_seq_prefix = front_seq
-        while len(front_seq_prefix) > len(back_seq):
-            front_seq_prefix = get_prefix(front_seq_prefix)
-        return (get_prefix(front_seq_prefix) == get_prefix(back_seq)) and (
+    elif front_len + 1 == back_len:  # eg: 1.2 -> 1.2.1
+        return front_seq == back_seq[:-1]
+    elif front_len > back_len:  # eg: 1.1.2.3 -> 1.2
+        front_seq_prefix = front_seq[:back_len]
+        return (front_seq_prefix[:-1] == back_seq[:-1]) and (
             get_last_level(front_seq_prefix) + 1 == get_last_level(back_seq)
         )
     else:
@@ -88,6 +136,15 @@ def _ensure_multi_chain(
     return cast(List[List[ChainNode]], chain)
 
 
+def _detach_first_child(parent: TreeNode) -> TreeNode:
+    child = parent.children[0]
+    if len(parent.children) == 1:
+        parent.children = _NO_CHILDREN
+    else:
+        del parent.children[0]
+    return child
+
+
 def _select_by_priority(candidates: Sequence[ChainNode]) -> ChainNode:
     if not candidates:
         raise ValueError("Expected at least one ChainNode candidate")
@@ -114,7 +171,7 @@ class StrictStrategy(TreeBuildingStrategy):
             TreeNode: The root of the constructed tree using strict rules.
         """
 
-        def _is_child(parent_seq: List[int], child_seq: List[int]) -> bool:
+        def _is_child(parent_seq: LevelSeq, child_seq: LevelSeq) -> bool:
             """Determine if child is a direct child of parent."""
             return (
                 len(child_seq) == len(parent_seq) + 1 and child_seq[:-1] == parent_seq
@@ -162,6 +219,23 @@ class StrictStrategy(TreeBuildingStrategy):
 class AutoPruneStrategy(TreeBuildingStrategy):
     """Concrete implementation of an auto-prune tree building strategy."""
 
+    # Default number of consecutive non-continuous rows examined for a hidden sequence
+    # before the oldest one is merged as noise.
+    DEFAULT_WINDOW = 3
+
+    def __init__(self, window: int = DEFAULT_WINDOW):
+        """
+        Args:
+            window (int): Number of consecutive non-continuous rows examined for a hidden
+                          sequence before the oldest one is merged as noise. Longer windows
+                          need a longer run of continuous rows to accept a jump in the
+                          numbering, which keeps more heading-like noise (e.g. from OCR)
+                          out of the tree.
+        """
+        if window < 1:
+            raise ValueError(f"window {window} must be at least 1")
+        self.window = window
+
     def build_tree(
         self, chain: Union[List[ChainNode], List[List[ChainNode]]]
     ) -> TreeNode:
@@ -175,74 +249,44 @@ class AutoPruneStrategy(TreeBuildingStrategy):
         """
 
         multi_chain = _ensure_multi_chain(chain)
-        root_candidate = _select_by_priority(multi_chain[0])
-
-        if not is_root(root_candidate):
-            raise ValueError("First node must be root")
-
-        root = TreeNode.from_chain_node(root_candidate)
-        current_branch: List[TreeNode] = [root]
-        not_imm_node_queue: Deque[List[ChainNode]] = deque()
-        current_node = root
-
-        def add_node_and_update_current_branch(node: TreeNode) -> None:
-            """Find the parent node of a given node and truncate the parent stack."""
-            nonlocal current_branch
-            node_prefix = node.level_seq
-            for index in reversed(range(len(current_branch))):
-                parent = current_branch[index]
-                while len(parent.level_seq) < len(node_prefix):
-                    node_prefix = get_prefix(node_prefix)
-                if parent.level_seq == node_prefix:
-                    del current_branch[index + 1 :]
-                    current_branch.append(node)
-                    parent.add_child(node)
-                    return
-            assert False, "Parent node not found"
-
-        def add_node_to_tree(node: ChainNode) -> None:
-            """Add a node to the tree."""
-            nonlocal current_node
-            new_tree_node = TreeNode.from_chain_node(node)
-            add_node_and_update_current_branch(new_tree_node)
-            current_node = new_tree_node
-
-        def concat_one_not_imm_node_to_current_node() -> None:
-            """Concatenate one candidate line from not_imm_node_queue to current_node."""
-            nonlocal current_node, not_imm_node_queue
-            candidates = not_imm_node_queue.popleft()
-            if not candidates:
-                return
-            current_node.concat_node(_select_by_priority(candidates))
-
+        builder = AutoPruneBuilder(self, multi_chain[0])
         for candidates in multi_chain[1:]:
-            if not candidates:
-                continue
+            builder.feed(candidates)
+        return builder.finish()
 
-            immediate_node = self._select_immediate_candidate(current_node, candidates)
+    def iter_subtrees(
+        self, chain: Iterable[Union[ChainNode, List[ChainNode]]], depth: int = 1
+    ) -> Iterator[TreeNode]:
+        """
+        Build the tree online and yield each subtree rooted at ``depth`` once it closes.
 
-            if immediate_node:
-                # merge queued nodes deemed as noise before attaching the new node
-                while not_imm_node_queue:
-                    concat_one_not_imm_node_to_current_node()
-                add_node_to_tree(immediate_node)
-            else:
-                not_imm_node_queue.append(candidates)
-
-            assert len(not_imm_node_queue) <= 3, "Too many nodes in not_imm_node_stack"
-            if len(not_imm_node_queue) == 3:
-                contiguous = self._find_contiguous_sequence(list(not_imm_node_queue))
-                if contiguous:
-                    not_imm_node_queue.clear()
-                    for node in contiguous:
-                        add_node_to_tree(node)
-                else:
-                    concat_one_not_imm_node_to_current_node()
+        A subtree is closed as soon as a node outside it is attached, since nodes are
+        only attached under the current branch and noise only merges into the last
+        attached node. Rows are consumed lazily, so a chain streamed from
+        ``ChainParser.parse_stream`` is built while it is read, and only the current
+        branch, the noise window and the open subtrees are kept in memory.
 
-        while not_imm_node_queue:
-            concat_one_not_imm_node_to_current_node()
+        Args:
+            chain: ChainNodes or multi-candidate rows, starting with the ROOT row.
+            depth (int): Depth of the yielded subtrees; 1 yields the top-level ones.
 
-        return root
+        Returns:
+            Iterator[TreeNode]: The subtrees, detached from their parents.
+        """
+        if depth < 1:
+            raise ValueError(f"depth {depth} must be at least 1")
+        rows = iter(chain)
+        first = next(rows, None)
+        if first is None:
+            raise ValueError("Chain cannot be empty")
+        builder = _SubtreeCollector(
+            self, [first] if isinstance(first, ChainNode) else first, depth
+        )
+        for row in rows:
+            builder.feed([row] if isinstance(row, ChainNode) else row)
+            yield from builder.pop_closed()
+        builder.finish()
+        yield from builder.pop_closed(finished=True)
 
     @staticmethod
     def _select_immediate_candidate(
@@ -259,18 +303,391 @@ class AutoPruneStrategy(TreeBuildingStrategy):
     def _find_contiguous_sequence(
         candidate_groups: Sequence[Sequence[ChainNode]],
     ) -> Optional[List[ChainNode]]:
+        """
+        Find one candidate per group such that each is immediately next to the previous.
+
+        Works backwards to mark the candidates from which the remaining groups can be
+        completed, then walks forwards taking the first such candidate of each group.
+        This returns the first sequence in candidate order, in O(groups * k^2) for k
+        candidates per group.
+        """
         if not candidate_groups:
             return None
 
-        search_queue = deque([(0, None, [])])  # (group_index, prev_node, path)
+        # completable[i][j]: candidate j of group i starts a sequence through the end.
+        completable: List[List[bool]] = [[True] * len(candidate_groups[-1])]
+        for index in range(len(candidate_groups) - 2, -1, -1):
+            next_group = candidate_groups[index + 1]
+            next_completable = completable[-1]
+            completable.append(
+                [
+                    any(
+                        ok and is_imm_next(candidate.level_seq, next_node.level_seq)
+                        for next_node, ok in zip(next_group, next_completable)
+                    )
+                    for candidate in candidate_groups[index]
+                ]
+            )
+        completable.reverse()
+
+        sequence: List[ChainNode] = []
+        prev_node: Optional[ChainNode] = None
+        for group, group_completable in zip(candidate_groups, completable):
+            for candidate, ok in zip(group, group_completable):
+                if ok and (
+                    prev_node is None
+                    or is_imm_next(prev_node.level_seq, candidate.level_seq)
+                ):
+                    break
+            else:
+                return None
+            sequence.append(candidate)
+            prev_node = candidate
+        return sequence
+
 
-        while search_queue:
-            index, prev_node, path = search_queue.popleft()
-            if index == len(candidate_groups):
-                return path
+class AutoPruneBuilder:
+    """
+    Row-by-row state of AutoPruneStrategy, for callers that receive the chain gradually.
+
+    Feeding every row of a chain and calling ``finish`` gives the same tree as
+    ``AutoPruneStrategy.build_tree``.
+
+    Attributes:
+        strategy (AutoPruneStrategy): The strategy whose rules are applied.
+        root (TreeNode): Root of the tree being built.
+        current_branch (List[TreeNode]): Path from the root to the last attached node.
+        current_node (TreeNode): The last attached node, which receives noise rows.
+        not_imm_node_queue (Deque[List[ChainNode]]): Rows not yet attached or merged.
+    """
+
+    def __init__(self, strategy: AutoPruneStrategy, root_candidates: Sequence[ChainNode]):
+        """
+        Args:
+            strategy (AutoPruneStrategy): The strategy whose rules are applied.
+            root_candidates (Sequence[ChainNode]): The first row of the chain (the ROOT).
+        """
+        root_candidate = _select_by_priority(root_candidates)
+        if not is_root(root_candidate):
+            raise ValueError("First node must be root")
+
+        self.strategy = strategy
+        self.root = TreeNode.from_chain_node(root_candidate)
+        self.current_branch: List[TreeNode] = [self.root]
+        self.current_node = self.root
+        self.not_imm_node_queue: Deque[List[ChainNode]] = deque()
+        self._journal: Optional[List[Tuple[Any, ...]]] = None
+        self._saved_state: Optional[Tuple[Any, ...]] = None
+
+    def begin_trial(self) -> None:
+        """
+        Start recording changes, so that ``rollback`` can undo the rows fed and the
+        ``finish`` called from now on. Used to look at the tree of an unfinished chain.
+        """
+        if self._journal is not None:
+            raise RuntimeError("A trial is already in progress")
+        self._journal = []
+        self._saved_state = (
+            list(self.current_branch),
+            self.current_node,
+            deque(self.not_imm_node_queue),
+        )
 
-            for candidate in candidate_groups[index]:
-                if prev_node is None or is_imm_next(prev_node.level_seq, candidate.level_seq):
-                    search_queue.append((index + 1, candidate, path + [candidate]))
+    def rollback(self) -> None:
+        """Undo every change since ``begin_trial``."""
+        if self._journal is None or self._saved_state is None:
+            raise RuntimeError("No trial in progress")
+        for kind, node, value in reversed(self._journal):
+            if kind == "children":
+                if value == 0:
+                    node.children = _NO_CHILDREN
+                else:
+                    del node.children[value:]
+            else:
+                node._restore_content(value)
+        self.current_branch, self.current_node, self.not_imm_node_queue = (
+            self._saved_state
+        )
+        self._journal = None
+        self._saved_state = None
+
+    @property
+    def at_top_level_anchor(self) -> bool:
+        """
+        Whether the last row was attached as a child of the root with no rows pending.
+
+        The rest of the build then only depends on the root's earlier children and the
+        current node, which is what incremental re-parsing resumes from.
+        """
+        return (
+            not self.not_imm_node_queue
+            and len(self.current_branch) == 2
+            and self.current_node is self.current_branch[1]
+        )
+
+    @staticmethod
+    def resume_at_anchor(
+        strategy: AutoPruneStrategy, root: TreeNode, node: TreeNode
+    ) -> "AutoPruneBuilder":
+        """
+        Recreate the state right after ``node``, the last child of ``root``, was attached
+        at a top-level anchor.
+        """
+        builder = AutoPruneBuilder.__new__(AutoPruneBuilder)
+        builder.strategy = strategy
+        builder.root = root
+        builder.current_branch = [root, node]
+        builder.current_node = node
+        builder.not_imm_node_queue = deque()
+        builder._journal = None
+        builder._saved_state = None
+        return builder
+
+    def feed(self, candidates: List[ChainNode]) -> None:
+        """
+        Process the next row of the chain.
+
+        Args:
+            candidates (List[ChainNode]): Candidates of the row; empty rows are skipped.
+        """
+        if not candidates:
+            return
+
+        queue = self.not_imm_node_queue
+        immediate_node = self.strategy._select_immediate_candidate(
+            self.current_node, candidates
+        )
+
+        if immediate_node:
+            # merge queued nodes deemed as noise before attaching the new node
+            while queue:
+                self._concat_one_not_imm_node_to_current_node()
+            self._add_node_to_tree(immediate_node)
+        else:
+            queue.append(candidates)
+
+        window = self.strategy.window
+        assert len(queue) <= window, "Too many nodes in not_imm_node_stack"
+        if len(queue) == window:
+            contiguous = self.strategy._find_contiguous_sequence(list(queue))
+            if contiguous:
+                queue.clear()
+                for node in contiguous:
+                    self._add_node_to_tree(node)
+            else:
+                self._concat_one_not_imm_node_to_current_node()
+
+    def finish(self) -> TreeNode:
+        """
+        Merge the pending rows as noise and return the root.
+
+        Returns:
+            TreeNode: The root of the constructed tree.
+        """
+        while self.not_imm_node_queue:
+            self._concat_one_not_imm_node_to_current_node()
+        return self.root
+
+    def _add_node_and_update_current_branch(self, node: TreeNode) -> None:
+        """Find the parent node of a given node and truncate the parent stack."""
+        current_branch = self.current_branch
+        node_prefix = node.level_seq
+        for index in reversed(range(len(current_branch))):
+            parent = current_branch[index]
+            if len(parent.level_seq) < len(node_prefix):
+                node_prefix = node_prefix[: len(parent.level_seq)]
+            if parent.level_seq == node_prefix:
+                del current_branch[index + 1 :]
+                current_branch.append(node)
+                if self._journal is not None:
+                    self._journal.append(("children", parent, len(parent.children)))
+                parent.add_child(node)
+                return
+        assert False, "Parent node not found"
+
+    def _add_node_to_tree(self, node: ChainNode) -> None:
+        """Add a node to the tree."""
+        new_tree_node = TreeNode.from_chain_node(node)
+        self._add_node_and_update_current_branch(new_tree_node)
+        self.current_node = new_tree_node
+
+    def _concat_one_not_imm_node_to_current_node(self) -> None:
+        """Concatenate one candidate line from not_imm_node_queue to current_node."""
+        candidates = self.not_imm_node_queue.popleft()
+        if not candidates:
+            return
+        if self._journal is not None:
+            self._journal.append(
+                ("content", self.current_node, self.current_node._save_content())
+            )
+        self.current_node.concat_node(_select_by_priority(candidates))
+
+
+class _SubtreeCollector(AutoPruneBuilder):
+    """AutoPruneBuilder that tracks the nodes attached at a given depth."""
+
+    def __init__(
+        self, strategy: AutoPruneStrategy, root_candidates: Sequence[ChainNode], depth: int
+    ):
+        super().__init__(strategy, root_candidates)
+        self.depth = depth
+        # Nodes attached at ``depth`` and not yet yielded, in document order.
+        self.attached: Deque[TreeNode] = deque()
+
+    def _add_node_and_update_current_branch(self, node: TreeNode) -> None:
+        super()._add_node_and_update_current_branch(node)
+        if len(self.current_branch) == self.depth + 1:
+            self.attached.append(node)
+
+    def pop_closed(self, finished: bool = False) -> Iterator[TreeNode]:
+        """Detach and yield the attached nodes whose subtree can no longer change."""
+        attached = self.attached
+        branch = self.current_branch
+        open_node = branch[self.depth] if len(branch) > self.depth else None
+        while attached and (finished or attached[0] is not open_node):
+            node = attached.popleft()
+            assert node.parent is not None
+            yield _detach_first_child(node.parent)
+
+
+# A selection path of ViterbiStrategy, as a linked list from the last selected row:
+# (row index, candidate index, previous link).
+_Selection = Optional[Tuple[int, int, Any]]
+
+
+class ViterbiStrategy(TreeBuildingStrategy):
+    """
+    Tree building strategy that picks the best scoring interpretation of the whole chain.
+
+    Each row either selects one of its candidates or is marked as noise, whose content is
+    merged into the previous selected node. Selecting a candidate that is immediately
+    next to the previously selected one (see ``is_imm_next``) is rewarded, any other
+    selection is penalized, as is each noise row, and candidates of lower
+    ``pattern_priority`` are slightly preferred. The highest scoring sequence of choices
+    is found by dynamic programming (Viterbi).
+
+    Only the level sequence of the last selected node matters for the rest of the chain,
+    so the states are keyed by it. A state trailing the best one by more than one
+    continuity swing (``continuity_reward + break_penalty``) can never catch up and is
+    dropped. That alone does not bound the states: when rows never continue each other,
+    such as a strictly decreasing numbering, every selection stays within the swing of
+    marking everything as noise, and the states grow with the number of rows. The
+    ``beam_width`` best states are therefore kept per row, for a cost of
+    O(n * k * beam_width) for n rows of k candidates. The result is optimal whenever no
+    more than ``beam_width`` states are within the swing of the best one, which holds
+    for ordinary documents; ``beam_width=None`` keeps them all, exact but quadratic in
+    the worst case.
+    """
+
+    DEFAULT_BEAM_WIDTH = 32
+
+    def __init__(
+        self,
+        continuity_reward: float = 1.0,
+        break_penalty: float = 1.0,
+        noise_penalty: float = 0.5,
+        priority_weight: float = 0.01,
+        beam_width: Optional[int] = DEFAULT_BEAM_WIDTH,
+    ):
+        """
+        Args:
+            continuity_reward (float): Score of selecting a node immediately next to the
+                                       previously selected one.
+            break_penalty (float): Cost of selecting any other node.
+            noise_penalty (float): Cost of marking a row as noise.
+            priority_weight (float): Cost per unit of ``pattern_priority`` of a selected node.
+            beam_width (Optional[int]): Maximum number of states kept per row; None keeps
+                                        every state that can still win, at a
+                                        quadratic worst-case cost.
+        """
+        if beam_width is not None and beam_width < 1:
+            raise ValueError(f"beam_width {beam_width} must be at least 1")
+        self.continuity_reward = continuity_reward
+        self.break_penalty = break_penalty
+        self.noise_penalty = noise_penalty
+        self.priority_weight = priority_weight
+        self.beam_width = beam_width
+
+    def build_tree(
+        self, chain: Union[List[ChainNode], List[List[ChainNode]]]
+    ) -> TreeNode:
+        """
+        Convert chain nodes to a tree structure using the best scoring selection.
+
+        Args:
+            chain: ChainNodes or multi-candidate rows.
+
+        Returns:
+            TreeNode: The root of the constructed tree.
+        """
+        multi_chain = _ensure_multi_chain(chain)
+        selection = self._best_selection(multi_chain)
+
+        selected_rows: List[Tuple[int, int]] = []
+        while selection is not None:
+            row, index, selection = selection
+            selected_rows.append((row, index))
+        selected = dict(selected_rows)
+
+        builder = AutoPruneBuilder(AutoPruneStrategy(), multi_chain[0])
+        for row in range(1, len(multi_chain)):
+            candidates = multi_chain[row]
+            if row in selected:
+                builder._add_node_to_tree(candidates[selected[row]])
+            else:
+                builder.not_imm_node_queue.append(candidates)
+                builder._concat_one_not_imm_node_to_current_node()
+        return builder.root
+
+    def _best_selection(self, multi_chain: List[List[ChainNode]]) -> _Selection:
+        """Run the dynamic programming over the rows after ROOT."""
+        root = _select_by_priority(multi_chain[0])
+        if not is_root(root):
+            raise ValueError("First node must be root")
+
+        # level_seq of the last selected node -> (score, selection path)
+        states: Dict[LevelSeq, Tuple[float, _Selection]] = {root.level_seq: (0.0, None)}
+        margin = self.continuity_reward + self.break_penalty
+
+        for row in range(1, len(multi_chain)):
+            candidates = multi_chain[row]
+            if not candidates:
+                continue
+            new_states: Dict[LevelSeq, Tuple[float, _Selection]] = {}
+            for index, candidate in enumerate(candidates):
+                level_seq = candidate.level_seq
+                priority_cost = self.priority_weight * candidate.pattern_priority
+                best: Optional[Tuple[float, _Selection]] = None
+                for prev_seq, (score, selection) in states.items():
+                    if is_imm_next(prev_seq, level_seq):
+                        score += self.continuity_reward
+                    else:
+                        score -= self.break_penalty
+                    if best is None or score > best[0]:
+                        best = (score, selection)
+                assert best is not None
+                score = best[0] - priority_cost
+                previous = new_states.get(level_seq)
+                if previous is None or score > previous[0]:
+                    new_states[level_seq] = (score, (row, index, best[1]))
+            # Marking the row as noise keeps every state, at a cost.
+            for prev_seq, (score, selection) in states.items():
+                score -= self.noise_penalty
+                previous = new_states.get(prev_seq)
+                if previous is None or score > previous[0]:
+                    new_states[prev_seq] = (score, selection)
+
+            best_score = max(score for score, _ in new_states.values())
+            ranked = sorted(
+                (
+                    item
+                    for item in new_states.items()
+                    if item[1][0] >= best_score - margin
+                ),
+                key=lambda item: -item[1][0],
+            )
+            if self.beam_width is not None:
+                ranked = ranked[: self.beam_width]
+            states = dict(ranked)
 
-        return None
+        return max(states.values(), key=lambda state: state[0])[1]
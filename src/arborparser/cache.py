@@ -0,0 +1,198 @@
+import hashlib
+import os
+import tempfile
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import List, Optional, Union
+from arborparser.binary import BinaryExporter, BinaryReader
+from arborparser.chain import ChainParser
+from arborparser.node import ChainNode, TreeNode
+from arborparser.tree import TreeBuilder
+
+
+class ParseCache:
+    """
+    Content-addressed cache of parsed chains and built trees.
+
+    Entries are keyed by a hash of the input text and a fingerprint of the parser's
+    patterns (and, for trees, of the building strategy), so a document is only parsed
+    again when its text or the configuration changes. Entries are kept in the compact
+    binary format: an in-memory LRU evicts the least recently used entries once their
+    total size exceeds ``max_bytes``, and an optional directory persists them across
+    processes. Every hit returns freshly loaded nodes, so callers may modify them.
+    Parsers whose converters cannot be fingerprinted (callable objects other than
+    functions) are never cached: their documents are parsed every time.
+
+    Attributes:
+        max_bytes (int): Maximum total size of the in-memory entries.
+        directory (Optional[Path]): Directory of the on-disk store, or None.
+        hits (int): Number of lookups answered from the cache.
+        misses (int): Number of lookups that had to parse.
+    """
+
+    def __init__(
+        self,
+        max_bytes: int = 64 << 20,
+        directory: Optional[Union[str, Path]] = None,
+    ):
+        """
+        Args:
+            max_bytes (int): Maximum total size of the in-memory entries, in bytes.
+            directory (Optional[Union[str, Path]]): Directory used as an on-disk store;
+                                                    created if missing. None keeps entries
+                                                    in memory only.
+        """
+        self.max_bytes = max_bytes
+        self.directory = Path(directory) if directory is not None else None
+        if self.directory is not None:
+            self.directory.mkdir(parents=True, exist_ok=True)
+        self.hits = 0
+        self.misses = 0
+        self._entries: "OrderedDict[str, bytes]" = OrderedDict()
+        self._size = 0
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @property
+    def size(self) -> int:
+        """Total size of the in-memory entries, in bytes."""
+        return self._size
+
+    @staticmethod
+    def text_key(text: str) -> str:
+        """Hash of the input text."""
+        return hashlib.sha256(text.encode("utf-8", "surrogatepass")).hexdigest()
+
+    @staticmethod
+    def parser_fingerprint(parser: ChainParser) -> str:
+        """
+        Fingerprint of the parser's patterns, in priority order.
+
+        Raises:
+            TypeError: If a converter cannot be fingerprinted.
+        """
+        return hashlib.sha256(
+            "\n".join(pattern.fingerprint() for pattern in parser.patterns).encode()
+        ).hexdigest()
+
+    def parse_to_chain(self, parser: ChainParser, text: str) -> List[ChainNode]:
+        """
+        Cached counterpart of ``parser.parse_to_chain(text)``.
+
+        Args:
+            parser (ChainParser): The parser used on a miss.
+            text (str): The text to parse.
+
+        Returns:
+            List[ChainNode]: The parsed chain.
+        """
+        try:
+            key = self._key("chain", text, self.parser_fingerprint(parser))
+        except TypeError:
+            return parser.parse_to_chain(text)
+        data = self._get(key)
+        if data is not None:
+            return BinaryReader(data).load_chain()
+        chain = parser.parse_to_chain(text)
+        self._put(key, BinaryExporter.export_chain(chain))
+        return chain
+
+    def build_tree(
+        self, parser: ChainParser, builder: TreeBuilder, text: str
+    ) -> TreeNode:
+        """
+        Cached counterpart of ``builder.build_tree(parser.parse_to_chain(text))``.
+
+        Args:
+            parser (ChainParser): The parser used on a miss.
+            builder (TreeBuilder): The tree builder used on a miss.
+            text (str): The text to parse.
+
+        Returns:
+            TreeNode: The root of the built tree.
+        """
+        try:
+            key = self._key(
+                "tree",
+                text,
+                self.parser_fingerprint(parser),
+                builder.strategy.fingerprint(),
+            )
+        except TypeError:
+            return builder.build_tree(parser.parse_to_chain(text))
+        data = self._get(key)
+        if data is not None:
+            return BinaryReader(data).load_tree()
+        tree = builder.build_tree(parser.parse_to_chain(text))
+        self._put(key, BinaryExporter.export_tree(tree))
+        return tree
+
+    def clear(self) -> None:
+        """Drop all in-memory entries and reset the statistics; the disk store is kept."""
+        with self._lock:
+            self._entries.clear()
+            self._size = 0
+            self.hits = 0
+            self.misses = 0
+
+    def _key(self, kind: str, text: str, *fingerprints: str) -> str:
+        digest = hashlib.sha256(self.text_key(text).encode())
+        for fingerprint in fingerprints:
+            digest.update(b"\0" + fingerprint.encode())
+        return f"{kind}-{digest.hexdigest()}"
+
+    def _path(self, key: str) -> Path:
+        assert self.directory is not None
+        return self.directory / f"{key}.arbp"
+
+    def _get(self, key: str) -> Optional[bytes]:
+        with self._lock:
+            data = self._entries.get(key)
+            if data is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return data
+
+        if self.directory is not None:
+            try:
+                data = self._path(key).read_bytes()
+            except FileNotFoundError:
+                pass
+            else:
+                with self._lock:
+                    self.hits += 1
+                self._remember(key, data)
+                return data
+
+        with self._lock:
+            self.misses += 1
+        return None
+
+    def _put(self, key: str, data: bytes) -> None:
+        self._remember(key, data)
+        if self.directory is not None:
+            # Write to a temporary file first so readers never see a partial entry.
+            fd, temp_path = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+            try:
+                with os.fdopen(fd, "wb") as file:
+                    file.write(data)
+                os.replace(temp_path, self._path(key))
+            except BaseException:
+                os.unlink(temp_path)
+                raise
+
+    def _remember(self, key: str, data: bytes) -> None:
+        if len(data) > self.max_bytes:
+            return
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self._size -= len(previous)
+            self._entries[key] = data
+            self._size += len(data)
+            while self._size > self.max_bytes:
+                _, evicted = self._entries.popitem(last=False)
+                self._size -= len(evicted)
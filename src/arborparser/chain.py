@@ -1,6 +1,31 @@
-from typing import List, Union, Sequence, Any
-from arborparser.node import ChainNode
-from arborparser.pattern import LevelPattern
+import mmap
+import re
+from pathlib import Path
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Sequence,
+    Tuple,
+    Union,
+)
+from arborparser.node import ChainNode, ContentSource, LevelSeq
+from arborparser.pattern import ANY_DECIMAL_DIGIT, LevelPattern, PatternSet
+
+if TYPE_CHECKING:
+    # The batch helpers pull in concurrent.futures; they are imported when first used.
+    from arborparser.batch import BatchInput, ExecutorSpec
+
+# First byte that is not ASCII whitespace in the ``str.isspace`` sense.
+_FIRST_NON_SPACE_BYTE = re.compile(rb"[^\t\n\x0b\x0c\r\x1c-\x1f ]")
+
+# The fused PatternSet scan is only worth it when the first-character index leaves more
+# than this many patterns to try; fewer are cheaper to match one by one.
+PATTERN_SET_MIN_CANDIDATES = 3
 
 
 class ChainParser:
@@ -10,74 +35,406 @@ class ChainParser:
     Attributes:
         patterns (List[LevelPattern]): A list of regex patterns, each with a conversion function
                                        to transform matches into hierarchy lists.
+        pattern_set (Optional[PatternSet]): All patterns fused into one regex, used to reject
+                                            body lines with a single scan. None if disabled.
+        lazy_content (bool): Whether nodes parsed from a string store offsets into it instead
+                             of copies of their content.
     """
 
-    def __init__(self, patterns: List[LevelPattern]):
+    _patterns_by_first_char: Dict[str, Tuple[int, ...]]
+    _any_first_char_patterns: Tuple[int, ...]
+    _decimal_first_char_patterns: Tuple[int, ...]
+
+    def __init__(
+        self,
+        patterns: List[LevelPattern],
+        use_pattern_set: bool = False,
+        lazy_content: bool = False,
+    ):
         """
         Initializes the ChainParser with the given patterns.
 
         Args:
             patterns (List[LevelPattern]): List of regex patterns and conversion functions.
+            use_pattern_set (bool): Fuse all patterns into a single regex so that lines
+                                    matching no pattern are rejected with one scan. Lines
+                                    are first narrowed down by their first character, so
+                                    the scan only runs when at least
+                                    ``PATTERN_SET_MIN_CANDIDATES`` patterns remain; it
+                                    only helps with many patterns sharing first characters.
+            lazy_content (bool): Store each node's content as a ``(start, end)`` span into the
+                                 parsed text, materialized only when accessed. The nodes keep
+                                 the whole text alive as long as they are referenced.
         """
         self.patterns = patterns
+        self.lazy_content = lazy_content
+        self.pattern_set: Optional[PatternSet] = (
+            PatternSet(patterns) if use_pattern_set else None
+        )
+        self._build_first_char_index()
+
+    def __reduce__(self) -> Tuple[Any, ...]:
+        # Ship only the configuration; the indexes are rebuilt on unpickling.
+        return (
+            ChainParser,
+            (self.patterns, self.pattern_set is not None, self.lazy_content),
+        )
+
+    def _build_first_char_index(self) -> None:
+        """
+        Map each possible first non-space character to the indices of the patterns that
+        can match a line starting with it, so most body lines are dropped with one lookup.
+        """
+        any_first_char = tuple(
+            index
+            for index, pattern in enumerate(self.patterns)
+            if pattern.first_chars is None
+        )
+        all_first_chars = set()
+        for pattern in self.patterns:
+            if pattern.first_chars is not None:
+                all_first_chars.update(pattern.first_chars)
+        all_first_chars.discard(ANY_DECIMAL_DIGIT)
+
+        def can_start(pattern: LevelPattern, char: str) -> bool:
+            return (
+                pattern.first_chars is None
+                or char in pattern.first_chars
+                or (char.isdecimal() and ANY_DECIMAL_DIGIT in pattern.first_chars)
+            )
 
-    def parse_to_multi_chain(self, text: str) -> List[List[ChainNode]]:
+        self._any_first_char_patterns = any_first_char
+        # Used for decimal digits missing from the index, which only lists the ASCII ones
+        # and those named explicitly by a pattern.
+        self._decimal_first_char_patterns = tuple(
+            index
+            for index, pattern in enumerate(self.patterns)
+            if pattern.first_chars is None or ANY_DECIMAL_DIGIT in pattern.first_chars
+        )
+        self._patterns_by_first_char = {
+            char: tuple(
+                index
+                for index, pattern in enumerate(self.patterns)
+                if can_start(pattern, char)
+            )
+            for char in all_first_chars
+        }
+
+    def parse_to_multi_chain(
+        self, text: str, workers: int = 1
+    ) -> List[List[ChainNode]]:
         """
         Parse text and return every ChainNode candidate detected per line.
 
         A line might match multiple patterns or a single pattern might produce multiple
         hierarchy sequences. Each inner list preserves the order of the candidates
         detected for that line.
+
+        Args:
+            text (str): Input text to be parsed.
+            workers (int): Number of processes scanning the text in parallel; see
+                           ``parse_to_chain``.
         """
-        return self._parse_to_chain(text, is_multi_chain=True)
+        return self._parse_to_chain(text, is_multi_chain=True, workers=workers)
 
-    def parse_to_chain(self, text: str) -> List[ChainNode]:
+    def parse_to_chain(self, text: str, workers: int = 1) -> List[ChainNode]:
         """
         Core parsing logic to convert text into a chain of nodes.
 
         Args:
             text (str): Input text to be parsed.
+            workers (int): Number of processes scanning the text in parallel. Above 1,
+                           the text is split at line boundaries and the results are
+                           stitched together; the output is identical to a sequential
+                           parse. Texts too short to be worth splitting are parsed
+                           sequentially.
 
         Returns:
             List[ChainNode]: List of parsed ChainNodes.
         """
-        return self._parse_to_chain(text, is_multi_chain=False)
+        return self._parse_to_chain(text, is_multi_chain=False, workers=workers)
 
-    def _parse_to_chain(
-        self, text: str, is_multi_chain: bool = False
+    def parse_stream(self, lines: Iterable[str]) -> Iterator[ChainNode]:
+        """
+        Parse a stream of text and yield each ChainNode as soon as its content is complete.
+
+        The input can be any iterable of strings, such as an open file, a list of lines or
+        the chunks produced by a decompressor; chunks do not need to be aligned to line
+        boundaries. A node is yielded once the next heading (or the end of the stream)
+        closes its content, so memory stays bounded by the largest section.
+
+        Args:
+            lines (Iterable[str]): Text chunks whose concatenation is the input text.
+
+        Yields:
+            ChainNode: The same nodes, in the same order, as ``parse_to_chain``.
+        """
+        for nodes in self._iter_rows(self._split_lines(lines), is_multi_chain=False):
+            yield nodes[0]
+
+    def parse_multi_stream(self, lines: Iterable[str]) -> Iterator[List[ChainNode]]:
+        """
+        Streaming counterpart of ``parse_to_multi_chain``.
+
+        Args:
+            lines (Iterable[str]): Text chunks whose concatenation is the input text.
+
+        Yields:
+            List[ChainNode]: The candidates of each heading line, once its content is complete.
+        """
+        yield from self._iter_rows(self._split_lines(lines), is_multi_chain=True)
+
+    def parse_file(
+        self, file_path: Union[str, Path], encoding: str = "utf-8"
+    ) -> List[ChainNode]:
+        """
+        Parse a file by memory-mapping it instead of reading it into a string.
+
+        Body lines are rejected from their first byte where possible, only candidate
+        heading lines are decoded, and node content is kept as byte spans into the
+        mapping, decoded only when accessed. Newlines are not translated, so the
+        result matches ``parse_to_chain`` on the file read with ``newline=""``.
+
+        Args:
+            file_path (Union[str, Path]): Path of the file to parse.
+            encoding (str): Encoding of the file. It must be ASCII-compatible, e.g. UTF-8.
+
+        Returns:
+            List[ChainNode]: List of parsed ChainNodes.
+        """
+        return self._parse_file(file_path, encoding, is_multi_chain=False)
+
+    def parse_multi_file(
+        self, file_path: Union[str, Path], encoding: str = "utf-8"
+    ) -> List[List[ChainNode]]:
+        """
+        Memory-mapped counterpart of ``parse_to_multi_chain``.
+
+        Args:
+            file_path (Union[str, Path]): Path of the file to parse.
+            encoding (str): Encoding of the file. It must be ASCII-compatible, e.g. UTF-8.
+
+        Returns:
+            List[List[ChainNode]]: Candidates detected for each heading line.
+        """
+        return self._parse_file(file_path, encoding, is_multi_chain=True)
+
+    def parse_many(
+        self,
+        inputs: Iterable["BatchInput"],
+        executor: "ExecutorSpec" = "process",
+        max_workers: Optional[int] = None,
+        chunksize: int = 16,
+    ) -> Iterator[List[ChainNode]]:
+        """
+        Parse many documents in parallel, yielding the chains in input order.
+
+        Inputs are sent to the workers in chunks, with a bounded number of chunks in
+        flight. Process workers receive the parser once and return each chain in the
+        compact binary format instead of as pickled nodes.
+
+        Args:
+            inputs (Iterable[BatchInput]): Texts, or paths of files (``os.PathLike``) to
+                                           parse with ``parse_file``.
+            executor (ExecutorSpec): "process", "thread", or an executor to reuse.
+            max_workers (Optional[int]): Pool size; None uses the number of CPUs.
+            chunksize (int): Number of inputs sent to a worker per task.
+
+        Returns:
+            Iterator[List[ChainNode]]: The chain of each input.
+        """
+        from arborparser.batch import run_batch
+
+        for _, chain in run_batch(
+            self, None, inputs, executor, max_workers, chunksize, ordered=True
+        ):
+            yield chain
+
+    def parse_many_as_completed(
+        self,
+        inputs: Iterable["BatchInput"],
+        executor: "ExecutorSpec" = "process",
+        max_workers: Optional[int] = None,
+        chunksize: int = 16,
+    ) -> Iterator[Tuple[int, List[ChainNode]]]:
+        """
+        Same as ``parse_many``, but yield each chunk's chains as soon as it completes.
+
+        Returns:
+            Iterator[Tuple[int, List[ChainNode]]]: Index of each input and its chain.
+        """
+        from arborparser.batch import run_batch
+
+        return run_batch(
+            self, None, inputs, executor, max_workers, chunksize, ordered=False
+        )
+
+    def _parse_file(
+        self, file_path: Union[str, Path], encoding: str, is_multi_chain: bool
     ) -> Union[List[ChainNode], List[List[ChainNode]]]:
-        root = ChainNode(level_seq=[], level_text="", title="ROOT", pattern_priority=0)
-        current_nodes: List[ChainNode] = [root]
-        current_content: List[str] = []
+        if "\n".encode(encoding) != b"\n" or "a".encode(encoding) != b"a":
+            raise ValueError(f"Encoding {encoding} is not ASCII-compatible")
 
+        buffer: ContentSource
+        with open(file_path, "rb") as file:
+            try:
+                buffer = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+            except ValueError:  # empty files cannot be mapped
+                buffer = b""
+
+        rows = self._iter_buffer_rows(buffer, encoding, is_multi_chain=is_multi_chain)
         if is_multi_chain:
-            multi_result: List[List[ChainNode]] = [[root]]
+            return list(rows)
+        return [nodes[0] for nodes in rows]
+
+    def _iter_buffer_rows(
+        self, buffer: ContentSource, encoding: str, is_multi_chain: bool = False
+    ) -> Iterator[List[ChainNode]]:
+        """
+        Same as ``_iter_rows`` over an encoded buffer, with content assigned as byte spans.
+        """
+        assert not isinstance(buffer, str)
+        # ASCII first bytes that can open a heading; None if any byte can.
+        heading_first_bytes = (
+            None
+            if self._any_first_char_patterns
+            else {
+                ord(char) for char in self._patterns_by_first_char if ord(char) < 0x80
+            }
+        )
+
+        root = ChainNode(level_seq=(), level_text="", title="ROOT", pattern_priority=0)
+        current_nodes: List[ChainNode] = [root]
+        section_start = 0
+        line_start = 0
+        buffer_size = len(buffer)
+
+        while line_start <= buffer_size:
+            line_end = buffer.find(b"\n", line_start)
+            if line_end == -1:
+                line_end = buffer_size
+
+            first = _FIRST_NON_SPACE_BYTE.search(buffer, line_start, line_end)
+            if first is None or (
+                heading_first_bytes is not None
+                and buffer[first.start()] < 0x80
+                and buffer[first.start()] not in heading_first_bytes
+            ):
+                line_start = line_end + 1
+                continue
+
+            line = buffer[line_start:line_end].decode(encoding)
+            detected_nodes = (
+                self._detect_level(line, is_multi_chain=is_multi_chain)
+                if line.strip()
+                else []
+            )
+            if detected_nodes:
+                for node in current_nodes:
+                    node.set_span(buffer, section_start, line_start, encoding)
+                yield current_nodes
+                current_nodes = detected_nodes
+                section_start = line_start
+            line_start = line_end + 1
+
+        for node in current_nodes:
+            node.set_span(buffer, section_start, buffer_size, encoding)
+        yield current_nodes
+
+    def _parse_to_chain(
+        self, text: str, is_multi_chain: bool = False, workers: int = 1
+    ) -> Union[List[ChainNode], List[List[ChainNode]]]:
+        rows: Iterable[List[ChainNode]]
+        if workers > 1:
+            from arborparser.batch import parse_text_parallel
+
+            rows = parse_text_parallel(self, text, workers, is_multi_chain)
         else:
-            chain: List[ChainNode] = [root]
+            rows = self._iter_rows(
+                text.split("\n"),
+                is_multi_chain=is_multi_chain,
+                source=text if self.lazy_content else None,
+            )
+        if is_multi_chain:
+            return list(rows)
+        return [nodes[0] for nodes in rows]
 
-        for line in text.split("\n"):
+    @staticmethod
+    def _split_lines(chunks: Iterable[str]) -> Iterator[str]:
+        """
+        Yield the lines of the concatenated chunks, the same as ``"".join(chunks).split("\\n")``.
+        """
+        pending: List[str] = []
+        for chunk in chunks:
+            if "\n" not in chunk:
+                pending.append(chunk)
+                continue
+
+            parts = chunk.split("\n")
+            pending.append(parts[0])
+            yield "".join(pending)
+            yield from parts[1:-1]
+            pending = [parts[-1]]
+
+        yield "".join(pending)
+
+    def _iter_rows(
+        self,
+        lines: Iterable[str],
+        is_multi_chain: bool = False,
+        source: Optional[str] = None,
+    ) -> Iterator[List[ChainNode]]:
+        """
+        Yield the detected nodes of each heading line once their content is assigned.
+
+        The first row is always the ROOT node holding the text before the first heading.
+        If ``source`` is given, ``lines`` must be ``source.split("\\n")`` and the content is
+        assigned as spans into ``source`` instead of joined strings.
+        """
+        root = ChainNode(level_seq=(), level_text="", title="ROOT", pattern_priority=0)
+        current_nodes: List[ChainNode] = [root]
+        current_content: List[str] = []
+        section_start = 0
+        line_start = 0
+
+        for line in lines:
             stripped = line.strip()
             if not stripped:
-                current_content.append(line)
+                if source is None:
+                    current_content.append(line)
+                line_start += len(line) + 1
                 continue
 
             detected_nodes = self._detect_level(line, is_multi_chain=is_multi_chain)
             if detected_nodes:
-                self._assign_content(
-                    current_nodes, current_content, add_trailing_newline=True
-                )
+                if source is None:
+                    self._assign_content(
+                        current_nodes, current_content, add_trailing_newline=True
+                    )
+                else:
+                    self._assign_span(current_nodes, source, section_start, line_start)
+                yield current_nodes
                 current_nodes = detected_nodes
                 current_content = [line]
-
-                if is_multi_chain:
-                    multi_result.append(detected_nodes)
-                else:
-                    chain.append(detected_nodes[0])
-            else:
+                section_start = line_start
+            elif source is None:
                 current_content.append(line)
+            line_start += len(line) + 1
 
-        self._assign_content(current_nodes, current_content, add_trailing_newline=False)
-        return multi_result if is_multi_chain else chain
+        if source is None:
+            self._assign_content(
+                current_nodes, current_content, add_trailing_newline=False
+            )
+        else:
+            self._assign_span(current_nodes, source, section_start, len(source))
+        yield current_nodes
+
+    @staticmethod
+    def _assign_span(
+        nodes: Sequence[ChainNode], source: str, start: int, end: int
+    ) -> None:
+        for node in nodes:
+            node.set_span(source, start, end)
 
     @staticmethod
     def _assign_content(
@@ -90,7 +447,7 @@ class ChainParser:
             return
 
         content = "\n".join(content_lines)
-        if add_trailing_newline:
+        if add_trailing_newline and content_lines:
             content += "\n"
 
         for node in nodes:
@@ -107,7 +464,32 @@ class ChainParser:
             List[ChainNode]: Detected ChainNodes (may be empty if nothing matches).
         """
         detected: List[ChainNode] = []
-        for priority, pattern in enumerate(self.patterns):
+        stripped = line.lstrip()
+        if not stripped:
+            return detected
+
+        first_char = stripped[0]
+        candidates = self._patterns_by_first_char.get(first_char)
+        if candidates is None:
+            candidates = (
+                self._decimal_first_char_patterns
+                if first_char.isdecimal()
+                else self._any_first_char_patterns
+            )
+        if not candidates:
+            return detected
+
+        if (
+            self.pattern_set is not None
+            and len(candidates) >= PATTERN_SET_MIN_CANDIDATES
+        ):
+            first_index = self.pattern_set.first_match_index(line)
+            if first_index is None:
+                return detected
+            candidates = tuple(index for index in candidates if index >= first_index)
+
+        for priority in candidates:
+            pattern = self.patterns[priority]
             match = pattern.regex.match(line)
             if not match:
                 continue
@@ -143,7 +525,7 @@ class ChainParser:
         return detected
 
     @staticmethod
-    def _normalize_level_sequences(result: Any) -> List[List[int]]:
+    def _normalize_level_sequences(result: Any) -> List[LevelSeq]:
         """
         Ensure converter output is treated uniformly as a list of level sequences.
         """
@@ -152,5 +534,5 @@ class ChainParser:
 
         first = result[0]
         if isinstance(first, (list, tuple)):
-            return [list(seq) for seq in result if seq]
-        return [list(result)]
+            return [tuple(seq) for seq in result if seq]
+        return [tuple(result)]
@@ -0,0 +1,286 @@
+from array import array
+from typing import Iterator, List, MutableSequence, Optional, Sequence, Tuple
+from arborparser.node import LevelSeq, TreeNode
+
+NO_NODE = -1
+
+
+def _pack_ints(values: Sequence[int]) -> MutableSequence[int]:
+    """Pack ints into a compact array, falling back to a list if they do not fit in 64 bits."""
+    try:
+        return array("q", values)
+    except OverflowError:
+        return list(values)
+
+
+class FlatNode:
+    """
+    Lazy, read-only view of one node in a FlatTree, offering the TreeNode accessors.
+
+    Attributes:
+        tree (FlatTree): The tree the node belongs to.
+        index (int): Preorder index of the node.
+    """
+
+    __slots__ = ("tree", "index")
+
+    def __init__(self, tree: "FlatTree", index: int):
+        self.tree = tree
+        self.index = index
+
+    @property
+    def level_seq(self) -> LevelSeq:
+        return self.tree.level_seq(self.index)
+
+    @property
+    def level_text(self) -> str:
+        return self.tree.level_texts[self.index]
+
+    @property
+    def title(self) -> str:
+        return self.tree.titles[self.index]
+
+    @property
+    def content(self) -> str:
+        return self.tree.content(self.index)
+
+    @property
+    def depth(self) -> int:
+        return self.tree.depths[self.index]
+
+    @property
+    def parent(self) -> Optional["FlatNode"]:
+        parent = self.tree.parents[self.index]
+        return None if parent == NO_NODE else FlatNode(self.tree, parent)
+
+    @property
+    def children(self) -> List["FlatNode"]:
+        return [FlatNode(self.tree, child) for child in self.tree.child_indices(self.index)]
+
+    def get_full_content(self) -> str:
+        """
+        Get the full content of the node and all its descendants.
+        """
+        return self.tree.full_content(self.index)
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, FlatNode):
+            return NotImplemented
+        return self.tree is other.tree and self.index == other.index
+
+    def __hash__(self) -> int:
+        return hash((id(self.tree), self.index))
+
+    def __repr__(self) -> str:
+        return (
+            f"FlatNode(index={self.index}, level_seq={self.level_seq!r}, "
+            f"title={self.title!r})"
+        )
+
+
+class FlatTree:
+    """
+    A tree stored as parallel preorder arrays instead of linked TreeNode objects.
+
+    Node ``i`` is the i-th node of a preorder traversal; node 0 is the root. Because the
+    tree preserves the document order, the contents of all nodes concatenated in
+    preorder form ``text``, and each node's content is a slice of it.
+
+    Attributes:
+        parents (MutableSequence[int]): Parent index of each node, NO_NODE for the root.
+        depths (MutableSequence[int]): Depth of each node, 0 for the root.
+        first_children (MutableSequence[int]): Index of the first child, or NO_NODE.
+        next_siblings (MutableSequence[int]): Index of the next sibling, or NO_NODE.
+        subtree_ends (MutableSequence[int]): Index just past the last descendant of each node.
+        level_offsets (MutableSequence[int]): Node ``i`` owns ``levels[level_offsets[i]:level_offsets[i + 1]]``.
+        levels (MutableSequence[int]): All level sequences packed into one int array.
+        level_texts (List[str]): Level text of each node.
+        titles (List[str]): Title of each node.
+        text (str): Contents of all nodes concatenated in preorder.
+        content_offsets (MutableSequence[int]): Node ``i`` owns ``text[content_offsets[i]:content_offsets[i + 1]]``.
+    """
+
+    __slots__ = (
+        "parents",
+        "depths",
+        "first_children",
+        "next_siblings",
+        "subtree_ends",
+        "level_offsets",
+        "levels",
+        "level_texts",
+        "titles",
+        "text",
+        "content_offsets",
+    )
+
+    def __init__(
+        self,
+        parents: MutableSequence[int],
+        depths: MutableSequence[int],
+        first_children: MutableSequence[int],
+        next_siblings: MutableSequence[int],
+        subtree_ends: MutableSequence[int],
+        level_offsets: MutableSequence[int],
+        levels: MutableSequence[int],
+        level_texts: List[str],
+        titles: List[str],
+        text: str,
+        content_offsets: MutableSequence[int],
+    ):
+        self.parents = parents
+        self.depths = depths
+        self.first_children = first_children
+        self.next_siblings = next_siblings
+        self.subtree_ends = subtree_ends
+        self.level_offsets = level_offsets
+        self.levels = levels
+        self.level_texts = level_texts
+        self.titles = titles
+        self.text = text
+        self.content_offsets = content_offsets
+
+    def __len__(self) -> int:
+        return len(self.parents)
+
+    @property
+    def root(self) -> FlatNode:
+        """View of the root node."""
+        return FlatNode(self, 0)
+
+    def node(self, index: int) -> FlatNode:
+        """
+        Get a view of a node.
+
+        Args:
+            index (int): Preorder index of the node.
+
+        Returns:
+            FlatNode: Lazy view of the node.
+        """
+        if not 0 <= index < len(self):
+            raise IndexError(f"Node index {index} out of range")
+        return FlatNode(self, index)
+
+    def __iter__(self) -> Iterator[FlatNode]:
+        """Iterate over views of all nodes in preorder."""
+        return (FlatNode(self, index) for index in range(len(self)))
+
+    def level_seq(self, index: int) -> LevelSeq:
+        return tuple(self.levels[self.level_offsets[index] : self.level_offsets[index + 1]])
+
+    def content(self, index: int) -> str:
+        return self.text[self.content_offsets[index] : self.content_offsets[index + 1]]
+
+    def full_content(self, index: int) -> str:
+        """Content of a node and all its descendants, a single slice of ``text``."""
+        end = self.subtree_ends[index]
+        return self.text[self.content_offsets[index] : self.content_offsets[end]]
+
+    def child_indices(self, index: int) -> Iterator[int]:
+        """Iterate over the indices of a node's children, in order."""
+        child = self.first_children[index]
+        while child != NO_NODE:
+            yield child
+            child = self.next_siblings[child]
+
+    @staticmethod
+    def from_tree(root: TreeNode) -> "FlatTree":
+        """
+        Flatten a TreeNode graph.
+
+        Args:
+            root (TreeNode): Root of the tree to flatten.
+
+        Returns:
+            FlatTree: The flattened tree.
+        """
+        parents: List[int] = []
+        depths: List[int] = []
+        first_children: List[int] = []
+        next_siblings: List[int] = []
+        subtree_ends: List[int] = []
+        level_offsets = [0]
+        levels: List[int] = []
+        level_texts: List[str] = []
+        titles: List[str] = []
+        contents: List[str] = []
+        content_offsets = [0]
+
+        # (node, parent index, depth); children are pushed in reverse to pop in order
+        stack: List[Tuple[TreeNode, int, int]] = [(root, NO_NODE, 0)]
+        last_child: List[int] = []
+        while stack:
+            node, parent, depth = stack.pop()
+            index = len(parents)
+
+            parents.append(parent)
+            depths.append(depth)
+            first_children.append(NO_NODE)
+            next_siblings.append(NO_NODE)
+            subtree_ends.append(NO_NODE)
+            last_child.append(NO_NODE)
+            levels.extend(node.level_seq)
+            level_offsets.append(len(levels))
+            level_texts.append(node.level_text)
+            titles.append(node.title)
+            contents.append(node.content)
+            content_offsets.append(content_offsets[-1] + len(node.content))
+
+            if parent != NO_NODE:
+                if last_child[parent] == NO_NODE:
+                    first_children[parent] = index
+                else:
+                    next_siblings[last_child[parent]] = index
+                last_child[parent] = index
+
+            for child in reversed(node.children):
+                stack.append((child, index, depth + 1))
+
+        # A node's subtree ends where the next node at the same or a shallower depth starts
+        open_nodes: List[int] = []
+        for index, depth in enumerate(depths):
+            while open_nodes and depths[open_nodes[-1]] >= depth:
+                subtree_ends[open_nodes.pop()] = index
+            open_nodes.append(index)
+        for index in open_nodes:
+            subtree_ends[index] = len(depths)
+
+        return FlatTree(
+            parents=array("l", parents),
+            depths=array("l", depths),
+            first_children=array("l", first_children),
+            next_siblings=array("l", next_siblings),
+            subtree_ends=array("l", subtree_ends),
+            level_offsets=array("l", level_offsets),
+            levels=_pack_ints(levels),
+            level_texts=level_texts,
+            titles=titles,
+            text="".join(contents),
+            content_offsets=array("q", content_offsets),
+        )
+
+    def to_tree(self) -> TreeNode:
+        """
+        Convert back to a TreeNode graph.
+
+        The content of each TreeNode is a span into ``text``, so no content is copied.
+
+        Returns:
+            TreeNode: Root of the rebuilt tree.
+        """
+        nodes: List[TreeNode] = []
+        for index in range(len(self)):
+            node = TreeNode(
+                level_seq=self.level_seq(index),
+                level_text=self.level_texts[index],
+                title=self.titles[index],
+            )
+            node.set_span(
+                self.text, self.content_offsets[index], self.content_offsets[index + 1]
+            )
+            parent = self.parents[index]
+            if parent != NO_NODE:
+                nodes[parent].add_child(node)
+            nodes.append(node)
+        return nodes[0]
@@ -0,0 +1,272 @@
+import bisect
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Sequence, Tuple
+from arborparser.build_strategy import AutoPruneBuilder, AutoPruneStrategy
+from arborparser.chain import ChainParser
+from arborparser.node import _NO_CHILDREN, ChainNode, TreeNode
+from arborparser.tree import TreeBuilder
+
+
+@dataclass(frozen=True)
+class LineEdit:
+    """
+    Replacement of a range of lines of a document.
+
+    Attributes:
+        start (int): Index of the first replaced line.
+        end (int): Index just past the last replaced line; equal to ``start`` to insert.
+        lines (Tuple[str, ...]): The new lines, without newlines; empty to delete.
+    """
+
+    start: int
+    end: int
+    lines: Tuple[str, ...] = ()
+
+
+class IncrementalDocument:
+    """
+    A parsed document that is kept up to date as its lines are edited.
+
+    Heading detection is line-local, so an edit only re-detects the replaced lines and
+    recomputes the content of the section it falls in. With AutoPruneStrategy, the
+    tree is rebuilt from the last top-level node attached before the edit with no rows
+    pending, and the rebuild stops as soon as it reaches a row that was such an anchor
+    in the previous build too: from there on the previous subtrees are reused as they
+    are. Other strategies rebuild the tree from the updated chain.
+
+    The chain and tree are always identical to a full parse of ``text``.
+
+    Attributes:
+        parser (ChainParser): Parser used to detect headings.
+        builder (TreeBuilder): Builder whose strategy builds the tree.
+        multi_chain (bool): Keep every candidate of each heading line, as
+                            ``parse_to_multi_chain`` does.
+        lines (List[str]): Lines of the document, without newlines.
+        tree (TreeNode): The current tree. It is updated in place by AutoPruneStrategy
+                         rebuilds.
+        rebuilt_rows (int): Number of chain rows fed to the strategy by the last update.
+    """
+
+    def __init__(
+        self,
+        parser: ChainParser,
+        text: str = "",
+        builder: Optional[TreeBuilder] = None,
+        multi_chain: bool = False,
+    ):
+        """
+        Args:
+            parser (ChainParser): Parser used to detect headings.
+            text (str): Initial text of the document.
+            builder (Optional[TreeBuilder]): Builder whose strategy builds the tree;
+                                             None uses the default strategy.
+            multi_chain (bool): Keep every candidate of each heading line.
+        """
+        self.parser = parser
+        self.builder = builder if builder is not None else TreeBuilder()
+        self.multi_chain = multi_chain
+        self.rebuilt_rows: int = 0
+        self._reset(text)
+
+    @property
+    def text(self) -> str:
+        return "\n".join(self.lines)
+
+    @property
+    def rows(self) -> List[List[ChainNode]]:
+        """The candidates of each row, as returned by ``parse_to_multi_chain``."""
+        return list(self._rows)
+
+    @property
+    def chain(self) -> List[ChainNode]:
+        """The first candidate of each row, as returned by ``parse_to_chain``."""
+        return [row[0] for row in self._rows]
+
+    def set_text(self, text: str) -> TreeNode:
+        """
+        Replace the whole document, parsing it from scratch.
+
+        Args:
+            text (str): The new text.
+
+        Returns:
+            TreeNode: The new tree.
+        """
+        self._reset(text)
+        return self.tree
+
+    def apply_edits(self, edits: Sequence[LineEdit]) -> TreeNode:
+        """
+        Apply line edits one after another and update the chain and the tree.
+
+        The line numbers of each edit refer to the document as left by the previous ones.
+
+        Args:
+            edits (Sequence[LineEdit]): The edits to apply.
+
+        Returns:
+            TreeNode: The updated tree.
+        """
+        rebuilt_rows = 0
+        for edit in edits:
+            self._apply_edit(edit)
+            rebuilt_rows += self.rebuilt_rows
+        self.rebuilt_rows = rebuilt_rows
+        return self.tree
+
+    def _reset(self, text: str) -> None:
+        self.lines = text.split("\n")
+        root = ChainNode(level_seq=(), level_text="", title="ROOT", pattern_priority=0)
+        self._rows: List[List[ChainNode]] = [[root]]
+        # Line index of each row's heading; the ROOT row starts at line 0.
+        self._heading_lines: List[int] = [0]
+        rows, heading_lines = self._detect(self.lines, 0)
+        self._rows.extend(rows)
+        self._heading_lines.extend(heading_lines)
+        self._assign_contents(0, len(self._rows))
+        self._anchors: Dict[int, TreeNode] = {}
+        self._build_from(None, {}, 0)
+
+    def _detect(
+        self, lines: Sequence[str], first_line: int
+    ) -> Tuple[List[List[ChainNode]], List[int]]:
+        """Detect the heading rows among some lines, the same way as ``ChainParser``."""
+        rows: List[List[ChainNode]] = []
+        heading_lines: List[int] = []
+        for index, line in enumerate(lines):
+            if not line.strip():
+                continue
+            nodes = self.parser._detect_level(line, is_multi_chain=self.multi_chain)
+            if nodes:
+                rows.append(nodes)
+                heading_lines.append(first_line + index)
+        return rows, heading_lines
+
+    def _assign_contents(self, first_row: int, end_row: int) -> None:
+        """Set the content of rows ``first_row`` to ``end_row - 1`` from the lines."""
+        row_count = len(self._rows)
+        for row in range(first_row, end_row):
+            start = self._heading_lines[row]
+            is_last = row + 1 == row_count
+            end = len(self.lines) if is_last else self._heading_lines[row + 1]
+            content = "\n".join(self.lines[start:end])
+            if end > start and not is_last:
+                content += "\n"
+            for node in self._rows[row]:
+                node.content = content
+
+    def _apply_edit(self, edit: LineEdit) -> None:
+        start, end = edit.start, edit.end
+        if not 0 <= start <= end <= len(self.lines):
+            raise ValueError(
+                f"Edit range [{start}, {end}) out of bounds for {len(self.lines)} lines"
+            )
+        new_lines = list(edit.lines)
+        if start == 0 and end == len(self.lines):
+            self._reset("\n".join(new_lines))
+            self.rebuilt_rows = len(self._rows) - 1
+            return
+
+        heading_lines = self._heading_lines
+        # Row whose content changes: the last one starting before the edit (or ROOT).
+        changed_row = max(0, bisect.bisect_left(heading_lines, start) - 1)
+        # First row after the edit, which is kept as it is.
+        kept_row = bisect.bisect_left(heading_lines, end, lo=max(1, changed_row + 1))
+
+        delta = len(new_lines) - (end - start)
+        self.lines[start:end] = new_lines
+        new_rows, new_heading_lines = self._detect(new_lines, start)
+
+        self._rows[changed_row + 1 : kept_row] = new_rows
+        heading_lines[changed_row + 1 :] = new_heading_lines + [
+            line + delta for line in heading_lines[kept_row:]
+        ]
+        self._assign_contents(changed_row, changed_row + 1 + len(new_rows))
+
+        row_shift = changed_row + 1 + len(new_rows) - kept_row
+        old_anchors = {
+            row + row_shift: node
+            for row, node in self._anchors.items()
+            if row >= kept_row
+        }
+        # The node of the changed row is rebuilt, so resume from an anchor before it.
+        kept_anchors = {
+            row: node for row, node in self._anchors.items() if row < changed_row
+        }
+        restart = max(kept_anchors, default=None)
+        self._build_from(restart, old_anchors, changed_row + 1 + len(new_rows))
+        self._anchors.update(kept_anchors)
+
+    def _build_from(
+        self,
+        restart: Optional[int],
+        old_anchors: Dict[int, TreeNode],
+        first_unchanged_row: int,
+    ) -> None:
+        """
+        (Re)build the tree from the anchor at row ``restart``, or from scratch if None.
+
+        ``old_anchors`` maps rows from ``first_unchanged_row`` on to the nodes they were
+        anchors for in the previous tree, under their new row indices.
+        """
+        strategy = self.builder.strategy
+        if not isinstance(strategy, AutoPruneStrategy):
+            self.tree = strategy.build_tree(self._rows)
+            self._anchors = {}
+            self.rebuilt_rows = len(self._rows) - 1
+            return
+
+        previous_root: Optional[TreeNode] = getattr(self, "tree", None)
+        if restart is None:
+            builder = AutoPruneBuilder(strategy, self._rows[0])
+            tail = list(previous_root.children) if previous_root is not None else []
+            first_row = 1
+        else:
+            assert previous_root is not None
+            anchor = self._anchors[restart]
+            children = previous_root.children
+            position = len(children) - 1
+            while children[position] is not anchor:
+                position -= 1
+            tail = children[position + 1 :]
+            del children[position + 1 :]
+            anchor._copy_content_from(self._rows[restart][0])
+            anchor.children = _NO_CHILDREN
+            builder = AutoPruneBuilder.resume_at_anchor(strategy, previous_root, anchor)
+            first_row = restart + 1
+
+        self._anchors = {}
+        root = builder.root
+        rows = self._rows
+        for row in range(first_row, len(rows)):
+            builder.feed(rows[row])
+            if not builder.at_top_level_anchor:
+                continue
+            self._anchors[row] = builder.current_node
+            old_node = old_anchors.get(row) if row >= first_unchanged_row else None
+            current_node = builder.current_node
+            if old_node is not None and (
+                old_node.level_seq,
+                old_node.level_text,
+                old_node.title,
+            ) == (current_node.level_seq, current_node.level_text, current_node.title):
+                # Same state, same remaining rows: reuse the previous subtrees from here.
+                position = 0
+                while tail[position] is not old_node:
+                    position += 1
+                reused = tail[position:]
+                for node in reused:
+                    node.parent = root
+                root.children[-1:] = reused
+                self._anchors[row] = old_node
+                self._anchors.update(
+                    (anchor_row, node)
+                    for anchor_row, node in old_anchors.items()
+                    if anchor_row > row
+                )
+                self.rebuilt_rows = row - first_row + 1
+                break
+        else:
+            builder.finish()
+            self.rebuilt_rows = len(rows) - first_row
+        self.tree = root
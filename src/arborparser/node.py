@@ -1,23 +1,156 @@
-from dataclasses import dataclass, field
-from typing import List, Optional
+import itertools
+import mmap
+from reprlib import recursive_repr
+from typing import (
+    Any,
+    Iterator,
+    List,
+    NoReturn,
+    Optional,
+    Sequence,
+    TextIO,
+    Tuple,
+    Union,
+)
+
+# A buffer node content can be sliced from: a str, or bytes-like data plus an encoding.
+ContentSource = Union[str, bytes, mmap.mmap]
+# An immutable hierarchy level sequence, e.g. (1, 2, 3) for "1.2.3".
+LevelSeq = Tuple[int, ...]
 
 
-@dataclass
 class BaseNode:
     """
     Base class for all node types.
 
+    The content is either a plain string or a ``(start, end)`` span into a shared source,
+    which is a string or an encoded buffer such as a memory-mapped file. Span-backed
+    content is only materialized when ``content`` is read, and concatenating adjacent
+    spans just extends the span. Other concatenations are collected in a chunk list and
+    joined once, when ``content`` is next read.
+
     Attributes:
-        level_seq (List[int]): Sequence representing the hierarchy level (e.g., [1, 2, 3]).
+        level_seq (LevelSeq): Tuple representing the hierarchy level (e.g., (1, 2, 3)).
         level_text (str): Text representation of the hierarchy level (e.g., "1.2.3").
         title (str): Original title text without hierarchy information.
         content (str): Associated content text, including level text and title.
     """
 
-    level_seq: List[int]
-    level_text: str = ""
-    title: str = ""
-    content: str = ""
+    __slots__ = (
+        "level_seq",
+        "level_text",
+        "title",
+        "_content",
+        "_chunks",
+        "_source",
+        "_encoding",
+        "_start",
+        "_end",
+    )
+
+    def __init__(
+        self,
+        level_seq: Sequence[int],
+        level_text: str = "",
+        title: str = "",
+        content: str = "",
+    ):
+        self.level_seq: LevelSeq = tuple(level_seq)
+        self.level_text = level_text
+        self.title = title
+        self._content: Optional[str] = content
+        self._chunks: Optional[List[str]] = None
+        self._source: Optional[ContentSource] = None
+        self._encoding: Optional[str] = None
+        self._start = 0
+        self._end = 0
+
+    @property
+    def content(self) -> str:
+        if self._chunks is not None:
+            self._content = "".join(self._chunks)
+            self._chunks = None
+        elif self._content is None:
+            assert self._source is not None
+            if isinstance(self._source, str):
+                self._content = self._source[self._start : self._end]
+            else:
+                assert self._encoding is not None
+                self._content = self._source[self._start : self._end].decode(
+                    self._encoding
+                )
+        return self._content
+
+    @content.setter
+    def content(self, content: str) -> None:
+        self._content = content
+        self._chunks = None
+        self._source = None
+
+    @property
+    def span(self) -> Optional[Tuple[int, int]]:
+        """The ``(start, end)`` offsets of the content in its source, or None for plain strings."""
+        if self._source is None:
+            return None
+        return self._start, self._end
+
+    def set_span(
+        self,
+        source: ContentSource,
+        start: int,
+        end: int,
+        encoding: Optional[str] = None,
+    ) -> None:
+        """
+        Back the content by ``source[start:end]`` without copying it.
+
+        Args:
+            source (ContentSource): Shared source text, or an encoded buffer.
+            start (int): Start offset of the content (in bytes for encoded buffers).
+            end (int): End offset of the content (in bytes for encoded buffers).
+            encoding (Optional[str]): Encoding used to decode a bytes-like source.
+        """
+        if not isinstance(source, str) and encoding is None:
+            raise ValueError("An encoding is required for bytes-like sources")
+        self._source = source
+        self._encoding = encoding
+        self._start = start
+        self._end = end
+        self._content = None
+        self._chunks = None
+
+    def _copy_content_from(self, node: "BaseNode") -> None:
+        """Share another node's content, keeping it span-backed if possible."""
+        if node._source is not None:
+            self.set_span(node._source, node._start, node._end, node._encoding)
+            self._content = node._content
+        else:
+            self.content = node.content
+
+    def _save_content(self) -> Tuple[Any, ...]:
+        """Snapshot of the content state, for ``_restore_content``."""
+        chunks = list(self._chunks) if self._chunks is not None else None
+        return (self._content, chunks, self._source, self._encoding, self._start, self._end)
+
+    def _restore_content(self, state: Tuple[Any, ...]) -> None:
+        """Restore the content state saved by ``_save_content``."""
+        (
+            self._content,
+            self._chunks,
+            self._source,
+            self._encoding,
+            self._start,
+            self._end,
+        ) = state
+
+    def _is_followed_by(self, node: "BaseNode") -> bool:
+        """Whether the other node's span starts where this node's span ends."""
+        return (
+            self._source is not None
+            and self._source is node._source
+            and self._encoding == node._encoding
+            and self._end == node._start
+        )
 
     def concat_node(self, node: "BaseNode") -> None:
         """
@@ -26,10 +159,37 @@ class BaseNode:
         Args:
             node (BaseNode): The node whose content will be concatenated.
         """
-        self.content += node.content
+        if self._is_followed_by(node):
+            self._end = node._end
+            self._content = None
+        elif self._chunks is not None:
+            self._chunks.append(node.content)
+        else:
+            self._chunks = [self.content, node.content]
+            self._content = None
+            self._source = None
+
+    def _fields(self) -> Tuple[Any, ...]:
+        return (self.level_seq, self.level_text, self.title, self.content)
+
+    def __eq__(self, other: object) -> bool:
+        if other.__class__ is not self.__class__:
+            return NotImplemented
+        assert isinstance(other, BaseNode)
+        return self._fields() == other._fields()
+
+    @recursive_repr()
+    def __repr__(self) -> str:
+        return (
+            f"{self.__class__.__name__}(level_seq={self.level_seq!r}, "
+            f"level_text={self.level_text!r}, title={self.title!r}, "
+            f"content={self.content!r}{self._extra_repr()})"
+        )
+
+    def _extra_repr(self) -> str:
+        return ""
 
 
-@dataclass
 class ChainNode(BaseNode):
     """
     Node in a chain structure; stores flat information only.
@@ -38,21 +198,78 @@ class ChainNode(BaseNode):
         pattern_priority (int): Priority of the matched pattern, used for sorting.
     """
 
-    pattern_priority: int = 0
+    __slots__ = ("pattern_priority",)
+
+    def __init__(
+        self,
+        level_seq: Sequence[int],
+        level_text: str = "",
+        title: str = "",
+        content: str = "",
+        pattern_priority: int = 0,
+    ):
+        super().__init__(level_seq, level_text, title, content)
+        self.pattern_priority = pattern_priority
+
+    def _fields(self) -> Tuple[Any, ...]:
+        return super()._fields() + (self.pattern_priority,)
+
+    def _extra_repr(self) -> str:
+        return f", pattern_priority={self.pattern_priority!r}"
+
+
+class _NoChildren(List["TreeNode"]):
+    """
+    Immutable empty children list shared by all leaf nodes.
+
+    ``TreeNode.add_child`` swaps it for a real list on the first child.
+    """
+
+    __slots__ = ()
+
+    def _immutable(self, *args: Any, **kwargs: Any) -> NoReturn:
+        raise TypeError("Leaf nodes share an immutable children list; use TreeNode.add_child")
+
+    append = extend = insert = __setitem__ = __iadd__ = __imul__ = _immutable
+
+    def __reduce__(self) -> str:
+        return "_NO_CHILDREN"
+
+
+_NO_CHILDREN = _NoChildren()
 
 
-@dataclass
 class TreeNode(BaseNode):
     """
     Node in a tree structure; includes hierarchical relationships.
 
     Attributes:
         parent (Optional[TreeNode]): Parent node in the tree.
-        children (List[TreeNode]): List of child nodes.
+        children (List[TreeNode]): List of child nodes. Leaf nodes share one immutable
+                                   empty list; use ``add_child`` to add children.
     """
 
-    parent: Optional["TreeNode"] = None
-    children: List["TreeNode"] = field(default_factory=list)
+    __slots__ = ("parent", "children")
+
+    def __init__(
+        self,
+        level_seq: Sequence[int],
+        level_text: str = "",
+        title: str = "",
+        content: str = "",
+        parent: Optional["TreeNode"] = None,
+        children: Optional[List["TreeNode"]] = None,
+    ):
+        super().__init__(level_seq, level_text, title, content)
+        self.parent = parent
+        self.children: List["TreeNode"] = children if children is not None else _NO_CHILDREN
+
+    def _fields(self) -> Tuple[Any, ...]:
+        # The parent is left out so comparing two trees does not recurse back up.
+        return super()._fields() + (self.children,)
+
+    def _extra_repr(self) -> str:
+        return f", children={self.children!r}"
 
     @staticmethod
     def from_chain_node(chain_node: ChainNode) -> "TreeNode":
@@ -64,12 +281,13 @@ class TreeNode(BaseNode):
         Returns:
             TreeNode: The converted tree node.
         """
-        return TreeNode(
+        tree_node = TreeNode(
             level_seq=chain_node.level_seq,
             level_text=chain_node.level_text,
             title=chain_node.title,
-            content=chain_node.content,
         )
+        tree_node._copy_content_from(chain_node)
+        return tree_node
 
     def add_child(self, child: "TreeNode") -> None:
         """
@@ -79,27 +297,61 @@ class TreeNode(BaseNode):
             child (TreeNode): The child node to be added.
         """
         child.parent = self
-        self.children.append(child)
+        if self.children is _NO_CHILDREN:
+            self.children = [child]
+        else:
+            self.children.append(child)
+
+    def iter_preorder(self) -> Iterator["TreeNode"]:
+        """
+        Iterate over the current node and all its descendants in preorder (document order).
+
+        The traversal uses an explicit stack, so it works on arbitrarily deep trees.
+        """
+        stack = [self]
+        while stack:
+            node = stack.pop()
+            yield node
+            stack.extend(reversed(node.children))
 
     def merge_all_children(self) -> None:
         """
         Merge all children into the current node.
+
+        The descendants' contents are joined once, in document order, and the merged
+        descendants are left unchanged.
         """
         if not self.children:
             return
 
-        for child in self.children:
-            child.merge_all_children()
-            self.concat_node(child)
+        descendants = list(itertools.islice(self.iter_preorder(), 1, None))
+        previous: BaseNode = self
+        for node in descendants:
+            if not previous._is_followed_by(node):
+                self.content = "".join(
+                    [self.content] + [descendant.content for descendant in descendants]
+                )
+                break
+            previous = node
+        else:
+            self._end = previous._end
+            self._content = None
+
+        self.children = _NO_CHILDREN
+
+    def write_full_content(self, stream: TextIO) -> None:
+        """
+        Write the full content of the current node and all its children to a text stream.
 
-        self.children = []
+        Args:
+            stream (TextIO): Stream the content is written to.
+        """
+        for node in self.iter_preorder():
+            stream.write(node.content)
 
     def get_full_content(self) -> str:
         """
         Get the full content of the current node and all its children.
         The result should be the same as the original text, if using the strategies in this library correctly.
         """
-        full_content = self.content
-        for child in self.children:
-            full_content += child.get_full_content()
-        return full_content
+        return "".join(node.content for node in self.iter_preorder())
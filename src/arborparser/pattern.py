@@ -1,6 +1,14 @@
 from dataclasses import dataclass, field, replace
-from typing import List, Callable, Any
+from typing import List, Callable, Any, Dict, FrozenSet, Optional, Sequence, Set, Tuple
+import functools
 import re
+import threading
+import types
+
+try:  # Python 3.11+
+    import re._parser as _sre_parse
+except ImportError:  # pragma: no cover
+    import sre_parse as _sre_parse
 from arborparser.utils import (
     roman_to_int,
     chinese_to_int,
@@ -41,6 +49,16 @@ def _safe_chinese_converter(chinese_str: str) -> int:
     return result
 
 
+def _letter_converter(letter: str) -> int:
+    """Convert an uppercase letter to its position in the alphabet (A -> 1)."""
+    return ord(letter) - ord("A") + 1
+
+
+def _circled_converter(circled_str: str) -> int:
+    """Convert a circled number (① to ⑳) to an integer."""
+    return ord(circled_str) - ord("①") + 1
+
+
 class NumberType:
     """
     Class containing different types of number information.
@@ -58,11 +76,11 @@ class NumberType:
         name="chinese",
     )
     LETTER = NumberTypeInfo(
-        pattern=r"[A-Z]", converter=lambda x: ord(x) - ord("A") + 1, name="letter"
+        pattern=r"[A-Z]", converter=_letter_converter, name="letter"
     )
     CIRCLED = NumberTypeInfo(
         pattern=r"[①②③④⑤⑥⑦⑧⑨⑩⑪⑫⑬⑭⑮⑯⑰⑱⑲⑳]",
-        converter=lambda x: ord(x) - ord("①") + 1,
+        converter=_circled_converter,
         name="circled",
     )
 
@@ -76,11 +94,289 @@ class LevelPattern:
         regex (re.Pattern[str]): Compiled regex pattern for matching.
         converter (Callable[[re.Match[str]], List[int]]): Function to convert matches to a list of integers.
         description (str): Description of the pattern.
+        first_chars (Optional[FrozenSet[str]]): Characters a matching line can start with once leading
+                                                whitespace is stripped. None means any character;
+                                                ``ANY_DECIMAL_DIGIT`` stands for all decimal digits.
+        builder (Optional[PatternBuilder]): The builder the pattern was built from, if any.
     """
 
     regex: re.Pattern[str]
     converter: Callable[[re.Match[str]], List[int]]
     description: str
+    first_chars: Optional[FrozenSet[str]] = None
+    builder: Optional["PatternBuilder"] = None
+
+    def fingerprint(self) -> str:
+        """
+        Stable identifier of what the pattern matches and how it converts matches.
+
+        Patterns built by a PatternBuilder are identified by the builder's fields; other
+        patterns by their regex source and flags and the converter's code, defaults and
+        closure values (see ``_converter_spec``), so two closures made by the same factory
+        with different captured values are told apart.
+
+        Returns:
+            str: Hex digest that is the same across processes and runs.
+
+        Raises:
+            TypeError: If the converter is a callable object other than a function, a
+                       ``functools.partial`` or a converter made by a PatternBuilder,
+                       whose behavior cannot be identified.
+        """
+        if self.builder is not None:
+            spec = self.builder.spec()
+        else:
+            spec = (
+                "raw",
+                self.regex.pattern,
+                self.regex.flags,
+                _converter_spec(self.converter),
+            )
+        import hashlib  # only needed for caching; kept off the import path
+
+        return hashlib.sha256(repr(spec).encode("utf-8")).hexdigest()
+
+    def __reduce__(self) -> Tuple[Any, ...]:
+        # Built patterns are shipped as their builder and rebuilt (once per process,
+        # through the registry) on the other side.
+        if self.builder is not None:
+            return (_build_pattern, (self.builder,))
+        return (
+            LevelPattern,
+            (self.regex, self.converter, self.description, self.first_chars),
+        )
+
+
+def _build_pattern(builder: "PatternBuilder") -> LevelPattern:
+    return builder.build()
+
+
+def _qualified_name(function: Callable[..., Any]) -> str:
+    name = getattr(function, "__qualname__", None) or type(function).__qualname__
+    return f"{getattr(function, '__module__', '')}.{name}"
+
+
+def _code_spec(code: types.CodeType) -> Tuple[Any, ...]:
+    constants = tuple(
+        _code_spec(constant)
+        if isinstance(constant, types.CodeType)
+        else _value_spec(constant, frozenset())
+        for constant in code.co_consts
+    )
+    return (code.co_code, constants, code.co_names)
+
+
+def _value_spec(value: Any, active: FrozenSet[int]) -> Any:
+    """
+    Deterministic description of a value captured by a converter.
+
+    Only values whose description is the same in every run are accepted: default object
+    reprs hold memory addresses, and set order depends on the hash seed.
+
+    Raises:
+        TypeError: If the value cannot be described deterministically.
+    """
+    if value is None or value is Ellipsis or isinstance(
+        value, (bool, int, float, complex, str, bytes)
+    ):
+        return (type(value).__name__, repr(value))
+    if isinstance(value, (tuple, list)):
+        return (
+            type(value).__name__,
+            tuple(_value_spec(item, active) for item in value),
+        )
+    if isinstance(value, (frozenset, set)):
+        return (
+            "set",
+            tuple(sorted((_value_spec(item, active) for item in value), key=repr)),
+        )
+    if isinstance(value, dict):
+        return (
+            "dict",
+            tuple(
+                sorted(
+                    (
+                        (_value_spec(key, active), _value_spec(item, active))
+                        for key, item in value.items()
+                    ),
+                    key=repr,
+                )
+            ),
+        )
+    if isinstance(value, re.Pattern):
+        return ("regex", _value_spec(value.pattern, active), value.flags)
+    if callable(value):
+        return _converter_spec(value, active)
+    raise TypeError(f"Cannot fingerprint captured value {value!r}")
+
+
+def _converter_spec(
+    converter: Callable[..., Any], active: FrozenSet[int] = frozenset()
+) -> Tuple[Any, ...]:
+    """
+    Description of what a converter does, for fingerprints.
+
+    The qualified name alone does not identify lambdas and closures: every closure made
+    by one factory shares it. Functions are therefore described by their bytecode,
+    constants, defaults and closure values. ``active`` holds the ids of the functions
+    being described, so that recursive closures refer to themselves by name.
+    """
+    if id(converter) in active:
+        return ("recursive", _qualified_name(converter))
+    active = active | {id(converter)}
+    if isinstance(converter, LevelSeqConverter):
+        return ("builder", converter.builder.spec())
+    if isinstance(converter, functools.partial):
+        return (
+            "partial",
+            _converter_spec(converter.func, active),
+            tuple(_value_spec(arg, active) for arg in converter.args),
+            tuple(
+                sorted(
+                    (key, _value_spec(arg, active))
+                    for key, arg in converter.keywords.items()
+                )
+            ),
+        )
+    if isinstance(converter, types.FunctionType):
+        closure = tuple(
+            _value_spec(cell.cell_contents, active)
+            for cell in converter.__closure__ or ()
+        )
+        defaults = tuple(
+            _value_spec(value, active) for value in converter.__defaults__ or ()
+        )
+        kwdefaults = tuple(
+            sorted(
+                (key, _value_spec(value, active))
+                for key, value in (converter.__kwdefaults__ or {}).items()
+            )
+        )
+        return (
+            "function",
+            _qualified_name(converter),
+            _code_spec(converter.__code__),
+            closure,
+            defaults,
+            kwdefaults,
+        )
+    if isinstance(converter, type):
+        return ("builtin", _qualified_name(converter))
+    if isinstance(converter, types.BuiltinFunctionType):
+        bound_to = converter.__self__
+        if bound_to is None or isinstance(bound_to, types.ModuleType):
+            return ("builtin", _qualified_name(converter))
+        # A builtin method, e.g. ``some_regex.match``: describe what it is bound to.
+        return ("builtin", _qualified_name(converter), _value_spec(bound_to, active))
+    raise TypeError(f"Cannot fingerprint converter {converter!r}")
+
+
+# Set items are only enumerated up to this many characters; larger ranges mean "any".
+_MAX_ENUMERATED_RANGE = 0x10000
+
+
+# Stands in ``first_chars`` for every character matched by ``\d``, i.e. every character
+# for which ``str.isdecimal()`` is true. Enumerating them would mean scanning all of
+# Unicode, so they are checked when a line is looked up instead.
+ANY_DECIMAL_DIGIT = "\\d"
+
+
+def _first_chars_of_item(op: Any, av: Any) -> Tuple[Optional[Set[str]], bool]:
+    """
+    Return (chars, transparent) for a single parsed regex item.
+
+    ``chars`` is the set of non-whitespace characters the item can start with (None
+    for any), and ``transparent`` tells whether the item can be passed without
+    consuming a non-whitespace character.
+    """
+    if op is _sre_parse.AT or op in (_sre_parse.ASSERT, _sre_parse.ASSERT_NOT):
+        return set(), True
+    if op is _sre_parse.LITERAL:
+        char = chr(av)
+        return (set(), True) if char.isspace() else ({char}, False)
+    if op is _sre_parse.IN:
+        chars: Set[str] = set()
+        transparent = False
+        for set_op, set_av in av:
+            if set_op is _sre_parse.LITERAL:
+                chars.add(chr(set_av))
+            elif set_op is _sre_parse.RANGE:
+                low, high = set_av
+                if high - low > _MAX_ENUMERATED_RANGE:
+                    return None, False
+                chars.update(map(chr, range(low, high + 1)))
+            elif set_op is _sre_parse.CATEGORY and set_av is _sre_parse.CATEGORY_SPACE:
+                transparent = True
+            elif set_op is _sre_parse.CATEGORY and set_av is _sre_parse.CATEGORY_DIGIT:
+                chars.update("0123456789")
+                chars.add(ANY_DECIMAL_DIGIT)
+            else:
+                return None, False
+        spaces = {char for char in chars if char.isspace()}
+        return chars - spaces, transparent or bool(spaces)
+    if op in (
+        _sre_parse.MAX_REPEAT,
+        _sre_parse.MIN_REPEAT,
+        getattr(_sre_parse, "POSSESSIVE_REPEAT", None),
+    ):
+        min_count, _, items = av
+        chars_or_any, transparent = _first_chars_of_sequence(items)
+        return chars_or_any, transparent or min_count == 0
+    if op is _sre_parse.SUBPATTERN:
+        _, add_flags, _, items = av
+        if add_flags & re.IGNORECASE:
+            return None, False
+        return _first_chars_of_sequence(items)
+    if op is getattr(_sre_parse, "ATOMIC_GROUP", None):
+        return _first_chars_of_sequence(av)
+    if op is _sre_parse.BRANCH:
+        chars = set()
+        transparent = False
+        for items in av[1]:
+            branch_chars, branch_transparent = _first_chars_of_sequence(items)
+            if branch_chars is None:
+                return None, False
+            chars |= branch_chars
+            transparent = transparent or branch_transparent
+        return chars, transparent
+    return None, False
+
+
+def _first_chars_of_sequence(items: Any) -> Tuple[Optional[Set[str]], bool]:
+    chars: Set[str] = set()
+    for op, av in items:
+        item_chars, transparent = _first_chars_of_item(op, av)
+        if item_chars is None:
+            return None, False
+        chars |= item_chars
+        if not transparent:
+            return chars, False
+    return chars, True
+
+
+def compute_first_chars(regex: re.Pattern[str]) -> Optional[FrozenSet[str]]:
+    """
+    Compute the characters a line matched by ``regex`` can start with, ignoring leading whitespace.
+
+    Args:
+        regex (re.Pattern[str]): Compiled regex to analyze.
+
+    Returns:
+        Optional[FrozenSet[str]]: The possible first non-whitespace characters, with
+                                  ``ANY_DECIMAL_DIGIT`` for ``\\d``, or None if the regex
+                                  is too general to tell (any character).
+    """
+    if regex.flags & re.IGNORECASE:
+        return None
+    try:
+        items = _sre_parse.parse(regex.pattern, regex.flags)
+    except Exception:
+        return None
+
+    chars, transparent = _first_chars_of_sequence(items)
+    if chars is None or transparent:
+        return None
+    return frozenset(chars)
 
 
 @dataclass(frozen=True)
@@ -135,6 +431,30 @@ class PatternBuilder:
                 f"Maximum level {self.max_level} must be greater than or equal to minimum level {self.min_level}"
             )
 
+    def spec(self) -> Tuple[Any, ...]:
+        """
+        Plain-data description of the builder, equal for builders producing the same pattern.
+
+        Returns:
+            Tuple[Any, ...]: The builder's fields, with the number type as its name, pattern
+                             and a description of its converter (see ``_converter_spec``).
+
+        Raises:
+            TypeError: If the number type's converter cannot be described.
+        """
+        return (
+            "builder",
+            self.prefix_regex,
+            self.number_type.name,
+            self.number_type.pattern,
+            _converter_spec(self.number_type.converter),
+            self.suffix_regex,
+            self.separator,
+            self.is_sep_regex,
+            self.min_level,
+            self.max_level,
+        )
+
     def modify(self, **kwargs: Any) -> "PatternBuilder":
         """
         Create a new PatternBuilder with modified attributes.
@@ -151,9 +471,22 @@ class PatternBuilder:
         """
         Build a LevelPattern from the current configuration.
 
+        Builds are memoized in a process-wide registry, so equal builders share one
+        compiled LevelPattern; treat it as read-only. See ``registered_patterns`` and
+        ``clear_pattern_registry``.
+
         Returns:
             LevelPattern: Compiled pattern with conversion logic.
         """
+        with _REGISTRY_LOCK:
+            pattern = _PATTERN_REGISTRY.get(self)
+        if pattern is None:
+            pattern = self._build()
+            with _REGISTRY_LOCK:
+                pattern = _PATTERN_REGISTRY.setdefault(self, pattern)
+        return pattern
+
+    def _build(self) -> LevelPattern:
         number_pattern = self.number_type.pattern
         separator_pattern = (
             self.separator if self.is_sep_regex else re.escape(self.separator)
@@ -164,29 +497,135 @@ class PatternBuilder:
         )
         pattern = rf"^\s*{self.prefix_regex}({number_pattern}{level_range_pattern}){self.suffix_regex}"
 
-        split_regex = (
-            re.compile(f"(?:{self.separator})") if self.is_sep_regex else None
+        regex = re.compile(pattern)
+        return LevelPattern(
+            regex=regex,
+            converter=LevelSeqConverter(self),
+            description=f"Match {self.number_type.__class__.__name__.lower()} numbers",
+            first_chars=compute_first_chars(regex),
+            builder=self,
         )
 
-        def converter(match: re.Match[str]) -> List[int]:
-            seq_text = match.group(1)
-            if split_regex:
-                numbers = [n for n in split_regex.split(seq_text) if n]
-            else:
-                numbers = seq_text.split(self.separator)
-            if not (self.min_level <= len(numbers) <= self.max_level):
-                raise ValueError(
-                    f"Matched levels ({len(numbers)}) out of range "
-                    f"[{self.min_level}, {self.max_level}]"
-                )
-            return [self.number_type.converter(n) for n in numbers]
 
-        return LevelPattern(
-            regex=re.compile(pattern),
-            converter=converter,
-            description=f"Match {self.number_type.__class__.__name__.lower()} numbers",
+class LevelSeqConverter:
+    """
+    Converter of the LevelPatterns built by a PatternBuilder; a top-level class so that
+    it can be pickled.
+
+    Attributes:
+        builder (PatternBuilder): The builder whose separator, levels and number type are used.
+    """
+
+    __slots__ = ("builder", "_split_regex")
+
+    def __init__(self, builder: PatternBuilder):
+        self.builder = builder
+        self._split_regex = (
+            re.compile(f"(?:{builder.separator})") if builder.is_sep_regex else None
         )
 
+    def __call__(self, match: re.Match[str]) -> List[int]:
+        builder = self.builder
+        seq_text = match.group(1)
+        if self._split_regex:
+            numbers = [n for n in self._split_regex.split(seq_text) if n]
+        else:
+            numbers = seq_text.split(builder.separator)
+        if not (builder.min_level <= len(numbers) <= builder.max_level):
+            raise ValueError(
+                f"Matched levels ({len(numbers)}) out of range "
+                f"[{builder.min_level}, {builder.max_level}]"
+            )
+        return [builder.number_type.converter(n) for n in numbers]
+
+    def __reduce__(self) -> Tuple[Any, ...]:
+        return (LevelSeqConverter, (self.builder,))
+
+
+# Patterns built by PatternBuilder.build, shared by equal builders.
+_PATTERN_REGISTRY: Dict[PatternBuilder, LevelPattern] = {}
+_REGISTRY_LOCK = threading.Lock()
+
+
+def registered_patterns() -> Dict[PatternBuilder, LevelPattern]:
+    """
+    Get a snapshot of the pattern registry.
+
+    Returns:
+        Dict[PatternBuilder, LevelPattern]: Each builder built so far, with its pattern.
+    """
+    with _REGISTRY_LOCK:
+        return dict(_PATTERN_REGISTRY)
+
+
+def clear_pattern_registry() -> None:
+    """Empty the pattern registry, so that the next builds compile their patterns again."""
+    with _REGISTRY_LOCK:
+        _PATTERN_REGISTRY.clear()
+
+
+class PatternSet:
+    """
+    A list of LevelPatterns fused into a single alternation regex.
+
+    Each pattern is wrapped in its own named group, so a single ``match`` call rejects
+    lines that no pattern can match and reports the first (highest priority) pattern
+    that does. Patterns that cannot be fused safely (mixed flags, backreferences,
+    conflicting group names) make the set fall back to trying every pattern.
+
+    Attributes:
+        patterns (List[LevelPattern]): The fused patterns, in priority order.
+        regex (Optional[re.Pattern[str]]): The fused regex, or None if fusing is not possible.
+    """
+
+    _BACKREF_REGEX = re.compile(r"\\[1-9]|\(\?P=")
+
+    def __init__(self, patterns: Sequence[LevelPattern]):
+        """
+        Initializes the PatternSet with the given patterns.
+
+        Args:
+            patterns (Sequence[LevelPattern]): Patterns to fuse, in priority order.
+        """
+        self.patterns = list(patterns)
+        self.regex = self._compile(self.patterns)
+
+    @classmethod
+    def _compile(cls, patterns: Sequence[LevelPattern]) -> Optional[re.Pattern[str]]:
+        if not patterns:
+            return None
+
+        flags = patterns[0].regex.flags
+        alternatives = []
+        for index, pattern in enumerate(patterns):
+            source = pattern.regex.pattern
+            if pattern.regex.flags != flags or cls._BACKREF_REGEX.search(source):
+                return None
+            alternatives.append(f"(?P<_p{index}>{source})")
+
+        try:
+            return re.compile("|".join(alternatives), flags)
+        except re.error:
+            return None
+
+    def first_match_index(self, line: str) -> Optional[int]:
+        """
+        Find the index of the first pattern that matches the line.
+
+        Args:
+            line (str): Text line to analyze.
+
+        Returns:
+            Optional[int]: Index of the first matching pattern, or None if no pattern matches.
+        """
+        if self.regex is None:
+            return 0 if self.patterns else None
+
+        match = self.regex.match(line)
+        if match is None or match.lastgroup is None:
+            return None
+        return int(match.lastgroup[2:])
+
 
 # Predefined pattern builders
 CHINESE_CHAPTER_PATTERN_BUILDER = PatternBuilder(
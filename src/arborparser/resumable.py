@@ -0,0 +1,165 @@
+from typing import List, Optional
+from arborparser.build_strategy import AutoPruneBuilder, AutoPruneStrategy
+from arborparser.chain import ChainParser
+from arborparser.node import ChainNode, TreeNode
+from arborparser.tree import TreeBuilder
+
+
+class ResumableParser:
+    """
+    Append-only parsing of a growing text, such as a log or a document being streamed.
+
+    The state left after parsing is kept: the trailing partial line, the last open
+    section (its candidates and content lines so far) and, with AutoPruneStrategy, the
+    branch and noise queue of the tree under construction. ``append`` only processes
+    the new text, so the work scales with the size of what is appended, not with the
+    size of the whole text. The parser can be pickled between appends to resume later,
+    possibly in another process.
+
+    ``tree`` returns the tree of the text appended so far, identical to a fresh parse
+    of the concatenated text. With AutoPruneStrategy it only closes the open section
+    and flushes the pending rows, and these changes are undone by the next ``append``;
+    the returned tree is therefore updated in place as text is appended. Other
+    strategies build the tree from the chain at each call.
+
+    Attributes:
+        parser (ChainParser): Parser used to detect headings.
+        builder (TreeBuilder): Builder whose strategy builds the tree.
+        multi_chain (bool): Keep every candidate of each heading line, as
+                            ``parse_to_multi_chain`` does.
+        length (int): Number of characters appended so far.
+    """
+
+    def __init__(
+        self,
+        parser: ChainParser,
+        builder: Optional[TreeBuilder] = None,
+        multi_chain: bool = False,
+    ):
+        """
+        Args:
+            parser (ChainParser): Parser used to detect headings.
+            builder (Optional[TreeBuilder]): Builder whose strategy builds the tree;
+                                             None uses the default strategy.
+            multi_chain (bool): Keep every candidate of each heading line.
+        """
+        self.parser = parser
+        self.builder = builder if builder is not None else TreeBuilder()
+        self.multi_chain = multi_chain
+        self.length = 0
+        # Pieces of the last line, which is not complete until a newline is appended.
+        self._partial_line: List[str] = []
+        # The open section: its candidates and its complete lines so far.
+        self._current_nodes: List[ChainNode] = [
+            ChainNode(level_seq=(), level_text="", title="ROOT", pattern_priority=0)
+        ]
+        self._current_content: List[str] = []
+        # Rows whose content is complete. With AutoPruneStrategy they are fed to the
+        # builder instead, which is created once the ROOT row is complete.
+        self._rows: List[List[ChainNode]] = []
+        self._tree_builder: Optional[AutoPruneBuilder] = None
+        self._in_trial = False
+
+    def append(self, text: str) -> None:
+        """
+        Parse text appended to the end of the input.
+
+        Args:
+            text (str): The appended text. It may start or end in the middle of a line.
+        """
+        if self._in_trial:
+            assert self._tree_builder is not None
+            self._tree_builder.rollback()
+            self._in_trial = False
+        self.length += len(text)
+        if "\n" not in text:
+            self._partial_line.append(text)
+            return
+
+        lines = text.split("\n")
+        self._partial_line.append(lines[0])
+        self._add_line("".join(self._partial_line))
+        for line in lines[1:-1]:
+            self._add_line(line)
+        self._partial_line = [lines[-1]]
+
+    def tree(self) -> TreeNode:
+        """
+        Build the tree of the text appended so far.
+
+        Returns:
+            TreeNode: The same tree as a fresh parse and build of the whole text.
+        """
+        last_line = "".join(self._partial_line)
+        last_nodes = self._detect(last_line)
+        strategy = self.builder.strategy
+        if not isinstance(strategy, AutoPruneStrategy):
+            rows = self._rows + self._closing_rows(last_line, last_nodes)
+            return strategy.build_tree(rows)
+
+        if self._tree_builder is None:
+            # Still in the ROOT section: nothing to resume, build from scratch.
+            rows = self._closing_rows(last_line, last_nodes)
+            tree_builder = AutoPruneBuilder(strategy, rows[0])
+            for row in rows[1:]:
+                tree_builder.feed(row)
+            tree_builder.finish()
+            return tree_builder.root
+
+        if not self._in_trial:
+            tree_builder = self._tree_builder
+            tree_builder.begin_trial()
+            for row in self._closing_rows(last_line, last_nodes):
+                tree_builder.feed(row)
+            tree_builder.finish()
+            self._in_trial = True
+        return self._tree_builder.root
+
+    def _detect(self, line: str) -> List[ChainNode]:
+        if not line.strip():
+            return []
+        return self.parser._detect_level(line, is_multi_chain=self.multi_chain)
+
+    def _add_line(self, line: str) -> None:
+        """Process a complete line, the same way as ``ChainParser``."""
+        detected_nodes = self._detect(line)
+        if not detected_nodes:
+            self._current_content.append(line)
+            return
+        self.parser._assign_content(
+            self._current_nodes, self._current_content, add_trailing_newline=True
+        )
+        self._close_row(self._current_nodes)
+        self._current_nodes = detected_nodes
+        self._current_content = [line]
+
+    def _close_row(self, nodes: List[ChainNode]) -> None:
+        strategy = self.builder.strategy
+        if not isinstance(strategy, AutoPruneStrategy):
+            self._rows.append(nodes)
+        elif self._tree_builder is None:
+            self._tree_builder = AutoPruneBuilder(strategy, nodes)
+        else:
+            self._tree_builder.feed(nodes)
+
+    def _closing_rows(
+        self, last_line: str, last_nodes: List[ChainNode]
+    ) -> List[List[ChainNode]]:
+        """
+        The rows that end the chain if the input stopped here: the open section,
+        completed with the partial last line, which may itself be a heading.
+        """
+        if last_nodes:
+            self.parser._assign_content(
+                self._current_nodes, self._current_content, add_trailing_newline=True
+            )
+            self.parser._assign_content(
+                last_nodes, [last_line], add_trailing_newline=False
+            )
+            return [self._current_nodes, last_nodes]
+        self.parser._assign_content(
+            self._current_nodes,
+            self._current_content + [last_line],
+            add_trailing_newline=False,
+        )
+        return [self._current_nodes]
@@ -1,8 +1,30 @@
-from typing import Dict, List, Any, Optional, Union, cast
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Callable,
+    Collection,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Sequence,
+    TextIO,
+    Tuple,
+    Union,
+    cast,
+)
+from arborparser.chain import ChainParser
 from arborparser.node import ChainNode, TreeNode
+import io
 import json
+import re
 from pathlib import Path
 from arborparser.build_strategy import TreeBuildingStrategy, AutoPruneStrategy
+from arborparser.flat_tree import FlatTree
+
+if TYPE_CHECKING:
+    # The batch helpers pull in concurrent.futures; they are imported when first used.
+    from arborparser.batch import BatchInput, ExecutorSpec
 
 
 class TreeBuilder:
@@ -34,6 +56,98 @@ class TreeBuilder:
         """
         return self.strategy.build_tree(chain)
 
+    def iter_subtrees(
+        self, chain: Iterable[Union[ChainNode, List[ChainNode]]], depth: int = 1
+    ) -> Iterator[TreeNode]:
+        """
+        Build a tree from a (possibly streamed) chain and yield its subtrees rooted at
+        ``depth`` as they are completed. See ``TreeBuildingStrategy.iter_subtrees``.
+
+        Args:
+            chain (Iterable[ChainNode | List[ChainNode]]): Parsed chain data, e.g. from
+                                                          ``ChainParser.parse_stream``.
+            depth (int): Depth of the yielded subtrees; 1 yields the top-level ones.
+
+        Returns:
+            Iterator[TreeNode]: The subtrees, detached from their parents.
+        """
+        return self.strategy.iter_subtrees(chain, depth)
+
+    def build_many(
+        self,
+        parser: ChainParser,
+        inputs: Iterable["BatchInput"],
+        executor: "ExecutorSpec" = "process",
+        max_workers: Optional[int] = None,
+        chunksize: int = 16,
+    ) -> Iterator[TreeNode]:
+        """
+        Parse and build many documents in parallel, yielding the trees in input order.
+
+        See ``ChainParser.parse_many``; process workers return each tree in the compact
+        binary format instead of as a pickled node graph.
+
+        Args:
+            parser (ChainParser): Parser applied to each input.
+            inputs (Iterable[BatchInput]): Texts, or paths of files to parse.
+            executor (ExecutorSpec): "process", "thread", or an executor to reuse.
+            max_workers (Optional[int]): Pool size; None uses the number of CPUs.
+            chunksize (int): Number of inputs sent to a worker per task.
+
+        Returns:
+            Iterator[TreeNode]: The tree of each input.
+        """
+        from arborparser.batch import run_batch
+
+        for _, tree in run_batch(
+            parser, self.strategy, inputs, executor, max_workers, chunksize, ordered=True
+        ):
+            yield tree
+
+    def build_many_as_completed(
+        self,
+        parser: ChainParser,
+        inputs: Iterable["BatchInput"],
+        executor: "ExecutorSpec" = "process",
+        max_workers: Optional[int] = None,
+        chunksize: int = 16,
+    ) -> Iterator[Tuple[int, TreeNode]]:
+        """
+        Same as ``build_many``, but yield each chunk's trees as soon as it completes.
+
+        Returns:
+            Iterator[Tuple[int, TreeNode]]: Index of each input and its tree.
+        """
+        from arborparser.batch import run_batch
+
+        return run_batch(
+            parser, self.strategy, inputs, executor, max_workers, chunksize, ordered=False
+        )
+
+    def build_flat_tree(
+        self, chain: Union[List[ChainNode], List[List[ChainNode]]]
+    ) -> FlatTree:
+        """
+        Build the tree with the specified strategy and convert it to a FlatTree.
+
+        This is a conversion helper, equivalent to
+        ``FlatTree.from_tree(self.build_tree(chain))``: the strategies place nodes through
+        TreeNode links, so the full TreeNode tree is built first and peak memory is not
+        lower than with ``build_tree``. The saving only applies once the returned FlatTree
+        is kept in place of the TreeNode tree, which is then released.
+
+        Args:
+            chain (List[ChainNode] | List[List[ChainNode]]): Parsed chain data.
+
+        Returns:
+            FlatTree: The constructed tree in preorder arrays.
+        """
+        return FlatTree.from_tree(self.build_tree(chain))
+
+
+# Fields written for each node by the JSON exporter, in order; "children" always follows.
+JSON_NODE_FIELDS = ("title", "level_seq", "level_text", "content")
+
 
 class TreeExporter:
     @staticmethod
@@ -54,117 +168,529 @@ class TreeExporter:
 
         first = chain[0]
         if isinstance(first, ChainNode):
-            return "\n".join(f"LEVEL-{n.level_seq}: {n.title}" for n in chain)  # type: ignore[list-item]
+            return "\n".join(f"LEVEL-{list(n.level_seq)}: {n.title}" for n in chain)  # type: ignore[list-item]
 
         multi_chain = cast(List[List[ChainNode]], chain)
         lines = []
         for candidates in multi_chain:
             inner = ", ".join(
-                f"LEVEL-{node.level_seq}: {node.title}" for node in candidates
+                f"LEVEL-{list(node.level_seq)}: {node.title}" for node in candidates
             )
             lines.append(f"[{inner}]")
         return "\n".join(lines)
 
     @staticmethod
-    def export_tree(tree: TreeNode) -> str:
+    def export_tree(
+        tree: TreeNode,
+        max_depth: Optional[int] = None,
+        max_nodes: Optional[int] = None,
+    ) -> str:
         """
         Export the tree as a formatted string.
 
         Args:
             tree (TreeNode): Root of the tree to export.
+            max_depth (Optional[int]): Deepest level to render; the root is at depth 0.
+            max_nodes (Optional[int]): Maximum number of nodes to render.
 
         Returns:
             str: Formatted string of the tree.
         """
-        return TreeExporter._export_tree_internal(tree)
+        stream = io.StringIO()
+        TreeExporter.export_tree_to(tree, stream, max_depth, max_nodes)
+        return stream.getvalue()
 
     @staticmethod
-    def _export_tree_internal(
-        node: TreeNode, prefix: str = "", is_last: bool = False, is_root: bool = True
-    ) -> str:
+    def export_tree_to(
+        tree: TreeNode,
+        stream: TextIO,
+        max_depth: Optional[int] = None,
+        max_nodes: Optional[int] = None,
+    ) -> int:
         """
-        Recursively output the tree structure.
+        Write the tree as formatted lines to a text stream, without building the whole string.
+
+        The tree is walked with an explicit stack, so arbitrarily deep trees can be rendered.
+        Lines are separated by newlines, with no trailing newline, as in ``export_tree``.
 
         Args:
-            node (TreeNode): Current node in the tree.
-            prefix (str): Prefix string for the tree structure.
-            is_last (bool): Flag indicating if the node is the last child.
-            is_root (bool): Flag indicating if the node is the root.
+            tree (TreeNode): Root of the tree to export.
+            stream (TextIO): Stream the lines are written to.
+            max_depth (Optional[int]): Deepest level to render; the root is at depth 0.
+            max_nodes (Optional[int]): Maximum number of nodes to render.
 
         Returns:
-            str: Formatted string of the tree structure.
+            int: Number of nodes written.
         """
-        lines = []
-
-        if is_root:
-            lines.append(node.title)
-            prefix = ""
-        else:
-            connector = "└─ " if is_last else "├─ "
-            lines.append(f"{prefix}{connector}{node.level_text} {node.title}")
-
-        child_prefix = prefix
-        if not is_root:
-            child_prefix += "    " if is_last else "│   "
-
-        for i, child in enumerate(node.children):
-            is_child_last = i == len(node.children) - 1
-            lines.append(
-                TreeExporter._export_tree_internal(
-                    child, child_prefix, is_child_last, False
+        written = 0
+        # (node, prefix, is_last, depth); children are pushed in reverse to pop in order
+        stack: List[Tuple[TreeNode, str, bool, int]] = [(tree, "", False, 0)]
+        while stack:
+            if max_nodes is not None and written >= max_nodes:
+                break
+
+            node, prefix, is_last, depth = stack.pop()
+            if written:
+                stream.write("\n")
+            if depth == 0:
+                stream.write(node.title)
+                child_prefix = ""
+            else:
+                connector = "└─ " if is_last else "├─ "
+                stream.write(f"{prefix}{connector}{node.level_text} {node.title}")
+                child_prefix = prefix + ("    " if is_last else "│   ")
+            written += 1
+
+            if max_depth is not None and depth >= max_depth:
+                continue
+            last_index = len(node.children) - 1
+            for index in range(last_index, -1, -1):
+                stack.append(
+                    (node.children[index], child_prefix, index == last_index, depth + 1)
                 )
-            )
 
-        return "\n".join(lines)
+        return written
 
     @staticmethod
-    def export_to_json(tree: TreeNode) -> str:
+    def export_to_json(
+        tree: TreeNode,
+        indent: Optional[int] = 4,
+        exclude_fields: Collection[str] = (),
+    ) -> str:
         """
         Export the tree structure to a JSON string.
 
         Args:
             tree (TreeNode): Root of the tree to export.
+            indent (Optional[int]): Indentation width, or None for a compact single line.
+            exclude_fields (Collection[str]): Node fields to leave out, e.g. ``("content",)``.
 
         Returns:
             str: JSON string representation of the tree.
         """
-        return json.dumps(
-            TreeExporter._node_to_dict(tree),
-            ensure_ascii=False,
-            indent=4,
-        )
+        stream = io.StringIO()
+        TreeExporter.export_json_to(tree, stream, indent, exclude_fields)
+        return stream.getvalue()
 
     @staticmethod
-    def export_to_json_file(tree: TreeNode, file_path: Union[str, Path]) -> None:
+    def export_to_json_file(
+        tree: TreeNode,
+        file_path: Union[str, Path],
+        indent: Optional[int] = 4,
+        exclude_fields: Collection[str] = (),
+    ) -> None:
         """
-        Export the tree structure to a JSON file.
+        Export the tree structure to a JSON file, writing it incrementally.
 
         Args:
             tree (TreeNode): Root of the tree to export.
             file_path (Union[str, Path]): Output file path.
+            indent (Optional[int]): Indentation width, or None for a compact single line.
+            exclude_fields (Collection[str]): Node fields to leave out, e.g. ``("content",)``.
 
         Returns:
             None
         """
-        file_path = Path(file_path)
-        json_data = TreeExporter.export_to_json(tree)
-        file_path.write_text(json_data, encoding="utf-8")
+        with open(file_path, "w", encoding="utf-8") as file:
+            TreeExporter.export_json_to(tree, file, indent, exclude_fields)
 
     @staticmethod
-    def _node_to_dict(node: TreeNode) -> Dict[str, Any]:
+    def export_json_to(
+        tree: TreeNode,
+        stream: TextIO,
+        indent: Optional[int] = 4,
+        exclude_fields: Collection[str] = (),
+    ) -> None:
         """
-        Convert a node to dictionary format.
+        Write the tree structure as JSON to a text stream while walking it iteratively.
+
+        The output is the same as ``json.dumps(tree_dict, ensure_ascii=False, indent=indent)``
+        of the nested node dictionaries, but no dictionary or full string is built, and
+        arbitrarily deep trees can be written.
 
         Args:
-            node (TreeNode): Node to convert.
+            tree (TreeNode): Root of the tree to export.
+            stream (TextIO): Stream the JSON is written to.
+            indent (Optional[int]): Indentation width, or None for a compact single line.
+            exclude_fields (Collection[str]): Node fields to leave out, e.g. ``("content",)``.
+
+        Returns:
+            None
+        """
+        unknown_fields = set(exclude_fields) - set(JSON_NODE_FIELDS)
+        if unknown_fields:
+            raise ValueError(f"Unknown node fields: {sorted(unknown_fields)}")
+        fields = [name for name in JSON_NODE_FIELDS if name not in exclude_fields]
+
+        if indent is None:
+            item_separator = ", "
+
+            def newline(level: int) -> str:
+                return ""
+
+        else:
+            item_separator = ","
+
+            def newline(level: int) -> str:
+                return "\n" + " " * (indent * level)
+
+        def dump_level_seq(level_seq: Sequence[int], level: int) -> str:
+            if not level_seq:
+                return "[]"
+            separator = item_separator + newline(level + 1)
+            items = separator.join(str(number) for number in level_seq)
+            return f"[{newline(level + 1)}{items}{newline(level)}]"
+
+        # Either a node to open at an indentation level, or literal JSON text
+        stack: List[Union[Tuple[TreeNode, int], str]] = [(tree, 0)]
+        while stack:
+            item = stack.pop()
+            if isinstance(item, str):
+                stream.write(item)
+                continue
+
+            node, level = item
+            field_separator = item_separator + newline(level + 1)
+            stream.write("{" + newline(level + 1))
+            for name in fields:
+                if name == "level_seq":
+                    value = dump_level_seq(node.level_seq, level + 1)
+                else:
+                    value = json.dumps(getattr(node, name), ensure_ascii=False)
+                stream.write(f'"{name}": {value}{field_separator}')
+
+            if not node.children:
+                stream.write(f'"children": []{newline(level)}}}')
+                continue
+
+            stream.write('"children": [' + newline(level + 2))
+            stack.append(newline(level + 1) + "]" + newline(level) + "}")
+            child_separator = item_separator + newline(level + 2)
+            for index in range(len(node.children) - 1, -1, -1):
+                stack.append((node.children[index], level + 2))
+                if index:
+                    stack.append(child_separator)
+
+
+_NUMBER_REGEX = re.compile(r"-?(?:0|[1-9]\d*)(?:\.\d+)?(?:[eE][-+]?\d+)?")
+_SCALAR_END_REGEX = re.compile(r"[\s,\]}]")
+_WHITESPACE_REGEX = re.compile(r"[ \t\n\r]*")
+_INT_REGEX = re.compile(r"-?(?:0|[1-9]\d*)")
+_INT_ARRAY_REGEX = re.compile(
+    rf"\[[ \t\n\r]*(?:{_INT_REGEX.pattern}(?:[ \t\n\r]*,[ \t\n\r]*{_INT_REGEX.pattern})*[ \t\n\r]*)?\]"
+)
+_STRING_PATTERN = r'"([^"\\]*(?:\\.[^"\\]*)*)"'
+_NODE_HEADER_REGEX = re.compile(
+    r"\{{{w}\"title\"{w}:{w}{s}{w},{w}\"level_seq\"{w}:{w}({seq}){w},{w}"
+    r"\"level_text\"{w}:{w}{s}{w},{w}\"content\"{w}:{w}{s}{w},{w}"
+    r"\"children\"{w}:{w}\[".format(
+        w=r"[ \t\n\r]*", s=_STRING_PATTERN, seq=_INT_ARRAY_REGEX.pattern
+    )
+)
+_LITERALS = {"true": True, "false": False, "null": None}
+
+
+def _has_non_whitespace(chunk: str) -> bool:
+    return _WHITESPACE_REGEX.match(chunk).end() < len(chunk)  # type: ignore[union-attr]
+
+
+def _has_quote(chunk: str) -> bool:
+    return '"' in chunk
+
+
+def _has_scalar_end(chunk: str) -> bool:
+    return _SCALAR_END_REGEX.search(chunk) is not None
+
+
+def _has_array_end(chunk: str) -> bool:
+    return "]" in chunk
+
+
+class _JsonReader:
+    """
+    Pull reader over JSON text arriving in chunks.
+
+    Only the unread tail of the input is kept in memory, so documents of any size can
+    be read with a bounded buffer (apart from single long strings).
+    """
+
+    def __init__(self, chunks: Iterable[str]):
+        self._chunks = iter(chunks)
+        self._buffer = ""
+        self._pos = 0
+        self._offset = 0  # absolute position of the start of the buffer
+        self._eof = False
+
+    def _fill(self, until: Callable[[str], bool] = bool) -> bool:
+        """
+        Read chunks until one satisfies ``until`` (or EOF), dropping the consumed part of
+        the buffer. The chunks are joined once, so a long token arriving in many small
+        chunks is not copied over and over. False if there was nothing left to read.
+        """
+        pieces = [self._buffer[self._pos :]]
+        for chunk in self._chunks:
+            if chunk:
+                pieces.append(chunk)
+                if until(chunk):
+                    break
+        else:
+            self._eof = True
+        if len(pieces) == 1:
+            return False
+        self._offset += self._pos
+        self._buffer = "".join(pieces)
+        self._pos = 0
+        return True
+
+    def error(self, message: str) -> ValueError:
+        return ValueError(f"{message} at position {self._offset + self._pos}")
+
+    def peek(self) -> str:
+        """Return the next non-whitespace character without consuming it, "" at EOF."""
+        while True:
+            self._pos = _WHITESPACE_REGEX.match(self._buffer, self._pos).end()  # type: ignore[union-attr]
+            if self._pos < len(self._buffer):
+                return self._buffer[self._pos]
+            if not self._fill(_has_non_whitespace):
+                return ""
+
+    def expect(self, char: str) -> None:
+        if self.peek() != char:
+            raise self.error(f"Expected {char!r}")
+        self._pos += 1
+
+    def read_string(self, decode: bool = True) -> str:
+        """Read a string; with ``decode=False`` it is skipped and "" is returned."""
+        self.expect('"')
+        search_from = self._pos
+        while True:
+            end = self._buffer.find('"', search_from)
+            if end == -1:
+                search_from = len(self._buffer) - self._pos
+                if not self._fill(_has_quote):
+                    raise self.error("Unterminated string")
+                continue
+            backslashes = 0
+            while (
+                end - 1 - backslashes >= self._pos
+                and self._buffer[end - 1 - backslashes] == "\\"
+            ):
+                backslashes += 1
+            if backslashes % 2 == 0:
+                break
+            search_from = end + 1
+
+        if not decode:
+            self._pos = end + 1
+            return ""
+        value, self._pos = json.decoder.scanstring(self._buffer, self._pos)  # type: ignore[attr-defined]
+        return cast(str, value)
+
+    def read_node_header(
+        self, decode_content: bool = True
+    ) -> Optional[Tuple[str, Tuple[int, ...], str, str]]:
+        """
+        Fast path reading a whole node header up to its open children array, in one match.
+
+        Only the layout written by TreeExporter with every field is recognized, and only
+        if it is complete in the buffer; otherwise nothing is consumed and None is returned.
+
+        Returns:
+            Optional[Tuple[str, Tuple[int, ...], str, str]]: Title, level sequence, level text
+                                                             and content, or None.
+        """
+        self.peek()
+        match = _NODE_HEADER_REGEX.match(self._buffer, self._pos)
+        if match is None:
+            return None
+        self._pos = match.end()
+
+        def decode(group: int) -> str:
+            value = match.group(group)
+            if "\\" not in value:
+                return value
+            return cast(str, json.decoder.scanstring(self._buffer, match.start(group))[0])  # type: ignore[attr-defined]
+
+        level_seq = tuple(int(number) for number in _INT_REGEX.findall(match.group(2)))
+        content = decode(4) if decode_content else ""
+        return decode(1), level_seq, decode(3), content
+
+    def read_scalar(self) -> Union[int, float, bool, None]:
+        """Read a number or one of the literals true, false and null."""
+        self.peek()
+        # Make sure the token is not cut off at the end of the buffer
+        while not _SCALAR_END_REGEX.search(self._buffer, self._pos) and self._fill(
+            _has_scalar_end
+        ):
+            pass
+
+        for word, literal in _LITERALS.items():
+            if self._buffer.startswith(word, self._pos):
+                self._pos += len(word)
+                return literal
+
+        match = _NUMBER_REGEX.match(self._buffer, self._pos)
+        if match is None:
+            raise self.error("Expected a value")
+        self._pos = match.end()
+        text = match.group(0)
+        return int(text) if text.lstrip("-").isdigit() else float(text)
+
+    def read_int_array(self) -> List[int]:
+        self.peek()
+        while self._buffer.find("]", self._pos) == -1 and self._fill(_has_array_end):
+            pass
+        match = _INT_ARRAY_REGEX.match(self._buffer, self._pos)
+        if match is None:
+            raise self.error("Expected an array of integers")
+        self._pos = match.end()
+        return [int(number) for number in _INT_REGEX.findall(match.group(0))]
+
+    def skip_value(self) -> None:
+        """Skip one value of any type, iteratively."""
+        closers: List[str] = []
+        while True:
+            char = self.peek()
+            if char == '"':
+                self.read_string(decode=False)
+                if closers and closers[-1] == "}" and self.peek() == ":":
+                    self._pos += 1
+                    continue
+            elif char in "[{":
+                self._pos += 1
+                closers.append("]" if char == "[" else "}")
+                if self.peek() == closers[-1]:
+                    self._pos += 1
+                    closers.pop()
+                else:
+                    continue
+            elif char in "]}":
+                raise self.error("Unexpected closing bracket")
+            else:
+                self.read_scalar()
+
+            # A value is complete; close finished containers
+            while closers:
+                char = self.peek()
+                if char == ",":
+                    self._pos += 1
+                    break
+                if char != closers[-1]:
+                    raise self.error(f"Expected {closers[-1]!r}")
+                self._pos += 1
+                closers.pop()
+            if not closers:
+                return
+
+
+class TreeLoader:
+    """Rebuild TreeNode trees from the JSON written by TreeExporter."""
+
+    @staticmethod
+    def load_json(json_text: str, skip_content: bool = False) -> TreeNode:
+        """
+        Load a tree from a JSON string.
+
+        Args:
+            json_text (str): JSON produced by ``TreeExporter.export_to_json``.
+            skip_content (bool): Skip the node contents without decoding them.
+
+        Returns:
+            TreeNode: The root of the loaded tree.
+        """
+        return TreeLoader.load_json_stream([json_text], skip_content)
+
+    @staticmethod
+    def load_json_file(
+        file_path: Union[str, Path],
+        skip_content: bool = False,
+        chunk_size: int = 1 << 16,
+    ) -> TreeNode:
+        """
+        Load a tree from a JSON file, reading it in chunks.
+
+        Args:
+            file_path (Union[str, Path]): JSON file produced by ``TreeExporter.export_to_json_file``.
+            skip_content (bool): Skip the node contents without decoding them.
+            chunk_size (int): Number of characters read at a time.
 
         Returns:
-            Dict[str, Any]: Dictionary representation of the node.
-        """
-        return {
-            "title": node.title,
-            "level_seq": node.level_seq,
-            "level_text": node.level_text,
-            "content": node.content,
-            "children": [TreeExporter._node_to_dict(child) for child in node.children],
-        }
+            TreeNode: The root of the loaded tree.
+        """
+        with open(file_path, "r", encoding="utf-8") as file:
+            return TreeLoader.load_json_stream(
+                iter(lambda: file.read(chunk_size), ""), skip_content
+            )
+
+    @staticmethod
+    def load_json_stream(chunks: Iterable[str], skip_content: bool = False) -> TreeNode:
+        """
+        Load a tree from JSON text arriving in chunks, such as an open file.
+
+        The tree is built iteratively, so arbitrarily deep trees can be loaded, and
+        parent links are restored. Fields missing from the JSON keep their defaults,
+        and unknown fields are ignored.
+
+        Args:
+            chunks (Iterable[str]): Text chunks whose concatenation is the JSON document.
+            skip_content (bool): Skip the node contents without decoding them; every
+                                 node's content is then "".
+
+        Returns:
+            TreeNode: The root of the loaded tree.
+        """
+        reader = _JsonReader(chunks)
+        # (node, whether its children array is open, whether a member was read)
+        stack: List[List[Any]] = []
+
+        def open_node(node: TreeNode) -> None:
+            """Read the opening of a node object, using the fast path when possible."""
+            header = reader.read_node_header(decode_content=not skip_content)
+            if header is None:
+                reader.expect("{")
+                stack.append([node, False, False])
+                return
+            node.title, node.level_seq, node.level_text, node.content = header
+            stack.append([node, True, False])
+
+        root = TreeNode(level_seq=())
+        open_node(root)
+        while stack:
+            frame = stack[-1]
+            node, in_children, has_member = frame
+            char = reader.peek()
+
+            if char == ("]" if in_children else "}"):
+                reader.expect(char)
+                if in_children:
+                    frame[1], frame[2] = False, True
+                else:
+                    stack.pop()
+                continue
+            if has_member:
+                reader.expect(",")
+            frame[2] = True
+
+            if in_children:
+                child = TreeNode(level_seq=())
+                node.add_child(child)
+                open_node(child)
+                continue
+
+            key = reader.read_string()
+            reader.expect(":")
+            if key == "children":
+                reader.expect("[")
+                frame[1], frame[2] = True, False
+            elif key == "level_seq":
+                node.level_seq = tuple(reader.read_int_array())
+            elif key in ("title", "level_text"):
+                setattr(node, key, reader.read_string())
+            elif key == "content":
+                node.content = reader.read_string(decode=not skip_content)
+            else:
+                reader.skip_value()
+
+        if reader.peek():
+            raise reader.error("Unexpected data after the tree")
+        return root
@@ -1,3 +1,4 @@
+from functools import lru_cache
 from typing import Optional
 
 # All Roman numerals including lowercase
@@ -6,6 +7,74 @@ ALL_ROMAN_NUMERALS = "IVXLCDMivxlcdm"
 ALL_CHINESE_CHARS = "零○〇洞一壹ㄧ弌么二貳贰弍兩两三參叁弎参叄四肆䦉刀五伍六陸陆七柒拐八捌杯九玖勾十拾什呀百佰千仟萬万億亿兆京經经垓秭杼穰壤溝沟澗涧正載極"
 
 
+# Value of each Roman numeral, including the subtractive pairs
+_ROMAN_VALUES = {
+    "I": 1,
+    "V": 5,
+    "X": 10,
+    "L": 50,
+    "C": 100,
+    "D": 500,
+    "M": 1000,
+    "IV": 4,
+    "IX": 9,
+    "XL": 40,
+    "XC": 90,
+    "CD": 400,
+    "CM": 900,
+}
+_ROMAN_CHARS = frozenset(ALL_ROMAN_NUMERALS)
+
+# Character tables for Chinese numerals, built once at import time
+_CHINESE_DIGIT_CHARS = [
+    "零○〇洞",
+    "一壹ㄧ弌么",
+    "二貳贰弍兩两",
+    "三參叁弎参叄",
+    "四肆䦉刀",
+    "五伍",
+    "六陸陆",
+    "七柒拐",
+    "八捌杯",
+    "九玖勾",
+]
+_CHINESE_UNIT_CHARS = ["十拾什呀", "百佰", "千仟"]
+_CHINESE_MAGNITUDE_CHARS = [
+    "萬万",  # 10^4
+    "億亿",  # 10^8
+    "兆",  # 10^12
+    "京經经",  # 10^16
+    "垓",  # 10^20
+    "秭杼",  # 10^24
+    "穰壤",  # 10^28
+    "溝沟",  # 10^32
+    "澗涧",  # 10^36
+    "正",  # 10^40
+    "載",  # 10^44
+    "極",  # 10^48
+]
+# Character -> digit value
+_CHINESE_DIGITS = {
+    char: value for value, chars in enumerate(_CHINESE_DIGIT_CHARS) for char in chars
+}
+# Character -> multiplier of the preceding digit (10, 100, 1000)
+_CHINESE_UNITS = {
+    char: 10 ** (index + 1)
+    for index, chars in enumerate(_CHINESE_UNIT_CHARS)
+    for char in chars
+}
+# Character -> multiplier of the preceding section (10^4, 10^8, ...)
+_CHINESE_MAGNITUDES = {
+    char: 10 ** (4 * (index + 1))
+    for index, chars in enumerate(_CHINESE_MAGNITUDE_CHARS)
+    for char in chars
+}
+_CHINESE_TEN_CHARS = _CHINESE_UNIT_CHARS[0]
+
+# Numeral strings repeat across headings, so conversions are memoized.
+_NUMERAL_CACHE_SIZE = 4096
+
+
 def roman_to_int(roman_str: str) -> Optional[int]:
     """
     Convert a Roman numeral string to an integer.
@@ -16,31 +85,19 @@ def roman_to_int(roman_str: str) -> Optional[int]:
     Returns:
         The integer value of the Roman numeral, or None if the input is invalid.
     """
-    roman_numerals = {
-        "I": 1,
-        "V": 5,
-        "X": 10,
-        "L": 50,
-        "C": 100,
-        "D": 500,
-        "M": 1000,
-        "IV": 4,
-        "IX": 9,
-        "XL": 40,
-        "XC": 90,
-        "CD": 400,
-        "CM": 900,
-    }
-
     # Input validation
     if not isinstance(roman_str, str):
         return None
+    return _roman_to_int(roman_str)
+
 
+@lru_cache(maxsize=_NUMERAL_CACHE_SIZE)
+def _roman_to_int(roman_str: str) -> Optional[int]:
     # Normalize the input string (remove spaces and convert to uppercase)
     normalized_str = "".join(roman_str.upper().split())
 
     # Validate that all characters are valid Roman numerals
-    if not all(c in ALL_ROMAN_NUMERALS for c in normalized_str):
+    if not _ROMAN_CHARS.issuperset(normalized_str):
         return None
 
     result = 0
@@ -50,19 +107,18 @@ def roman_to_int(roman_str: str) -> Optional[int]:
     while index < str_length:
         # Check for two-character Roman numerals first
         if index + 1 < str_length:
-            two_chars = normalized_str[index : index + 2]
-            if two_chars in roman_numerals:
-                result += roman_numerals[two_chars]
+            value = _ROMAN_VALUES.get(normalized_str[index : index + 2])
+            if value is not None:
+                result += value
                 index += 2
                 continue
 
         # Handle single character Roman numerals
-        current_char = normalized_str[index]
-        if current_char in roman_numerals:
-            result += roman_numerals[current_char]
-            index += 1
-        else:
+        value = _ROMAN_VALUES.get(normalized_str[index])
+        if value is None:
             return None
+        result += value
+        index += 1
 
     return result
 
@@ -77,43 +133,11 @@ def chinese_to_int(chinese_str: str) -> Optional[int]:
     Returns:
         The converted integer, or None if the input is invalid.
     """
-    digit_chars = [
-        "零○〇洞",
-        "一壹ㄧ弌么",
-        "二貳贰弍兩两",
-        "三參叁弎参叄",
-        "四肆䦉刀",
-        "五伍",
-        "六陸陆",
-        "七柒拐",
-        "八捌杯",
-        "九玖勾",
-    ]
-    unit_chars = ["十拾什呀", "百佰", "千仟"]
-    magnitude_chars = [
-        "萬万",  # 10^4
-        "億亿",  # 10^8
-        "兆",  # 10^12
-        "京經经",  # 10^16
-        "垓",  # 10^20
-        "秭杼",  # 10^24
-        "穰壤",  # 10^28
-        "溝沟",  # 10^32
-        "澗涧",  # 10^36
-        "正",  # 10^40
-        "載",  # 10^44
-        "極",  # 10^48
-    ]
-
-    def get_digit_value(char: str) -> int:
-        return next((i for i, chars in enumerate(digit_chars) if char in chars), -1)
-
-    def get_unit_value(char: str) -> int:
-        return next((i for i, chars in enumerate(unit_chars) if char in chars), -1)
+    return _chinese_to_int(chinese_str)
 
-    def get_magnitude_value(char: str) -> int:
-        return next((i for i, chars in enumerate(magnitude_chars) if char in chars), -1)
 
+@lru_cache(maxsize=_NUMERAL_CACHE_SIZE)
+def _chinese_to_int(chinese_str: str) -> Optional[int]:
     # Pre-process: remove spaces and handle sign
     normalized_str = "".join(chinese_str.split())
     sign = -1 if normalized_str.startswith(("負", "负")) else 1
@@ -121,14 +145,15 @@ def chinese_to_int(chinese_str: str) -> Optional[int]:
         normalized_str = normalized_str[1:]
 
     # Handle pure numeric cases
-    if all(any(c in chars for chars in digit_chars) for c in normalized_str):
-        result = sum(
-            get_digit_value(c) * (10**i) for i, c in enumerate(reversed(normalized_str))
-        )
+    digits = _CHINESE_DIGITS
+    if all(c in digits for c in normalized_str):
+        result = 0
+        for c in normalized_str:
+            result = result * 10 + digits[c]
         return result * sign
 
     # Handle special case starting with "十" (e.g., "十一" means "一十一")
-    if any(normalized_str.startswith(c) for c in unit_chars[0]):
+    if normalized_str[0] in _CHINESE_TEN_CHARS:
         normalized_str = "一" + normalized_str
 
     # Process numbers with units
@@ -137,24 +162,21 @@ def chinese_to_int(chinese_str: str) -> Optional[int]:
     digit_value = 0
 
     for char in normalized_str:
-        digit = get_digit_value(char)
-        if digit != -1:
+        digit = digits.get(char)
+        if digit is not None:
             digit_value = digit
             continue
 
-        unit = get_unit_value(char)
-        if unit != -1:
-            section_value += digit_value * (10 ** (unit + 1))
+        unit = _CHINESE_UNITS.get(char)
+        if unit is not None:
+            section_value += digit_value * unit
             digit_value = 0
             continue
 
-        magnitude = get_magnitude_value(char)
-        if magnitude != -1:
+        magnitude = _CHINESE_MAGNITUDES.get(char)
+        if magnitude is not None:
             section_value += digit_value
-            if magnitude <= 2:  # Handle 万, 亿, 兆
-                current_sum += section_value * (10 ** (4 * (magnitude + 1)))
-            else:  # Handle larger values
-                current_sum += section_value * pow(10, 4 * (magnitude + 1))
+            current_sum += section_value * magnitude
             section_value = digit_value = 0
             continue
 
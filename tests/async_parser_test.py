@@ -0,0 +1,80 @@
+import asyncio
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+from arborparser import AsyncParser, ChainParser, TreeBuilder
+from arborparser import (
+    CHINESE_CHAPTER_PATTERN_BUILDER,
+    NUMERIC_DOT_PATTERN_BUILDER,
+)
+
+
+test_text = """前言
+第一章 总则
+1.1 目的
+    正文内容。
+1.2 范围
+第二章 附则
+2.1 生效
+    最后一行"""
+
+
+def make_reader(data: bytes, piece: int) -> asyncio.StreamReader:
+    reader = asyncio.StreamReader()
+    for start in range(0, len(data), piece):
+        reader.feed_data(data[start : start + piece])
+    reader.feed_eof()
+    return reader
+
+
+async def main() -> None:
+    patterns = [
+        CHINESE_CHAPTER_PATTERN_BUILDER.build(),
+        NUMERIC_DOT_PATTERN_BUILDER.build(),
+    ]
+    parser = ChainParser(patterns)
+    expected_chain = parser.parse_to_chain(test_text)
+    expected_tree = TreeBuilder().build_tree(expected_chain)
+
+    async with AsyncParser(parser, max_concurrency=2, chunk_size=5) as async_parser:
+        # Concurrent requests
+        results = await asyncio.gather(
+            *(async_parser.parse_text(test_text) for _ in range(5)),
+            async_parser.build_tree(test_text),
+        )
+        assert all(chain == expected_chain for chain in results[:5])
+        assert results[5] == expected_tree
+
+        # Streams are split between chunks, inside multi-byte characters and lines
+        data = test_text.encode("utf-8")
+        for piece in (1, 3, 7, len(data)):
+            nodes = [
+                node async for node in async_parser.parse_stream(make_reader(data, piece))
+            ]
+            assert nodes == expected_chain
+        rows = [
+            row async for row in async_parser.parse_multi_stream(make_reader(data, 4))
+        ]
+        assert rows == parser.parse_to_multi_chain(test_text)
+        empty = [node async for node in async_parser.parse_stream(make_reader(b"", 1))]
+        assert empty == parser.parse_to_chain("")
+
+        # Files
+        with tempfile.TemporaryDirectory() as directory:
+            path = Path(directory) / "doc.txt"
+            path.write_bytes(data)
+            assert await async_parser.parse_file(path) == expected_chain
+            assert await async_parser.build_tree_from_file(path) == expected_tree
+
+    # Process pools receive results in the binary format
+    with ProcessPoolExecutor(2) as pool:
+        async_parser = AsyncParser(parser, executor=pool)
+        assert await async_parser.build_tree(test_text) == expected_tree
+        nodes = [node async for node in async_parser.parse_stream(make_reader(data, 16))]
+        assert nodes == expected_chain
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
+    print("All async parser tests passed.")
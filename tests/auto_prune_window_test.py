@@ -0,0 +1,87 @@
+import random
+from collections import deque
+
+from arborparser import AutoPruneStrategy, ChainNode, ChainParser, TreeBuilder
+from arborparser import NUMERIC_DOT_PATTERN_BUILDER
+from arborparser import build_strategy
+from arborparser.build_strategy import is_imm_next
+
+
+def reference_search(candidate_groups):
+    """The breadth-first search AutoPruneStrategy used before, copying paths."""
+    if not candidate_groups:
+        return None
+    search_queue = deque([(0, None, [])])
+    while search_queue:
+        index, prev_node, path = search_queue.popleft()
+        if index == len(candidate_groups):
+            return path
+        for candidate in candidate_groups[index]:
+            if prev_node is None or is_imm_next(prev_node.level_seq, candidate.level_seq):
+                search_queue.append((index + 1, candidate, path + [candidate]))
+    return None
+
+
+def node(*level_seq: int) -> ChainNode:
+    return ChainNode(
+        level_seq=level_seq,
+        level_text=".".join(map(str, level_seq)),
+        title="",
+        pattern_priority=0,
+    )
+
+
+if __name__ == "__main__":
+    # The search returns the same sequence as the breadth-first search
+    random.seed(0)
+    for _ in range(5000):
+        groups = [
+            [
+                node(*(random.randint(1, 3) for _ in range(random.randint(1, 3))))
+                for _ in range(random.randint(0, 4))
+            ]
+            for _ in range(random.randint(0, 5))
+        ]
+        found = AutoPruneStrategy._find_contiguous_sequence(groups)
+        expected = reference_search(groups)
+        assert found == expected and (
+            found is None or all(a is b for a, b in zip(found, expected))
+        ), (groups, found, expected)
+
+    # Long windows with many candidates per row compare each pair of adjacent rows once
+    groups = [[node(1, 1), node(2), node(1, 1), node(1)] for _ in range(40)]
+    groups[-1] = [node(9, 9)]
+    calls = [0]
+
+    def counting_is_imm_next(front_seq, back_seq):
+        calls[0] += 1
+        return is_imm_next(front_seq, back_seq)
+
+    build_strategy.is_imm_next = counting_is_imm_next
+    try:
+        assert AutoPruneStrategy._find_contiguous_sequence(groups) is None
+    finally:
+        build_strategy.is_imm_next = is_imm_next
+    assert 0 < calls[0] <= sum(
+        len(front) * len(back) for front, back in zip(groups, groups[1:])
+    )
+
+    # The window is configurable: a restart of the numbering needs `window` continuous rows
+    parser = ChainParser([NUMERIC_DOT_PATTERN_BUILDER.build()])
+    text = "1. A\n2. B\n3. C\n1. X\n2. Y\n3. Z"
+    default_tree = TreeBuilder().build_tree(parser.parse_to_chain(text))
+    assert [child.title for child in default_tree.children] == ["A", "B", "C", "X", "Y", "Z"]
+    strict_tree = TreeBuilder(AutoPruneStrategy(window=4)).build_tree(
+        parser.parse_to_chain(text)
+    )
+    assert [child.title for child in strict_tree.children] == ["A", "B", "C"]
+    assert strict_tree.get_full_content() == text
+    assert AutoPruneStrategy().fingerprint() != AutoPruneStrategy(window=4).fingerprint()
+
+    try:
+        AutoPruneStrategy(window=0)
+        assert False, "window 0 must be rejected"
+    except ValueError:
+        pass
+
+    print("All AutoPrune window tests passed.")
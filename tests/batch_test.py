@@ -0,0 +1,68 @@
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+from arborparser import ChainParser, StrictStrategy, TreeBuilder
+from arborparser import (
+    NUMERIC_DOT_PATTERN_BUILDER,
+    ENGLISH_CHAPTER_PATTERN_BUILDER,
+)
+
+
+def make_document(index: int) -> str:
+    return f"""Document {index}
+Chapter 1 Introduction
+1.1 Background
+    Body of document {index}.
+1.2 Goals
+Chapter 2 Methods
+2.1 Data
+"""
+
+
+if __name__ == "__main__":
+    patterns = [
+        ENGLISH_CHAPTER_PATTERN_BUILDER.build(),
+        NUMERIC_DOT_PATTERN_BUILDER.build(),
+    ]
+    parser = ChainParser(patterns)
+    builder = TreeBuilder()
+    texts = [make_document(index) for index in range(23)]
+    expected_chains = [parser.parse_to_chain(text) for text in texts]
+    expected_trees = [builder.build_tree(chain) for chain in expected_chains]
+
+    # Results keep the input order with every executor, and inputs can be lazy
+    for executor in ("process", "thread"):
+        chains = list(
+            parser.parse_many(iter(texts), executor=executor, max_workers=2, chunksize=4)
+        )
+        assert chains == expected_chains
+        trees = list(builder.build_many(parser, texts, executor=executor, max_workers=2))
+        assert trees == expected_trees
+        assert trees[3].get_full_content() == texts[3]
+    with ThreadPoolExecutor(2) as pool:
+        assert list(parser.parse_many(texts, executor=pool, chunksize=5)) == expected_chains
+
+    # As-completed results carry their input index
+    completed = dict(
+        builder.build_many_as_completed(parser, texts, max_workers=3, chunksize=2)
+    )
+    assert sorted(completed) == list(range(len(texts)))
+    assert [completed[index] for index in range(len(texts))] == expected_trees
+    completed_chains = dict(parser.parse_many_as_completed(texts, executor="thread"))
+    assert [completed_chains[index] for index in range(len(texts))] == expected_chains
+
+    # Paths are parsed as files
+    with tempfile.TemporaryDirectory() as directory:
+        paths = []
+        for index, text in enumerate(texts[:3]):
+            path = Path(directory) / f"{index}.txt"
+            path.write_bytes(text.encode("utf-8"))
+            paths.append(path)
+        trees = list(TreeBuilder(StrictStrategy()).build_many(parser, paths, max_workers=2))
+        assert [tree.get_full_content() for tree in trees] == texts[:3]
+
+    # Empty batches are fine
+    assert list(parser.parse_many([], max_workers=2)) == []
+
+    print("All batch tests passed.")
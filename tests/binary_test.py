@@ -0,0 +1,82 @@
+import os
+import tempfile
+
+from arborparser import BinaryExporter, BinaryReader, ChainParser, TreeBuilder
+from arborparser import (
+    NUMERIC_DOT_PATTERN_BUILDER,
+    ENGLISH_CHAPTER_PATTERN_BUILDER,
+)
+
+
+if __name__ == "__main__":
+    test_text = """
+Chapter 1 Animals
+1.1 Mammals
+1.1.1 Primates
+    Monkeys and apes — 猴子.
+1.2 Reptiles
+Chapter 2 Plants
+2.1 Angiosperms
+    Flowering plants.
+"""
+
+    patterns = [
+        ENGLISH_CHAPTER_PATTERN_BUILDER.build(),
+        NUMERIC_DOT_PATTERN_BUILDER.build(),
+    ]
+    chain = ChainParser(patterns).parse_to_chain(test_text)
+    tree = TreeBuilder().build_tree(chain)
+
+    # Trees round-trip exactly
+    data = BinaryExporter.export_tree(tree)
+    reader = BinaryReader(data)
+    assert len(reader) == len(chain)
+    loaded = reader.load_tree()
+    assert loaded == tree
+    assert loaded.get_full_content() == test_text
+    assert loaded.children[0].children[1].parent is loaded.children[0]
+    assert reader.load_tree(lazy_content=True) == tree
+
+    # Single nodes and subtrees are read without loading the rest
+    assert reader.title(3) == "Primates"
+    assert reader.level_seq(3) == (1, 1, 1)
+    assert reader.level_text(3) == "1.1.1"
+    assert reader.parent_index(3) == 2
+    assert list(reader.child_indices(0)) == [1, 5]
+    assert list(reader.child_indices(1)) == [2, 4]
+    subtree = reader.load_subtree(1)
+    assert subtree == tree.children[0]
+    assert subtree.parent is None
+    assert reader.full_content(5) == tree.children[1].get_full_content()
+
+    # Chains keep the pattern priority
+    chain_reader = BinaryReader(BinaryExporter.export_chain(chain))
+    assert chain_reader.load_chain() == chain
+    try:
+        chain_reader.load_tree()
+        assert False, "A chain cannot be loaded as a tree"
+    except ValueError:
+        pass
+
+    # Files are memory-mapped
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "tree.arbp")
+        BinaryExporter.export_tree_to_file(tree, path)
+        with BinaryReader.open(path) as file_reader:
+            assert file_reader.load_subtree(5) == tree.children[1]
+            assert file_reader.load_tree() == tree
+
+    # Level numbers beyond 64 bits are kept
+    huge = ChainParser(patterns).parse_to_chain("Chapter 99999999999999999999 Huge\n")
+    huge_tree = TreeBuilder().build_tree(huge)
+    assert BinaryReader(BinaryExporter.export_tree(huge_tree)).load_tree() == huge_tree
+
+    # Other data is rejected
+    for bad in (b"", b"not a tree" * 10, data[:4] + b"\xff\xff" + data[6:]):
+        try:
+            BinaryReader(bad)
+            assert False, "Invalid data must be rejected"
+        except ValueError:
+            pass
+
+    print("All binary format tests passed.")
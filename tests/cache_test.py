@@ -0,0 +1,165 @@
+import re
+import tempfile
+
+from arborparser import (
+    AutoPruneStrategy,
+    ChainParser,
+    LevelPattern,
+    ParseCache,
+    PatternBuilder,
+    StrictStrategy,
+    TreeBuilder,
+)
+from arborparser import (
+    NUMERIC_DOT_PATTERN_BUILDER,
+    ENGLISH_CHAPTER_PATTERN_BUILDER,
+)
+from arborparser.pattern import NumberTypeInfo, _value_spec
+
+
+if __name__ == "__main__":
+    test_text = """
+Chapter 1 Animals
+1.1 Mammals
+1.1.1 Primates
+    Monkeys and apes.
+1.2 Reptiles
+Chapter 2 Plants
+2.1 Angiosperms
+    Flowering plants.
+"""
+
+    patterns = [
+        ENGLISH_CHAPTER_PATTERN_BUILDER.build(),
+        NUMERIC_DOT_PATTERN_BUILDER.build(),
+    ]
+    parser = ChainParser(patterns)
+    builder = TreeBuilder()
+    expected_chain = parser.parse_to_chain(test_text)
+    expected_tree = builder.build_tree(expected_chain)
+
+    # Fingerprints depend on the configuration only
+    assert patterns[1].fingerprint() == NUMERIC_DOT_PATTERN_BUILDER.build().fingerprint()
+    assert (
+        NUMERIC_DOT_PATTERN_BUILDER.modify(max_level=3).build().fingerprint()
+        != patterns[1].fingerprint()
+    )
+    raw = LevelPattern(regex=patterns[1].regex, converter=patterns[1].converter, description="")
+    assert raw.fingerprint() == LevelPattern(
+        regex=patterns[1].regex, converter=patterns[1].converter, description="other"
+    ).fingerprint()
+    assert AutoPruneStrategy().fingerprint() != StrictStrategy().fingerprint()
+
+    # Closures made by one factory share a qualified name but not a fingerprint
+    def offset_converter(offset):
+        return lambda match: [int(match.group(1)) + offset]
+
+    def offset_pattern(offset):
+        return LevelPattern(
+            regex=re.compile(r"^(\d+)\. "), converter=offset_converter(offset), description=""
+        )
+
+    assert offset_pattern(0).fingerprint() == offset_pattern(0).fingerprint()
+    assert offset_pattern(0).fingerprint() != offset_pattern(10).fingerprint()
+    offset_cache = ParseCache()
+    for offset in (0, 10):
+        chain = offset_cache.parse_to_chain(ChainParser([offset_pattern(offset)]), "1. A")
+        assert chain[1].level_seq == (1 + offset,)
+    assert offset_cache.hits == 0
+
+    # The same holds for the converter of a builder's number type
+    def scaled_pattern(scale):
+        number_type = NumberTypeInfo(
+            pattern=r"\d+", converter=lambda text: int(text) * scale, name="scaled"
+        )
+        return PatternBuilder(number_type=number_type, suffix_regex=r"\.?\s+").build()
+
+    assert scaled_pattern(1).fingerprint() != scaled_pattern(10).fingerprint()
+    scaled_cache = ParseCache()
+    for scale in (1, 10):
+        chain = scaled_cache.parse_to_chain(ChainParser([scaled_pattern(scale)]), "1. A\n2. B")
+        assert [node.level_seq for node in chain] == [(), (scale,), (2 * scale,)]
+    assert scaled_cache.hits == 0
+
+    # Captured values are described deterministically, or not at all
+    assert _value_spec({"b", "a", "c"}, frozenset()) == _value_spec(
+        frozenset(["c", "a", "b"]), frozenset()
+    )
+    long_regex = re.compile("x" * 300)
+    assert _value_spec(long_regex, frozenset()) != _value_spec(
+        re.compile("x" * 301), frozenset()
+    )
+    def marked_converter(marker):
+        return lambda match: [int(match.group(1))] if marker else []
+
+    try:
+        LevelPattern(
+            regex=re.compile(r"^(\d+)\. "), converter=marked_converter(object()), description=""
+        ).fingerprint()
+        assert False, "objects with a default repr cannot be fingerprinted"
+    except TypeError:
+        pass
+
+    # Recursive closures are described without looping forever
+    def recursive_converter():
+        def convert(match, depth=0):
+            return convert(match, depth + 1) if depth < 1 else [int(match.group(1))]
+
+        return convert
+
+    assert LevelPattern(
+        regex=re.compile(r"^(\d+)\. "), converter=recursive_converter(), description=""
+    ).fingerprint()
+
+    # Callable objects cannot be identified, so their parsers bypass the cache
+    class Converter:
+        def __call__(self, match):
+            return [int(match.group(1))]
+
+    opaque_parser = ChainParser(
+        [LevelPattern(regex=re.compile(r"^(\d+)\. "), converter=Converter(), description="")]
+    )
+    opaque_cache = ParseCache()
+    for _ in range(2):
+        assert opaque_cache.parse_to_chain(opaque_parser, "1. A")[1].level_seq == (1,)
+        assert opaque_cache.build_tree(opaque_parser, builder, "1. A").children[0].title == "A"
+    assert len(opaque_cache) == 0 and opaque_cache.hits == 0
+
+    # A hit returns the same result without parsing
+    cache = ParseCache()
+    assert cache.parse_to_chain(parser, test_text) == expected_chain
+    assert cache.parse_to_chain(parser, test_text) == expected_chain
+    assert (cache.hits, cache.misses) == (1, 1)
+    tree = cache.build_tree(parser, builder, test_text)
+    assert tree == expected_tree
+    cached_tree = cache.build_tree(parser, builder, test_text)
+    assert cached_tree == expected_tree and cached_tree is not tree
+    assert cached_tree.get_full_content() == test_text
+    assert (cache.hits, cache.misses) == (2, 2)
+
+    # Other texts, patterns or strategies miss
+    cache.parse_to_chain(parser, test_text + "\n")
+    cache.parse_to_chain(ChainParser(patterns[:1]), test_text)
+    cache.build_tree(parser, TreeBuilder(StrictStrategy()), test_text)
+    assert (cache.hits, cache.misses) == (2, 5)
+
+    # The least recently used entries are evicted by size
+    texts = [f"Document {index}\n{test_text}" for index in range(5)]
+    small = ParseCache()
+    small.parse_to_chain(parser, texts[0])
+    small = ParseCache(max_bytes=small.size * 2)
+    for text in texts:
+        small.parse_to_chain(parser, text)
+    assert len(small) == 2 and small.size <= small.max_bytes
+    small.parse_to_chain(parser, texts[4])
+    small.parse_to_chain(parser, texts[0])
+    assert (small.hits, small.misses) == (1, 6)
+
+    # The disk store is shared between cache instances
+    with tempfile.TemporaryDirectory() as directory:
+        ParseCache(directory=directory).build_tree(parser, builder, test_text)
+        other = ParseCache(directory=directory)
+        assert other.build_tree(parser, builder, test_text) == expected_tree
+        assert (other.hits, other.misses) == (1, 0)
+
+    print("All parse cache tests passed.")
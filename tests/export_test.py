@@ -0,0 +1,91 @@
+import io
+import json
+import tempfile
+from pathlib import Path
+
+from arborparser import ChainParser, TreeBuilder, TreeExporter, TreeNode
+from arborparser import (
+    NUMERIC_DOT_PATTERN_BUILDER,
+    ENGLISH_CHAPTER_PATTERN_BUILDER,
+)
+
+
+def node_to_dict(node, exclude_fields=()):
+    """Reference dictionary form of a node, as the JSON export used to build it."""
+    data = {
+        "title": node.title,
+        "level_seq": list(node.level_seq),
+        "level_text": node.level_text,
+        "content": node.content,
+    }
+    for name in exclude_fields:
+        del data[name]
+    data["children"] = [node_to_dict(child, exclude_fields) for child in node.children]
+    return data
+
+
+if __name__ == "__main__":
+    test_text = """
+Chapter 1 Animals
+1.1 Mammals
+1.1.1 Primates
+1.2 Reptiles
+Chapter 2 Plants
+2.1 Angiosperms
+"""
+
+    patterns = [
+        ENGLISH_CHAPTER_PATTERN_BUILDER.build(),
+        NUMERIC_DOT_PATTERN_BUILDER.build(),
+    ]
+    chain = ChainParser(patterns).parse_to_chain(test_text)
+    tree = TreeBuilder().build_tree(chain)
+
+    expected_tree = """ROOT
+├─ Chapter 1 Animals
+│   ├─ 1.1 Mammals
+│   │   └─ 1.1.1 Primates
+│   └─ 1.2 Reptiles
+└─ Chapter 2 Plants
+    └─ 2.1 Angiosperms"""
+    assert TreeExporter.export_tree(tree) == expected_tree
+
+    # The outline can be written straight to a stream, optionally truncated
+    stream = io.StringIO()
+    assert TreeExporter.export_tree_to(tree, stream) == 7
+    assert stream.getvalue() == expected_tree
+
+    assert TreeExporter.export_tree(tree, max_depth=1) == (
+        "ROOT\n├─ Chapter 1 Animals\n└─ Chapter 2 Plants"
+    )
+    assert TreeExporter.export_tree(tree, max_nodes=3) == "\n".join(
+        expected_tree.split("\n")[:3]
+    )
+    assert TreeExporter.export_tree(tree, max_depth=0) == "ROOT"
+
+    # Deep trees are rendered without recursion
+    deep_root = TreeNode(level_seq=(), title="ROOT")
+    parent = deep_root
+    for level in range(1, 3001):
+        child = TreeNode(level_seq=(1,) * level, level_text=str(level), title="deep")
+        parent.add_child(child)
+        parent = child
+    lines = TreeExporter.export_tree(deep_root).split("\n")
+    assert len(lines) == 3001
+    assert lines[-1] == " " * 4 * 2999 + "└─ 3000 deep"
+
+    # JSON is written incrementally, byte-identical to json.dumps of the node dictionaries
+    for indent in [4, 2, 0, None]:
+        for exclude_fields in [(), ("content",), ("title", "level_seq", "level_text")]:
+            expected_json = json.dumps(
+                node_to_dict(tree, exclude_fields), ensure_ascii=False, indent=indent
+            )
+            assert TreeExporter.export_to_json(tree, indent, exclude_fields) == expected_json
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        file_path = Path(temp_dir) / "tree.json"
+        TreeExporter.export_to_json_file(tree, file_path)
+        assert json.loads(file_path.read_text(encoding="utf-8")) == node_to_dict(tree)
+
+    deep_json = TreeExporter.export_to_json(deep_root, indent=None, exclude_fields=("content",))
+    assert deep_json.count("{") == 3001
@@ -0,0 +1,61 @@
+import pickle
+
+from arborparser import ChainParser, FlatTree, TreeBuilder, TreeExporter
+from arborparser import (
+    NUMERIC_DOT_PATTERN_BUILDER,
+    ENGLISH_CHAPTER_PATTERN_BUILDER,
+)
+
+
+if __name__ == "__main__":
+    test_text = """
+Chapter 1 Animals
+1.1 Mammals
+1.1.1 Primates
+    Monkeys and apes.
+1.2 Reptiles
+Chapter 2 Plants
+2.1 Angiosperms
+    Flowering plants.
+"""
+
+    patterns = [
+        ENGLISH_CHAPTER_PATTERN_BUILDER.build(),
+        NUMERIC_DOT_PATTERN_BUILDER.build(),
+    ]
+    chain = ChainParser(patterns).parse_to_chain(test_text)
+    builder = TreeBuilder()
+    tree = builder.build_tree(chain)
+    flat_tree = builder.build_flat_tree(chain)
+
+    # Nodes are stored in preorder
+    assert len(flat_tree) == len(chain)
+    assert [node.title for node in flat_tree] == [node.title for node in chain]
+    assert list(flat_tree.parents) == [-1, 0, 1, 2, 1, 0, 5]
+    assert list(flat_tree.depths) == [0, 1, 2, 3, 2, 1, 2]
+    assert list(flat_tree.subtree_ends) == [7, 5, 4, 4, 5, 7, 7]
+
+    # Views behave like TreeNodes
+    root = flat_tree.root
+    assert root.get_full_content() == test_text
+    chapter_1 = root.children[0]
+    assert chapter_1.level_seq == (1,)
+    assert [child.title for child in chapter_1.children] == ["Mammals", "Reptiles"]
+    primates = chapter_1.children[0].children[0]
+    assert primates.content == tree.children[0].children[0].children[0].content
+    assert primates.parent.parent == chapter_1
+    assert primates.depth == 3
+    assert chapter_1.get_full_content() == tree.children[0].get_full_content()
+
+    # Conversion both ways round-trips
+    assert FlatTree.from_tree(tree).to_tree() == tree
+    assert flat_tree.to_tree() == tree
+    assert TreeExporter.export_tree(flat_tree.to_tree()) == TreeExporter.export_tree(tree)
+
+    # Flat trees pickle as a handful of arrays
+    restored = pickle.loads(pickle.dumps(flat_tree))
+    assert restored.to_tree() == tree
+
+    # Level numbers that do not fit in 64 bits are still stored
+    huge = ChainParser(patterns).parse_to_chain("Chapter 99999999999999999999 Huge\n")
+    assert builder.build_flat_tree(huge).root.children[0].level_seq == (99999999999999999999,)
@@ -0,0 +1,86 @@
+import random
+
+from arborparser import (
+    AutoPruneStrategy,
+    ChainParser,
+    IncrementalDocument,
+    LineEdit,
+    StrictStrategy,
+    TreeBuilder,
+)
+from arborparser import (
+    NUMERIC_DOT_PATTERN_BUILDER,
+    ENGLISH_CHAPTER_PATTERN_BUILDER,
+    ROMAN_PATTERN_BUILDER,
+)
+
+
+def full_parse(parser: ChainParser, builder: TreeBuilder, text: str, multi_chain: bool):
+    chain = parser.parse_to_multi_chain(text) if multi_chain else parser.parse_to_chain(text)
+    return chain, builder.build_tree(chain)
+
+
+if __name__ == "__main__":
+    patterns = [
+        ENGLISH_CHAPTER_PATTERN_BUILDER.build(),
+        NUMERIC_DOT_PATTERN_BUILDER.build(),
+        ROMAN_PATTERN_BUILDER.build(),
+    ]
+    parser = ChainParser(patterns)
+
+    # Small edits only rebuild the neighbourhood of the edit
+    lines = []
+    for chapter in range(1, 51):
+        lines.append(f"Chapter {chapter} Title")
+        for section in range(1, 6):
+            lines += [f"{chapter}.{section} Section", "    Body."]
+    document = IncrementalDocument(parser, "\n".join(lines))
+    document.apply_edits([LineEdit(250, 251, ("    Edited body.", "23.9 New section"))])
+    chain, tree = full_parse(parser, document.builder, document.text, False)
+    assert document.chain == chain
+    assert document.tree == tree
+    assert document.rebuilt_rows < 20
+    assert document.tree.get_full_content() == document.text
+
+    # Deleting and inserting headings, including the first line
+    document.apply_edits(
+        [
+            LineEdit(0, 1),
+            LineEdit(0, 0, ("Preface", "")),
+            LineEdit(len(document.lines) - 2, len(document.lines) - 2, ("Chapter 51 End",)),
+        ]
+    )
+    chain, tree = full_parse(parser, document.builder, document.text, False)
+    assert document.tree == tree and document.chain == chain
+
+    # Random edits always match a full re-parse
+    pool = [
+        "Chapter 1 A", "Chapter 2 B", "1.1 x", "1.2 y", "2.1 z", "1.1.1 w", "3.1 r",
+        "I. rom", "II. rom", "body text", "", "   ", "7.7 noise", "2.2 t",
+    ]
+    random.seed(0)
+    for multi_chain in (False, True):
+        for strategy in (AutoPruneStrategy(), StrictStrategy()):
+            builder = TreeBuilder(strategy)
+            for _ in range(40):
+                text = "\n".join(random.choice(pool) for _ in range(random.randint(0, 25)))
+                document = IncrementalDocument(parser, text, builder, multi_chain)
+                for _ in range(6):
+                    start = random.randint(0, len(document.lines))
+                    end = random.randint(start, min(len(document.lines), start + 3))
+                    new_lines = tuple(
+                        random.choice(pool) for _ in range(random.randint(0, 3))
+                    )
+                    document.apply_edits([LineEdit(start, end, new_lines)])
+                    chain, tree = full_parse(parser, builder, document.text, multi_chain)
+                    assert (document.rows if multi_chain else document.chain) == chain
+                    assert document.tree == tree
+
+    # Invalid ranges are rejected
+    try:
+        document.apply_edits([LineEdit(0, len(document.lines) + 1)])
+        assert False, "Out of range edits must be rejected"
+    except ValueError:
+        pass
+
+    print("All incremental parsing tests passed.")
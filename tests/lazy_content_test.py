@@ -0,0 +1,69 @@
+from arborparser import ChainParser, TreeBuilder
+from arborparser import (
+    NUMERIC_DOT_PATTERN_BUILDER,
+    ENGLISH_CHAPTER_PATTERN_BUILDER,
+)
+
+
+if __name__ == "__main__":
+    test_text = """
+Chapter 1 The Foundation
+    Introductory content for the first chapter.
+
+1.1 Core Concepts
+    Explanation of the fundamental ideas.
+
+1.3 Advanced Topics
+    Discussing more complex subjects. We build upon the ideas from section 
+    1.1. This section is more advanced and goes into more detail.
+
+Chapter 2 Building Blocks
+    Content for the second chapter.
+
+2.1 Component A
+    Details about the first component. End of document."""
+
+    patterns = [
+        ENGLISH_CHAPTER_PATTERN_BUILDER.build(),
+        NUMERIC_DOT_PATTERN_BUILDER.build(),
+    ]
+    eager_parser = ChainParser(patterns)
+    lazy_parser = ChainParser(patterns, lazy_content=True)
+
+    # Span-backed nodes compare equal to nodes holding copied strings
+    eager_chain = eager_parser.parse_to_chain(test_text)
+    lazy_chain = lazy_parser.parse_to_chain(test_text)
+    assert all(node.span is not None for node in lazy_chain)
+    assert all(node.span is None for node in eager_chain)
+    assert lazy_chain == eager_chain
+    assert lazy_parser.parse_to_multi_chain(test_text) == eager_parser.parse_to_multi_chain(
+        test_text
+    )
+
+    # Spans cover the text without gaps
+    offset = 0
+    for node in lazy_chain:
+        start, end = node.span
+        assert start == offset
+        offset = end
+    assert offset == len(test_text)
+
+    # Building the tree, including merging the noisy "1.1." line, keeps spans
+    lazy_tree = TreeBuilder().build_tree(lazy_chain)
+    eager_tree = TreeBuilder().build_tree(eager_chain)
+    assert lazy_tree == eager_tree
+    advanced_topics = lazy_tree.children[0].children[1]
+    assert advanced_topics.title == "Advanced Topics"
+    assert advanced_topics.span is not None
+
+    # Merging contiguous children only extends the span
+    chapter = lazy_tree.children[0]
+    chapter.merge_all_children()
+    assert chapter.span == (lazy_chain[1].span[0], lazy_chain[5].span[0])
+    assert lazy_tree.get_full_content() == test_text
+
+    # Non-adjacent content falls back to a plain string
+    first_chapter, second_chapter = lazy_tree.children
+    second_chapter.concat_node(first_chapter)
+    assert second_chapter.span is None
+    assert second_chapter.content.endswith(first_chapter.content)
@@ -0,0 +1,107 @@
+import tempfile
+from pathlib import Path
+
+from arborparser import ChainParser, TreeBuilder, TreeExporter, TreeLoader, TreeNode
+from arborparser import (
+    CHINESE_CHAPTER_PATTERN_BUILDER,
+    NUMERIC_DOT_PATTERN_BUILDER,
+)
+from arborparser.tree import _JsonReader
+
+
+def chunks_of(text: str, size: int):
+    return (text[index : index + size] for index in range(0, len(text), size))
+
+
+def assert_parent_links(root: TreeNode) -> None:
+    assert root.parent is None
+    for node in root.iter_preorder():
+        for child in node.children:
+            assert child.parent is node
+
+
+if __name__ == "__main__":
+    test_text = """前言 "quoted" \\ backslash \\"
+第一章 总则
+    本章内容。\t制表符
+1.1 范围
+1.2 定义
+第二章 细则
+2.1 最后一节\\
+"""
+
+    patterns = [
+        CHINESE_CHAPTER_PATTERN_BUILDER.build(),
+        NUMERIC_DOT_PATTERN_BUILDER.build(),
+    ]
+    chain = ChainParser(patterns).parse_to_chain(test_text)
+    tree = TreeBuilder().build_tree(chain)
+
+    # Exported JSON loads back into an equal tree, with parent links
+    json_text = TreeExporter.export_to_json(tree)
+    loaded = TreeLoader.load_json(json_text)
+    assert loaded == tree
+    assert loaded.get_full_content() == test_text
+    assert_parent_links(loaded)
+
+    # Streamed input may be split anywhere, including inside strings and escapes
+    for size in [1, 2, 3, 7, 64]:
+        assert TreeLoader.load_json_stream(chunks_of(json_text, size)) == tree
+        compact = TreeExporter.export_to_json(tree, indent=None)
+        assert TreeLoader.load_json_stream(chunks_of(compact, size)) == tree
+
+    # Content can be skipped without decoding it
+    skipped = TreeLoader.load_json_stream(chunks_of(json_text, 5), skip_content=True)
+    assert skipped.get_full_content() == ""
+    assert TreeExporter.export_tree(skipped) == TreeExporter.export_tree(tree)
+
+    # Excluded fields keep their defaults, unknown fields are ignored
+    no_content = TreeExporter.export_to_json(tree, exclude_fields=("content",))
+    assert TreeLoader.load_json(no_content) == skipped
+    extra = '{"meta": {"a": [1, 2.5e3, true, null, {"b": "]}"}], "c": {}}, "title": "ROOT", "children": []}'
+    assert TreeLoader.load_json(extra) == TreeNode(level_seq=(), title="ROOT")
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        file_path = Path(temp_dir) / "tree.json"
+        TreeExporter.export_to_json_file(tree, file_path)
+        from_file = TreeLoader.load_json_file(file_path, chunk_size=16)
+        assert from_file == tree
+        assert_parent_links(from_file)
+
+    # Deep trees are loaded without recursion
+    deep_root = TreeNode(level_seq=(), title="ROOT")
+    parent = deep_root
+    for level in range(1, 3001):
+        child = TreeNode(level_seq=(1,) * level, level_text=str(level), content=f"{level}\n")
+        parent.add_child(child)
+        parent = child
+    deep_loaded = TreeLoader.load_json(TreeExporter.export_to_json(deep_root, indent=None))
+    assert deep_loaded.get_full_content() == deep_root.get_full_content()
+    assert sum(1 for _ in deep_loaded.iter_preorder()) == 3001
+
+    # A long content string arriving in small chunks is copied into the buffer once
+    long_root = TreeNode(level_seq=(), title="ROOT", content="x\\" * 500_000)
+    long_json = TreeExporter.export_to_json(long_root)
+    buffered = [0]
+    fill = _JsonReader._fill
+
+    def counting_fill(reader, *args, **kwargs):
+        filled = fill(reader, *args, **kwargs)
+        buffered[0] += len(reader._buffer)
+        return filled
+
+    _JsonReader._fill = counting_fill
+    try:
+        assert TreeLoader.load_json_stream(chunks_of(long_json, 64)) == long_root
+    finally:
+        _JsonReader._fill = fill
+    assert buffered[0] <= 2 * len(long_json)
+
+    # Malformed input is rejected
+    for bad in ['{"title": "ROOT"', '{"title": "ROOT",, "children": []}', '{"level_seq": [1, "2"]}', "{} {}"]:
+        try:
+            TreeLoader.load_json(bad)
+        except ValueError:
+            pass
+        else:
+            raise AssertionError(f"accepted malformed JSON: {bad}")
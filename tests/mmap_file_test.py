@@ -0,0 +1,66 @@
+import tempfile
+from pathlib import Path
+
+from arborparser import ChainParser, TreeBuilder
+from arborparser import (
+    CHINESE_CHAPTER_PATTERN_BUILDER,
+    NUMERIC_DOT_PATTERN_BUILDER,
+)
+
+
+if __name__ == "__main__":
+    test_text = """　前言：正文之前的内容。
+第一章 总则
+    本章内容。
+
+1.1 范围
+    本节说明范围。\r
+    1.1. 这一行是正文，不是标题。
+\x1c
+第二章 细则
+2.1 定义
+    最后一节。
+"""
+
+    patterns = [
+        CHINESE_CHAPTER_PATTERN_BUILDER.build(),
+        NUMERIC_DOT_PATTERN_BUILDER.build(),
+    ]
+    parser = ChainParser(patterns)
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        for encoding in ["utf-8", "gb18030"]:
+            for text in [test_text, test_text.rstrip("\n"), ""]:
+                file_path = Path(temp_dir) / f"{encoding}.txt"
+                file_path.write_bytes(text.encode(encoding))
+
+                # Content is decoded from the mapping on demand and matches the text parse
+                chain = parser.parse_file(file_path, encoding=encoding)
+                assert all(node.span is not None for node in chain)
+                assert chain == parser.parse_to_chain(text)
+                multi_chain = parser.parse_multi_file(file_path, encoding=encoding)
+                assert multi_chain == parser.parse_to_multi_chain(text)
+
+                tree = TreeBuilder().build_tree(chain)
+                assert tree.get_full_content() == text
+
+        # Spans are byte offsets into the file
+        file_path = Path(temp_dir) / "spans.txt"
+        file_path.write_bytes(test_text.encode("utf-8"))
+        chain = parser.parse_file(file_path)
+        assert chain[-1].span[1] == len(test_text.encode("utf-8"))
+
+        try:
+            parser.parse_file(file_path, encoding="utf-16")
+        except ValueError:
+            pass
+        else:
+            raise AssertionError("utf-16 is not ASCII-compatible")
+
+        # A heading on the very first line leaves the ROOT content empty
+        heading_first = "第一章 总则\n正文。\n"
+        file_path.write_bytes(heading_first.encode("utf-8"))
+        chain = parser.parse_file(file_path)
+        assert chain == parser.parse_to_chain(heading_first)
+        assert chain[0].content == ""
+        assert TreeBuilder().build_tree(chain).get_full_content() == heading_first
@@ -0,0 +1,89 @@
+import io
+import pickle
+
+from arborparser import ChainNode, TreeNode
+
+
+if __name__ == "__main__":
+    # Nodes are slotted and store immutable level sequences
+    chain_node = ChainNode(level_seq=[1, 2], level_text="1.2", title="Title", content="1.2 Title\n")
+    assert not hasattr(chain_node, "__dict__")
+    assert chain_node.level_seq == (1, 2)
+
+    tree_node = TreeNode.from_chain_node(chain_node)
+    assert tree_node.level_seq is chain_node.level_seq
+    assert not hasattr(tree_node, "__dict__")
+
+    # Leaves share one immutable empty children list
+    other_leaf = TreeNode(level_seq=(1, 3))
+    assert tree_node.children == [] and tree_node.children is other_leaf.children
+    try:
+        tree_node.children.append(other_leaf)
+    except TypeError:
+        pass
+    else:
+        raise AssertionError("leaf children must not be mutated in place")
+
+    root = TreeNode(level_seq=(), title="ROOT")
+    root.add_child(tree_node)
+    root.add_child(other_leaf)
+    assert root.children == [tree_node, other_leaf]
+    assert other_leaf.parent is root
+    assert other_leaf.children == []
+
+    # Nodes survive pickling, and leaves keep sharing the empty children list
+    restored = pickle.loads(pickle.dumps(root))
+    assert restored == root
+    assert restored.children[0].parent is restored
+    assert restored.children[0].children is other_leaf.children
+
+    root.merge_all_children()
+    assert root.children == [] and root.children is other_leaf.children
+    assert root.content == "1.2 Title\n"
+
+    # Deep trees are handled without recursion, in linear time
+    depth = 5000
+    deep_root = TreeNode(level_seq=(), title="ROOT", content="root\n")
+    parent = deep_root
+    for level in range(1, depth + 1):
+        child = TreeNode(level_seq=(1,) * level, content=f"{level}\n")
+        parent.add_child(child)
+        parent = child
+    expected = "root\n" + "".join(f"{level}\n" for level in range(1, depth + 1))
+    assert deep_root.get_full_content() == expected
+    assert sum(1 for _ in deep_root.iter_preorder()) == depth + 1
+
+    stream = io.StringIO()
+    deep_root.write_full_content(stream)
+    assert stream.getvalue() == expected
+
+    deep_root.merge_all_children()
+    assert deep_root.children == []
+    assert deep_root.content == expected
+
+    # Merging span-backed children in document order only extends the span
+    source = "root\n1\n1.1\n2\n"
+    span_root = TreeNode(level_seq=())
+    span_root.set_span(source, 0, 5)
+    offsets = [(5, 7, (1,)), (7, 11, (1, 1)), (11, 13, (2,))]
+    span_nodes = []
+    for start, end, level_seq in offsets:
+        node = TreeNode(level_seq=level_seq)
+        node.set_span(source, start, end)
+        span_nodes.append(node)
+    span_root.add_child(span_nodes[0])
+    span_nodes[0].add_child(span_nodes[1])
+    span_root.add_child(span_nodes[2])
+    span_root.merge_all_children()
+    assert span_root.span == (0, len(source))
+    assert span_root.content == source
+
+    # Repeated concatenation collects chunks and joins them once on read
+    accumulator = ChainNode(level_seq=(1,), content="1 Section\n")
+    noise = [ChainNode(level_seq=(9,), content=f"{index}. noise\n") for index in range(10000)]
+    for node in noise:
+        accumulator.concat_node(node)
+    assert accumulator.content == "1 Section\n" + "".join(node.content for node in noise)
+    accumulator.concat_node(noise[0])
+    assert accumulator.content.endswith("\n0. noise\n")
+    assert accumulator.span is None
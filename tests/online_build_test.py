@@ -0,0 +1,81 @@
+import random
+from typing import Iterator, List
+
+from arborparser import (
+    AutoPruneStrategy,
+    ChainNode,
+    ChainParser,
+    StrictStrategy,
+    TreeBuilder,
+    TreeNode,
+)
+from arborparser import (
+    NUMERIC_DOT_PATTERN_BUILDER,
+    ENGLISH_CHAPTER_PATTERN_BUILDER,
+    ROMAN_PATTERN_BUILDER,
+)
+
+
+def nodes_at_depth(root: TreeNode, depth: int) -> List[TreeNode]:
+    nodes = [root]
+    for _ in range(depth):
+        nodes = [child for node in nodes for child in node.children]
+    return nodes
+
+
+if __name__ == "__main__":
+    patterns = [
+        ENGLISH_CHAPTER_PATTERN_BUILDER.build(),
+        NUMERIC_DOT_PATTERN_BUILDER.build(),
+        ROMAN_PATTERN_BUILDER.build(),
+    ]
+    parser = ChainParser(patterns)
+
+    # Subtrees are yielded while the chain is still being read
+    lines = []
+    for chapter in range(1, 201):
+        lines.append(f"Chapter {chapter} Title")
+        for section in range(1, 4):
+            lines += [f"{chapter}.{section} Section", "    Body."]
+    text = "\n".join(lines)
+    consumed = 0
+
+    def counting_stream() -> Iterator[ChainNode]:
+        global consumed
+        for node in parser.parse_stream(iter(text.splitlines(keepends=True))):
+            consumed += 1
+            yield node
+
+    builder = TreeBuilder()
+    expected = builder.build_tree(parser.parse_to_chain(text))
+    subtrees = builder.iter_subtrees(counting_stream())
+    first = next(subtrees)
+    assert first == expected.children[0] and consumed < 10
+    assert first.parent is not None and first.parent.title == "ROOT"
+    # Yielded subtrees are detached, so the root does not accumulate them
+    assert len(first.parent.children) <= 2
+    assert [first] + list(subtrees) == expected.children
+
+    # Deeper subtrees, single and multi-candidate rows, both strategies
+    pool = [
+        "Chapter 1 A", "Chapter 2 B", "1.1 x", "1.2 y", "2.1 z", "1.1.1 w", "3.1 r",
+        "I. rom", "II. rom", "body text", "", "7.7 noise", "2.2 t", "2.1.1 u",
+    ]
+    random.seed(0)
+    for strategy in (AutoPruneStrategy(), StrictStrategy()):
+        builder = TreeBuilder(strategy)
+        for _ in range(200):
+            text = "\n".join(random.choice(pool) for _ in range(random.randint(0, 30)))
+            multi_chain = random.random() < 0.5
+            parse = parser.parse_to_multi_chain if multi_chain else parser.parse_to_chain
+            depth = random.randint(1, 3)
+            expected = nodes_at_depth(builder.build_tree(parse(text)), depth)
+            assert list(builder.iter_subtrees(iter(parse(text)), depth)) == expected
+
+    try:
+        list(TreeBuilder().iter_subtrees(parser.parse_to_chain("x"), depth=0))
+        assert False, "depth 0 must be rejected"
+    except ValueError:
+        pass
+
+    print("All online build tests passed.")
@@ -0,0 +1,51 @@
+import arborparser.batch
+from arborparser import ChainParser
+from arborparser import (
+    NUMERIC_DOT_PATTERN_BUILDER,
+    ENGLISH_CHAPTER_PATTERN_BUILDER,
+)
+from arborparser.batch import split_at_newlines
+
+
+if __name__ == "__main__":
+    sections = []
+    for chapter in range(1, 8):
+        sections.append(f"Chapter {chapter} Part {chapter}\n")
+        for section in range(1, 6):
+            sections.append(f"{chapter}.{section} Section\n    Body line one.\n\n")
+            sections.append("    Body line two, 1.2 is not a heading here.\n")
+    test_text = "Preface\n" + "".join(sections) + "Trailing text without newline"
+
+    # Ranges cover the text and end on line boundaries
+    for parts in (1, 2, 3, 7, 50):
+        ranges = split_at_newlines(test_text, parts)
+        assert ranges[0][0] == 0 and ranges[-1][1] == len(test_text)
+        assert all(end == start for (_, end), (start, _) in zip(ranges, ranges[1:]))
+        assert all(test_text[end - 1] == "\n" for _, end in ranges[:-1])
+        assert len(ranges) <= parts
+    assert split_at_newlines("", 4) == [(0, 0)]
+
+    # Force splitting even this small text
+    arborparser.batch.PARALLEL_MIN_CHUNK_CHARS = 1
+
+    patterns = [
+        ENGLISH_CHAPTER_PATTERN_BUILDER.build(),
+        NUMERIC_DOT_PATTERN_BUILDER.build(),
+    ]
+    for lazy_content in (False, True):
+        parser = ChainParser(patterns, lazy_content=lazy_content)
+        expected = parser.parse_to_chain(test_text)
+        for workers in (2, 3, 8):
+            chain = parser.parse_to_chain(test_text, workers=workers)
+            assert chain == expected
+            assert "".join(node.content for node in chain) == test_text
+        assert parser.parse_to_multi_chain(test_text, workers=4) == (
+            parser.parse_to_multi_chain(test_text)
+        )
+
+    # Texts starting with a heading or without any heading
+    parser = ChainParser(patterns)
+    for text in ("Chapter 1 First\n1.1 Second\n", "no headings\nat all\n", ""):
+        assert parser.parse_to_chain(text, workers=3) == parser.parse_to_chain(text)
+
+    print("All parallel parsing tests passed.")
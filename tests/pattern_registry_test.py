@@ -0,0 +1,38 @@
+from arborparser import (
+    ChainParser,
+    PatternBuilder,
+    clear_pattern_registry,
+    registered_patterns,
+)
+from arborparser import NUMERIC_DOT_PATTERN_BUILDER
+
+
+if __name__ == "__main__":
+    clear_pattern_registry()
+    assert registered_patterns() == {}
+
+    # Equal configurations share one compiled pattern
+    pattern = NUMERIC_DOT_PATTERN_BUILDER.build()
+    assert NUMERIC_DOT_PATTERN_BUILDER.build() is pattern
+    assert NUMERIC_DOT_PATTERN_BUILDER.modify(max_level=32).build() is pattern
+    assert PatternBuilder(suffix_regex=r"[\.\s]*").build() is pattern
+    assert list(registered_patterns().values()) == [pattern]
+
+    # Other configurations get their own pattern
+    short = NUMERIC_DOT_PATTERN_BUILDER.modify(max_level=2).build()
+    assert short is not pattern
+    assert registered_patterns() == {
+        NUMERIC_DOT_PATTERN_BUILDER: pattern,
+        NUMERIC_DOT_PATTERN_BUILDER.modify(max_level=2): short,
+    }
+    chain = ChainParser([short]).parse_to_chain("1.2 Two\n1.2.3 Three\n")
+    assert [node.level_seq for node in chain] == [(), (1, 2), (1, 2)]
+
+    # Clearing forces a fresh compile
+    clear_pattern_registry()
+    assert registered_patterns() == {}
+    rebuilt = NUMERIC_DOT_PATTERN_BUILDER.build()
+    assert rebuilt is not pattern
+    assert rebuilt.regex.pattern == pattern.regex.pattern
+
+    print("All pattern registry tests passed.")
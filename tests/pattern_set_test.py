@@ -0,0 +1,101 @@
+import re
+
+from arborparser import ChainParser, LevelPattern, TreeExporter
+from arborparser import (
+    CHINESE_CHAPTER_PATTERN_BUILDER,
+    ENGLISH_CHAPTER_PATTERN_BUILDER,
+    NUMERIC_DOT_PATTERN_BUILDER,
+    NUMERIC_DASH_PATTERN_BUILDER,
+    ROMAN_PATTERN_BUILDER,
+    CIRCLED_PATTERN_BUILDER,
+)
+from arborparser.pattern import ANY_DECIMAL_DIGIT
+
+
+if __name__ == "__main__":
+    test_text = """
+第一章 总则
+    本章内容。
+Chapter 1 The Foundation
+    Introductory content for the first chapter.
+
+1.1 Core Concepts
+    Explanation of the fundamental ideas.
+1-2 Dashed Heading
+IV. Roman Heading
+① Circled Heading
+2.1 .2 A details 2 [the title is corrupted due to OCR or other reasons]
+    1.1. This line is text, but looks like a heading.
+    Plain body text that matches nothing.
+"""
+
+    non_strict_num_pattern = NUMERIC_DOT_PATTERN_BUILDER.modify(
+        prefix_regex=r"[\#\s]*",
+        suffix_regex=r"[\.\s]*",
+        separator=r"[\.\s]+",
+        is_sep_regex=True,
+        min_level=2,
+    ).build()
+
+    patterns = [
+        CHINESE_CHAPTER_PATTERN_BUILDER.build(),
+        ENGLISH_CHAPTER_PATTERN_BUILDER.build(),
+        NUMERIC_DOT_PATTERN_BUILDER.build(),
+        NUMERIC_DASH_PATTERN_BUILDER.build(),
+        ROMAN_PATTERN_BUILDER.build(),
+        CIRCLED_PATTERN_BUILDER.build(),
+        non_strict_num_pattern,
+    ]
+
+    loop_parser = ChainParser(patterns)
+    set_parser = ChainParser(patterns, use_pattern_set=True)
+    assert set_parser.pattern_set is not None
+    assert set_parser.pattern_set.regex is not None
+
+    # The fused regex must give the same chain as the per-pattern loop
+    loop_chain = loop_parser.parse_to_chain(test_text)
+    set_chain = set_parser.parse_to_chain(test_text)
+    assert set_chain == loop_chain
+    print(TreeExporter.export_chain(set_chain))
+
+    # ... and the same candidates, in the same order, in multi-chain mode
+    loop_multi = loop_parser.parse_to_multi_chain(test_text)
+    set_multi = set_parser.parse_to_multi_chain(test_text)
+    assert set_multi == loop_multi
+
+    # Lines that match no pattern are rejected by the single fused scan
+    assert set_parser.pattern_set.first_match_index("Plain body text") is None
+    assert set_parser.pattern_set.first_match_index("1.1 Core Concepts") == 2
+
+    # Patterns that cannot be fused fall back to the per-pattern loop
+    case_insensitive = LevelPattern(
+        regex=re.compile(r"^\s*part\s+(\d+)\s+", re.IGNORECASE),
+        converter=lambda match: [int(match.group(1))],
+        description="Match part numbers",
+    )
+    mixed_patterns = patterns + [case_insensitive]
+    mixed_parser = ChainParser(mixed_patterns, use_pattern_set=True)
+    assert mixed_parser.pattern_set is not None
+    assert mixed_parser.pattern_set.regex is None
+    mixed_text = test_text + "PART 3 Appendix\n"
+    assert mixed_parser.parse_to_multi_chain(
+        mixed_text
+    ) == ChainParser(mixed_patterns).parse_to_multi_chain(mixed_text)
+
+    # Built patterns know which characters can open a heading
+    assert CHINESE_CHAPTER_PATTERN_BUILDER.build().first_chars >= {"第", "一", "十"}
+    assert ENGLISH_CHAPTER_PATTERN_BUILDER.build().first_chars == frozenset("C")
+    assert "#" in non_strict_num_pattern.first_chars
+    # Non-ASCII decimal digits are checked with str.isdecimal() at lookup time
+    assert ANY_DECIMAL_DIGIT in NUMERIC_DOT_PATTERN_BUILDER.build().first_chars
+    assert "１" not in NUMERIC_DOT_PATTERN_BUILDER.build().first_chars
+    digit_parser = ChainParser([NUMERIC_DOT_PATTERN_BUILDER.build()])
+    assert [node.level_seq for node in digit_parser._detect_level("１.２ Full width")] == [(1, 2)]
+    assert [node.level_seq for node in digit_parser._detect_level("٣.١ Arabic-Indic")] == [(3, 1)]
+    assert case_insensitive.first_chars is None  # custom patterns match any line
+
+    # Lines whose first character cannot open a heading never reach the regexes
+    assert loop_parser._detect_level("    Plain body text") == []
+    assert loop_parser._patterns_by_first_char["C"] == (1, 4)
+    full_width_text = "１.２ Full-width heading\n"
+    assert loop_parser.parse_to_chain(full_width_text)[1].level_seq == (1, 2)
@@ -0,0 +1,75 @@
+import pickle
+import subprocess
+import sys
+
+from arborparser import ChainParser, LevelPattern, PatternBuilder, TreeBuilder
+from arborparser import (
+    CHINESE_CHAPTER_PATTERN_BUILDER,
+    CIRCLED_PATTERN_BUILDER,
+    NUMERIC_DOT_PATTERN_BUILDER,
+    ROMAN_PATTERN_BUILDER,
+)
+from arborparser.pattern import NumberType
+
+
+if __name__ == "__main__":
+    test_text = """
+第一章 总则
+1.1 Scope
+1.2 Terms
+A. Letters
+① Circled
+II. Roman
+第二章 附则
+"""
+
+    patterns = [
+        CHINESE_CHAPTER_PATTERN_BUILDER.build(),
+        NUMERIC_DOT_PATTERN_BUILDER.build(),
+        PatternBuilder(number_type=NumberType.LETTER, suffix_regex=r"\.\s+").build(),
+        CIRCLED_PATTERN_BUILDER.build(),
+        ROMAN_PATTERN_BUILDER.build(),
+    ]
+
+    # Built patterns pickle as their builder and come back from the registry
+    for pattern in patterns:
+        data = pickle.dumps(pattern)
+        assert pickle.loads(data) is pattern
+
+    # Converters pickle on their own too
+    converter = pickle.loads(pickle.dumps(patterns[1].converter))
+    assert converter(patterns[1].regex.match("1.2.3 Title")) == [1, 2, 3]
+
+    # Raw patterns pickle field by field
+    raw = LevelPattern(
+        regex=patterns[1].regex, converter=patterns[1].converter, description="raw"
+    )
+    restored = pickle.loads(pickle.dumps(raw))
+    assert restored.regex == raw.regex and restored.description == "raw"
+    assert restored.fingerprint() == raw.fingerprint()
+
+    # Parsers round-trip and parse identically
+    parser = ChainParser(patterns, use_pattern_set=True)
+    chain = parser.parse_to_chain(test_text)
+    assert [node.level_seq for node in chain] == [(), (1,), (1, 1), (1, 2), (1,), (1,), (2,), (2,)]
+    restored_parser = pickle.loads(pickle.dumps(parser))
+    assert restored_parser.pattern_set is not None
+    assert restored_parser.parse_to_chain(test_text) == chain
+
+    # ... including in a fresh interpreter, where the patterns are rebuilt from their spec
+    script = (
+        "import pickle, sys\n"
+        "parser = pickle.loads(sys.stdin.buffer.read())\n"
+        "chain = parser.parse_to_chain(" + repr(test_text) + ")\n"
+        "sys.stdout.buffer.write(pickle.dumps(chain))\n"
+    )
+    output = subprocess.run(
+        [sys.executable, "-c", script],
+        input=pickle.dumps(parser),
+        capture_output=True,
+        check=True,
+    ).stdout
+    assert pickle.loads(output) == chain
+    assert TreeBuilder().build_tree(pickle.loads(output)) == TreeBuilder().build_tree(chain)
+
+    print("All pickling tests passed.")
@@ -0,0 +1,110 @@
+import pickle
+import random
+
+from arborparser import (
+    AutoPruneStrategy,
+    ChainParser,
+    ResumableParser,
+    StrictStrategy,
+    TreeBuilder,
+)
+from arborparser import (
+    NUMERIC_DOT_PATTERN_BUILDER,
+    ENGLISH_CHAPTER_PATTERN_BUILDER,
+    ROMAN_PATTERN_BUILDER,
+)
+from arborparser.build_strategy import AutoPruneBuilder
+
+
+def fresh_tree(parser: ChainParser, builder: TreeBuilder, text: str, multi_chain: bool):
+    chain = parser.parse_to_multi_chain(text) if multi_chain else parser.parse_to_chain(text)
+    return builder.build_tree(chain)
+
+
+if __name__ == "__main__":
+    patterns = [
+        ENGLISH_CHAPTER_PATTERN_BUILDER.build(),
+        NUMERIC_DOT_PATTERN_BUILDER.build(),
+        ROMAN_PATTERN_BUILDER.build(),
+    ]
+    parser = ChainParser(patterns)
+
+    # Appending in pieces gives the same tree as parsing the whole text
+    text = "Preface\nChapter 1 Intro\n1.1 Scope\nbody\n1.2 Terms\nChapter 2 Main\n2.1 Part"
+    resumable = ResumableParser(parser)
+    for piece in ("Preface\nChap", "ter 1 Intro\n1.1 Scope\nbody\n", "1.2 Terms\n"):
+        resumable.append(piece)
+    assert resumable.tree() == fresh_tree(parser, resumable.builder, text[: resumable.length], False)
+    resumable.append(text[resumable.length :])
+    tree = resumable.tree()
+    assert tree == fresh_tree(parser, resumable.builder, text, False)
+    assert tree.get_full_content() == text and resumable.length == len(text)
+
+    # The state can be saved and resumed in another parser
+    resumed = pickle.loads(pickle.dumps(resumable))
+    resumed.append("\n2.2 More\nend")
+    assert resumed.tree() == fresh_tree(parser, resumed.builder, text + "\n2.2 More\nend", False)
+    assert resumable.tree() == tree
+
+    # Random texts split at random points, including mid-line
+    pool = [
+        "Chapter 1 A", "Chapter 2 B", "1.1 x", "1.2 y", "2.1 z", "1.1.1 w", "3.1 r",
+        "I. rom", "II. rom", "body text", "", "   ", "7.7 noise", "2.2 t",
+    ]
+    random.seed(0)
+    for multi_chain in (False, True):
+        for strategy in (AutoPruneStrategy(), StrictStrategy()):
+            builder = TreeBuilder(strategy)
+            for _ in range(60):
+                text = "\n".join(random.choice(pool) for _ in range(random.randint(0, 30)))
+                resumable = ResumableParser(parser, builder, multi_chain)
+                position = 0
+                while position < len(text):
+                    end = min(len(text), position + random.randint(0, 15))
+                    resumable.append(text[position:end])
+                    position = end
+                    if random.random() < 0.3:
+                        resumable = pickle.loads(pickle.dumps(resumable))
+                    if random.random() < 0.5:
+                        assert resumable.tree() == fresh_tree(
+                            parser, builder, text[:position], multi_chain
+                        )
+                assert resumable.tree() == fresh_tree(parser, builder, text, multi_chain)
+
+    # Each append costs in proportion to the appended text, not to the whole text
+    lines = []
+    for chapter in range(1, 2001):
+        lines.append(f"Chapter {chapter} Title")
+        for section in range(1, 11):
+            lines += [f"{chapter}.{section} Section", "    Body."]
+    text = "\n".join(lines) + "\n"
+    resumable = ResumableParser(parser)
+    resumable.append(text)
+    resumable.tree()
+    appended = [f"2000.{10 + section} Late section\n    Body.\n" for section in range(1, 101)]
+    work = {"lines": 0, "rows": 0}
+    detect_level, feed = ChainParser._detect_level, AutoPruneBuilder.feed
+
+    def counting_detect_level(self, *args, **kwargs):
+        work["lines"] += 1
+        return detect_level(self, *args, **kwargs)
+
+    def counting_feed(self, *args, **kwargs):
+        work["rows"] += 1
+        return feed(self, *args, **kwargs)
+
+    ChainParser._detect_level, AutoPruneBuilder.feed = counting_detect_level, counting_feed
+    try:
+        for piece in appended:
+            resumable.append(piece)
+            resumable.tree()
+    finally:
+        ChainParser._detect_level, AutoPruneBuilder.feed = detect_level, feed
+    # Two lines per append, one closed row and at most two closing rows per tree
+    assert work["lines"] <= 2 * len(appended), work
+    assert work["rows"] <= 3 * len(appended), work
+    assert resumable.tree() == fresh_tree(
+        parser, resumable.builder, text + "".join(appended), False
+    )
+
+    print("All resumable parsing tests passed.")
@@ -0,0 +1,76 @@
+import io
+import random
+
+from arborparser import ChainParser, TreeBuilder
+from arborparser import (
+    NUMERIC_DOT_PATTERN_BUILDER,
+    ENGLISH_CHAPTER_PATTERN_BUILDER,
+)
+
+
+def chunked(text: str, seed: int):
+    """Split text into randomly sized chunks that ignore line boundaries."""
+    rng = random.Random(seed)
+    index = 0
+    while index < len(text):
+        size = rng.randint(1, 40)
+        yield text[index : index + size]
+        index += size
+
+
+if __name__ == "__main__":
+    test_text = """
+Chapter 1 The Foundation
+    Introductory content for the first chapter.
+
+1.1 Core Concepts
+    Explanation of the fundamental ideas.
+    This section lays the groundwork.
+
+1.3 Advanced Topics
+    Discussing more complex subjects. We build upon the ideas from section 
+    1.1. This section is more advanced and goes into more detail.
+
+Chapter 2 Building Blocks
+    Content for the second chapter.
+
+2.1 Component A
+    Details about the first component.
+
+2.2 Component B
+    Details about the second component. End of document.
+"""
+
+    patterns = [
+        ENGLISH_CHAPTER_PATTERN_BUILDER.build(),
+        NUMERIC_DOT_PATTERN_BUILDER.build(),
+    ]
+    parser = ChainParser(patterns)
+    expected_chain = parser.parse_to_chain(test_text)
+    expected_multi_chain = parser.parse_to_multi_chain(test_text)
+
+    # Open files yield lines that keep their trailing newline
+    assert list(parser.parse_stream(io.StringIO(test_text))) == expected_chain
+    assert list(parser.parse_multi_stream(io.StringIO(test_text))) == expected_multi_chain
+
+    # Chunks do not need to be aligned to line boundaries
+    for seed in range(20):
+        assert list(parser.parse_stream(chunked(test_text, seed))) == expected_chain
+
+    # Text without a trailing newline, and empty input
+    for text in [test_text.rstrip("\n"), "", "\n", "1.1 Only heading"]:
+        assert list(parser.parse_stream([text])) == parser.parse_to_chain(text)
+
+    # Nodes are yielded as soon as the next heading closes their content
+    def lines_until_second_chapter():
+        for line in io.StringIO(test_text):
+            yield line
+            if line.startswith("Chapter 2"):
+                return
+
+    stream = parser.parse_stream(lines_until_second_chapter())
+    assert next(stream).title == "ROOT"
+    assert next(stream).title == "The Foundation"
+
+    tree = TreeBuilder().build_tree(list(parser.parse_stream(io.StringIO(test_text))))
+    assert tree.get_full_content() == test_text
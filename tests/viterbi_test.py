@@ -0,0 +1,139 @@
+import itertools
+import random
+
+from arborparser import (
+    AutoPruneStrategy,
+    ChainParser,
+    TreeBuilder,
+    ViterbiStrategy,
+)
+from arborparser import (
+    NUMERIC_DOT_PATTERN_BUILDER,
+    ENGLISH_CHAPTER_PATTERN_BUILDER,
+    ROMAN_PATTERN_BUILDER,
+)
+from arborparser import build_strategy
+from arborparser.build_strategy import is_imm_next
+
+
+def best_score_by_enumeration(strategy: ViterbiStrategy, rows) -> float:
+    """Score every possible selection of a small multi-chain."""
+    choices = [range(-1, len(row)) for row in rows[1:]]
+    best = None
+    for selection in itertools.product(*choices):
+        score = 0.0
+        previous = ()
+        for row, index in zip(rows[1:], selection):
+            if index == -1:
+                score -= strategy.noise_penalty
+                continue
+            candidate = row[index]
+            if is_imm_next(previous, candidate.level_seq):
+                score += strategy.continuity_reward
+            else:
+                score -= strategy.break_penalty
+            score -= strategy.priority_weight * candidate.pattern_priority
+            previous = candidate.level_seq
+        best = score if best is None else max(best, score)
+    return best
+
+
+def selection_score(strategy: ViterbiStrategy, rows) -> float:
+    """Score of the selection found by the dynamic programming."""
+    selected = {}
+    selection = strategy._best_selection(rows)
+    while selection is not None:
+        row, index, selection = selection
+        selected[row] = rows[row][index]
+    score = -strategy.noise_penalty * (len(rows) - 1 - len(selected))
+    previous = ()
+    for row in sorted(selected):
+        candidate = selected[row]
+        if is_imm_next(previous, candidate.level_seq):
+            score += strategy.continuity_reward
+        else:
+            score -= strategy.break_penalty
+        score -= strategy.priority_weight * candidate.pattern_priority
+        previous = candidate.level_seq
+    return score
+
+
+if __name__ == "__main__":
+    patterns = [
+        ENGLISH_CHAPTER_PATTERN_BUILDER.build(),
+        NUMERIC_DOT_PATTERN_BUILDER.build(),
+        ROMAN_PATTERN_BUILDER.build(),
+    ]
+    parser = ChainParser(patterns)
+    viterbi = TreeBuilder(ViterbiStrategy())
+
+    # Clean documents give the same tree as AutoPruneStrategy
+    lines = []
+    for chapter in range(1, 21):
+        lines.append(f"Chapter {chapter} Title")
+        for section in range(1, 4):
+            lines += [f"{chapter}.{section} Section", "    Body."]
+    text = "\n".join(lines)
+    chain = parser.parse_to_multi_chain(text)
+    assert viterbi.build_tree(chain) == TreeBuilder(AutoPruneStrategy()).build_tree(chain)
+
+    # Heading-like noise is merged into the previous section, keeping all the text
+    text = "1. Intro\n2. Scope\n7.4 see table\n19. ratio\n3. Terms\n3.1 Words\n4. End"
+    tree = viterbi.build_tree(parser.parse_to_multi_chain(text))
+    assert [node.title for node in tree.children] == ["Intro", "Scope", "Terms", "End"]
+    assert tree.children[1].content == "2. Scope\n7.4 see table\n19. ratio\n"
+    assert tree.get_full_content() == text
+
+    # The selection is optimal among all possible ones
+    pool = [
+        "Chapter 1 A", "Chapter 2 B", "1.1 x", "1.2 y", "2.1 z", "1.1.1 w", "3.1 r",
+        "I. rom", "II. rom", "V. rom", "7.7 noise", "2.2 t", "1. one", "2. two",
+    ]
+    random.seed(0)
+    strategy = ViterbiStrategy()
+    for _ in range(300):
+        text = "\n".join(random.choice(pool) for _ in range(random.randint(0, 7)))
+        rows = parser.parse_to_multi_chain(text)
+        tree = strategy.build_tree(rows)
+        assert tree.get_full_content() == text
+        assert abs(selection_score(strategy, rows) - best_score_by_enumeration(strategy, rows)) < 1e-9
+
+    # The default beam gives the exact tree on long noisy inputs
+    text = "\n".join(random.choice(pool) for _ in range(2000))
+    rows = parser.parse_to_multi_chain(text)
+    exact = ViterbiStrategy(beam_width=None).build_tree(rows)
+    assert ViterbiStrategy().build_tree(rows) == exact
+    assert ViterbiStrategy(beam_width=1).build_tree(rows).get_full_content() == text
+
+    # Rows that never continue each other keep the work linear in the number of rows
+    def count_comparisons(strategy: ViterbiStrategy, size: int) -> int:
+        text = "\n".join(f"{size - index}. item" for index in range(size))
+        rows = ChainParser([NUMERIC_DOT_PATTERN_BUILDER.build()]).parse_to_multi_chain(text)
+        calls = [0]
+
+        def counting_is_imm_next(front_seq, back_seq):
+            calls[0] += 1
+            return is_imm_next(front_seq, back_seq)
+
+        build_strategy.is_imm_next = counting_is_imm_next
+        try:
+            assert strategy.build_tree(rows).get_full_content() == text
+        finally:
+            build_strategy.is_imm_next = is_imm_next
+        return calls[0]
+
+    # At most one comparison per candidate and state, with at most beam_width states
+    strategy = ViterbiStrategy()
+    per_row = ViterbiStrategy.DEFAULT_BEAM_WIDTH
+    comparisons = count_comparisons(strategy, 500)
+    assert comparisons <= 500 * per_row
+    assert count_comparisons(strategy, 1000) - comparisons <= 500 * per_row
+    assert count_comparisons(ViterbiStrategy(beam_width=None), 500) > 4 * comparisons
+
+    try:
+        ViterbiStrategy(beam_width=0)
+        assert False, "beam_width 0 must be rejected"
+    except ValueError:
+        pass
+
+    print("All Viterbi strategy tests passed.")